@@ -0,0 +1,76 @@
+"""Conditional GETs and a rendered-response cache for routes computed purely from the dataset.
+
+Such a route's output depends only on its path, its query string and the data
+snapshot, so :func:`respond` answers ``If-None-Match`` / ``If-Modified-Since``
+with 304 before doing any work, and otherwise serves the JSON body from an LRU
+keyed on (path, sorted query, snapshot ETag, content encoding), compressed once
+per entry. Entries of older snapshots are never hit again and age out under the
+entry and byte caps.
+"""
+
+from __future__ import annotations
+
+from email.utils import formatdate, parsedate_to_datetime
+from typing import Any, Callable, Optional
+
+from fastapi import Request, Response
+
+from . import encoding
+from ..core import config, metrics
+from ..services.cache import MISSING, LRUCache
+from ..services.dataset import Snapshot
+
+# (body, content encoding) per (path, query, data version, negotiated encoding)
+_responses = LRUCache(
+    config.RESPONSE_CACHE_ENTRIES, max_bytes=config.RESPONSE_CACHE_MB << 20, sizeof=lambda v: len(v[0]),
+)
+
+
+def _etag(snap: Snapshot, enc: Optional[str]) -> str:
+    """The snapshot's tag, made distinct per content encoding as strong validators require."""
+    return snap.etag if enc is None else f'{snap.etag[:-1]}-{enc}"'
+
+
+def _etag_matches(header: str, etag: str) -> bool:
+    if header.strip() == "*":
+        return True
+    # If-None-Match uses the weak comparison, so W/"x" matches "x"
+    return any(t.strip().removeprefix("W/") == etag for t in header.split(","))
+
+
+def not_modified(request: Request, snap: Snapshot, etag: Optional[str] = None) -> bool:
+    inm = request.headers.get("if-none-match")
+    if inm is not None:
+        return _etag_matches(inm, etag or snap.etag)
+    ims = request.headers.get("if-modified-since")
+    if ims:
+        try:
+            return int(snap.last_modified) <= parsedate_to_datetime(ims).timestamp()
+        except (TypeError, ValueError):
+            return False
+    return False
+
+
+def respond(request: Request, snap: Snapshot, compute: Callable[[], Any], vary: Optional[str] = None) -> Response:
+    """304, a cached body, or ``compute()`` rendered as JSON, all carrying the snapshot's validators."""
+    enc = encoding.negotiate(request.headers.get("accept-encoding"))
+    etag = _etag(snap, enc)
+    headers = {
+        "ETag": etag,
+        "Last-Modified": formatdate(snap.last_modified, usegmt=True),
+        # Let browsers and proxies keep the body but revalidate on every poll
+        "Cache-Control": "no-cache",
+        "Vary": "Accept-Encoding" + (f", {vary}" if vary else ""),
+    }
+    if not_modified(request, snap, etag):
+        return Response(status_code=304, headers=headers)
+    key = (request.url.path, tuple(sorted(request.query_params.multi_items())), snap.etag, enc)
+    cached = _responses.get(key)
+    if cached is MISSING:
+        with metrics.stage("response_build"):
+            cached = encoding.encoded(encoding.dumps(compute()), enc)
+        _responses.set(key, cached)
+    body, used = cached
+    if used:
+        headers["Content-Encoding"] = used
+    return Response(body, media_type=encoding.JSON, headers=headers)
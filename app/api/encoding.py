@@ -0,0 +1,146 @@
+"""JSON rendering and content-encoding negotiation for the large read payloads.
+
+Bodies are serialised straight from the service dicts with ``orjson`` when it is
+installed (the ``json`` module otherwise), skipping FastAPI's per-value
+``jsonable_encoder`` walk, and compressed with brotli or gzip according to the
+request's ``Accept-Encoding``. ``brotli`` is optional too.
+"""
+
+from __future__ import annotations
+
+import gzip
+import json
+import math
+import zlib
+from typing import Any, Dict, Iterable, Iterator, Optional, Tuple
+
+import numpy as np
+from fastapi import Request, Response
+from fastapi.responses import JSONResponse, StreamingResponse
+
+try:
+    import orjson  # type: ignore
+except ImportError:  # orjson is optional; fall back to the stdlib encoder
+    orjson = None
+
+try:
+    import brotli  # type: ignore
+except ImportError:  # brotli is optional; gzip is always offered
+    brotli = None
+
+JSON = "application/json"
+NDJSON = "application/x-ndjson"
+COMPRESS_MIN_BYTES = 1024  # smaller bodies are sent as-is
+GZIP_LEVEL = 5
+BROTLI_QUALITY = 5
+
+
+def _default(o: Any) -> Any:
+    if isinstance(o, np.generic):
+        return o.item()
+    if isinstance(o, (set, frozenset, tuple, np.ndarray)):
+        return list(o)
+    raise TypeError(f"Object of type {type(o).__name__} is not JSON serializable")
+
+
+def _finite(o: Any) -> Any:
+    """``o`` with NaN/Infinity replaced by None, as orjson writes them."""
+    if isinstance(o, (float, np.floating)):
+        return float(o) if math.isfinite(o) else None
+    if isinstance(o, dict):
+        return {k: _finite(v) for k, v in o.items()}
+    if isinstance(o, (list, tuple, set, frozenset, np.ndarray)):
+        return [_finite(v) for v in o]
+    return o
+
+
+def dumps(obj: Any) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(obj, default=_default, option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS)
+    try:
+        text = json.dumps(obj, default=_default, ensure_ascii=False, separators=(",", ":"), allow_nan=False)
+    except ValueError:  # non-finite floats: emit null, not bare NaN/Infinity
+        text = json.dumps(_finite(obj), default=_default, ensure_ascii=False, separators=(",", ":"), allow_nan=False)
+    return text.encode("utf-8")
+
+
+class FastJSONResponse(JSONResponse):
+    """JSONResponse rendered with :func:`dumps`."""
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
+
+
+def negotiate(accept_encoding: Optional[str]) -> Optional[str]:
+    """``br`` or ``gzip`` if the client accepts it (brotli preferred when installed), else None."""
+    if not accept_encoding:
+        return None
+    accepted: Dict[str, float] = {}
+    for part in accept_encoding.split(","):
+        name, _, params = part.strip().partition(";")
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        accepted[name.strip().lower()] = q
+    for enc in ("br", "gzip"):
+        if enc == "br" and brotli is None:
+            continue
+        if accepted.get(enc, accepted.get("*", 0.0)) > 0:
+            return enc
+    return None
+
+
+def compress(body: bytes, encoding: Optional[str]) -> bytes:
+    if encoding == "br":
+        return brotli.compress(body, quality=BROTLI_QUALITY)
+    if encoding == "gzip":
+        return gzip.compress(body, compresslevel=GZIP_LEVEL, mtime=0)
+    return body
+
+
+def encoded(body: bytes, encoding: Optional[str]) -> Tuple[bytes, Optional[str]]:
+    """``body`` compressed with ``encoding``, unless it is too small to bother; returns the encoding used."""
+    if encoding is None or len(body) < COMPRESS_MIN_BYTES:
+        return body, None
+    return compress(body, encoding), encoding
+
+
+def json_response(request: Request, obj: Any, headers: Optional[Dict[str, str]] = None) -> Response:
+    """``obj`` as JSON, compressed if the client accepts it."""
+    body, enc = encoded(dumps(obj), negotiate(request.headers.get("accept-encoding")))
+    headers = dict(headers or {}, Vary="Accept-Encoding")
+    if enc:
+        headers["Content-Encoding"] = enc
+    return Response(body, media_type=JSON, headers=headers)
+
+
+def _compress_stream(chunks: Iterable[bytes], encoding: str) -> Iterator[bytes]:
+    if encoding == "br":
+        c = brotli.Compressor(quality=BROTLI_QUALITY)
+        for chunk in chunks:
+            out = c.process(chunk)
+            if out:
+                yield out
+        yield c.finish()
+        return
+    z = zlib.compressobj(GZIP_LEVEL, zlib.DEFLATED, 31)  # wbits 31: gzip container
+    for chunk in chunks:
+        out = z.compress(chunk)
+        if out:
+            yield out
+    yield z.flush()
+
+
+def ndjson_response(request: Request, items: Iterable[Any]) -> StreamingResponse:
+    """One JSON document per line, compressed on the fly if the client accepts it."""
+    chunks: Iterable[bytes] = (dumps(item) + b"\n" for item in items)
+    enc = negotiate(request.headers.get("accept-encoding"))
+    headers = {"Vary": "Accept-Encoding"}
+    if enc:
+        chunks = _compress_stream(chunks, enc)
+        headers["Content-Encoding"] = enc
+    return StreamingResponse(chunks, media_type=NDJSON, headers=headers)
@@ -1,9 +1,13 @@
-from typing import Optional, List
+import json
+from typing import AsyncIterator, Optional, List
 
-from fastapi import APIRouter, Query
+from fastapi import APIRouter, Header, HTTPException, Query, Request
+from fastapi.responses import PlainTextResponse, StreamingResponse
 from pydantic import BaseModel, Field
-from ..core import config
-from ..services import recommender, kai, interactions
+from ..core import metrics
+from . import caching, encoding
+from ..services import recommender, kai, interactions, dataset, materializer, store
+from ..services.lpi_index import InvalidCursor
 
 router = APIRouter()
 
@@ -11,31 +15,99 @@ router = APIRouter()
 def health():
     return {"status": "ok"}
 
-@router.get("/plans")
-def get_plans(email: Optional[str] = None):
-    try:
-        data = recommender.recommend(
-            config.EMP_PROFILES_PATH,
-            config.FUNCTIONS_SKILLS_PATH,
-            courses_path=config.COURSES_PATH,
-        )
-    except TypeError:
-        # Backward-compat for environments running older recommender signature
-        data = recommender.recommend(
-            config.EMP_PROFILES_PATH,
-            config.FUNCTIONS_SKILLS_PATH,
+@router.get("/metrics", response_class=PlainTextResponse)
+def get_metrics():
+    """Stage and per-route histograms in the Prometheus text exposition format."""
+    return PlainTextResponse(metrics.render(), media_type=metrics.CONTENT_TYPE)
+
+NDJSON = encoding.NDJSON
+BATCH_MAX = 500  # emails or skills per batch request
+
+
+def _plan_fields(fields: Optional[str]) -> Optional[List[str]]:
+    """Parse a comma-separated ``fields=`` projection, rejecting unknown plan keys."""
+    if not fields:
+        return None
+    names = [f.strip() for f in fields.split(",") if f.strip()]
+    unknown = [f for f in names if f not in recommender.PLAN_FIELDS]
+    if unknown:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unknown plan fields: {', '.join(unknown)}; choose from {', '.join(recommender.PLAN_FIELDS)}",
         )
+    return names or None
+
+
+def _store() -> store.InteractionStore:
+    db = store.get()
+    if db is None:
+        raise HTTPException(status_code=503, detail="Interaction history is disabled (INTERACTIONS_DB_PATH)")
+    return db
+
+
+@router.get("/plans")
+def get_plans(
+    request: Request,
+    email: Optional[str] = None,
+    fields: Optional[str] = Query(None, description="Comma-separated plan keys to return, e.g. leadership_potential_index,next_roles"),
+    accept: Optional[str] = Header(None),
+):
+    source = materializer.plans()
+    keys = _plan_fields(fields)
     if email:
-        return {email: data.get(email)}
-    return data
+        return caching.respond(request, source.snapshot, lambda: {email: source.get(email, keys)})
+    if accept and NDJSON in accept:
+        return encoding.ndjson_response(request, source.iter(keys))
+    return caching.respond(request, source.snapshot, lambda: source.all(keys), vary="Accept")
+
+
+@router.get("/plans/stream")
+def stream_plans(
+    request: Request,
+    fields: Optional[str] = Query(None, description="Comma-separated plan keys to return, e.g. leadership_potential_index,next_roles"),
+):
+    """Every employee's plan as newline-delimited JSON, one plan per line."""
+    return encoding.ndjson_response(request, materializer.plans().iter(_plan_fields(fields)))
+
+class PlansBatch(BaseModel):
+    emails: List[str] = Field(..., min_length=1, max_length=BATCH_MAX)
+    fields: Optional[List[str]] = Field(None, description="Plan keys to return (default: all)")
+
+
+@router.post("/plans/batch")
+def get_plans_batch(request: Request, payload: PlansBatch):
+    """Plans for several employees, keyed by email (null for unknown ones)."""
+    keys = _plan_fields(",".join(payload.fields)) if payload.fields else None
+    return encoding.json_response(request, materializer.plans().many(payload.emails, keys))
 
 @router.get("/lpi")
-def get_lpi(email: Optional[str] = None):
-    return recommender.get_lpi(config.EMP_PROFILES_PATH, email=email)
+def get_lpi(request: Request, email: Optional[str] = None):
+    snap = dataset.current()
+    return caching.respond(request, snap, lambda: recommender.get_lpi(snap.lpi_index, email=email))
 
 @router.get("/mentors")
-def get_mentors(email: str, limit: int = 3):
-    return recommender.get_mentors(config.EMP_PROFILES_PATH, email=email, limit=limit)
+def get_mentors(request: Request, email: str, limit: int = 3):
+    snap = dataset.current()
+    return caching.respond(request, snap, lambda: recommender.get_mentors(snap.mentor_index, email=email, limit=limit))
+
+
+class MentorsBatch(BaseModel):
+    emails: List[str] = Field(..., min_length=1, max_length=BATCH_MAX)
+    limit: int = Field(3, ge=1, le=50)
+
+
+@router.post("/mentors/batch")
+def get_mentors_batch(request: Request, payload: MentorsBatch):
+    """Top mentors for several mentees, keyed by email."""
+    return encoding.json_response(
+        request, recommender.get_mentors_many(dataset.current().mentor_index, payload.emails, limit=payload.limit),
+    )
+
+
+@router.get("/mentors/all")
+def match_all_mentors(request: Request, limit: int = 3):
+    """Top mentors for every employee as NDJSON, one mentee per line."""
+    return encoding.ndjson_response(request, dataset.current().mentor_index.match_all(limit=limit))
 
 
 class MentorRequest(BaseModel):
@@ -46,11 +118,7 @@ class MentorRequest(BaseModel):
 
 @router.post("/mentors/request")
 def request_mentor(payload: MentorRequest):
-    ctx = interactions.InteractionContext.load(
-        config.EMP_PROFILES_PATH,
-        config.FUNCTIONS_SKILLS_PATH,
-        courses_path=config.COURSES_PATH,
-    )
+    ctx = interactions.InteractionContext.from_snapshot(dataset.current())
     return interactions.mentor_request_message(
         ctx,
         email=payload.mentee_email,
@@ -58,8 +126,15 @@ def request_mentor(payload: MentorRequest):
         message=payload.message,
     )
 
+@router.get("/mentors/requests")
+def pending_mentor_requests(mentor_email: str, limit: int = Query(50, ge=1, le=500)):
+    """Mentor requests still awaiting this mentor, newest first."""
+    return _store().pending_mentor_requests(mentor_email, limit=limit)
+
+
 @router.get("/courses")
 def find_courses(
+    request: Request,
     q: Optional[str] = Query(None, description="Keyword search"),
     skill: Optional[str] = None,
     difficulty: Optional[str] = Query(None, description="Beginner/Intermediate/Advanced"),
@@ -68,8 +143,9 @@ def find_courses(
     language: Optional[str] = None,
     limit: int = 10,
 ):
-    return recommender.find_courses(
-        courses_path=config.COURSES_PATH,
+    snap = dataset.current()
+    return caching.respond(request, snap, lambda: recommender.find_courses(
+        courses_path=snap.course_index,
         q=q,
         skill=skill,
         difficulty=difficulty,
@@ -77,15 +153,56 @@ def find_courses(
         max_hours=max_hours,
         language=language,
         limit=limit,
-    )
+    ))
+
+class CoursesBatch(BaseModel):
+    skills: List[str] = Field(..., min_length=1, max_length=BATCH_MAX)
+    difficulty: Optional[str] = None
+    min_hours: Optional[float] = None
+    max_hours: Optional[float] = None
+    language: Optional[str] = None
+    limit: int = 10
+
+
+@router.post("/courses/batch")
+def find_courses_batch(request: Request, payload: CoursesBatch):
+    """Course search per skill, with shared filters, keyed by skill."""
+    return encoding.json_response(request, recommender.find_courses_many(
+        dataset.current().course_index,
+        payload.skills,
+        difficulty=payload.difficulty,
+        min_hours=payload.min_hours,
+        max_hours=payload.max_hours,
+        language=payload.language,
+        limit=payload.limit,
+    ))
 
 @router.get("/chat")
-def chat(
+async def chat(
+    q: str = Query(..., description="User query"),
+    email: Optional[str] = None,
+    locale: Optional[str] = None,
+):
+    return await kai.chat_reply(q=q, email=email, locale=locale)
+
+
+@router.get("/chat/stream")
+async def chat_stream(
     q: str = Query(..., description="User query"),
     email: Optional[str] = None,
     locale: Optional[str] = None,
 ):
-    return kai.chat_reply(q=q, email=email, locale=locale)
+    """Kai's reply as Server-Sent Events: `data: {"delta": ...}` chunks, then `event: done`."""
+    async def events() -> AsyncIterator[str]:
+        async for delta in kai.chat_stream(q=q, email=email, locale=locale):
+            yield f"data: {json.dumps({'delta': delta}, ensure_ascii=False)}\n\n"
+        yield "event: done\ndata: {}\n\n"
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
 
 
 class RecognitionPayload(BaseModel):
@@ -97,11 +214,7 @@ class RecognitionPayload(BaseModel):
 
 @router.post("/recognitions")
 def submit_recognition(payload: RecognitionPayload):
-    ctx = interactions.InteractionContext.load(
-        config.EMP_PROFILES_PATH,
-        config.FUNCTIONS_SKILLS_PATH,
-        courses_path=config.COURSES_PATH,
-    )
+    ctx = interactions.InteractionContext.from_snapshot(dataset.current())
     return interactions.recognition_message(
         ctx,
         sender_email=payload.sender_email,
@@ -111,6 +224,18 @@ def submit_recognition(payload: RecognitionPayload):
     )
 
 
+@router.get("/recognitions")
+def list_recognitions(
+    email: str,
+    direction: str = Query("received", pattern="^(received|sent)$"),
+    limit: int = Query(50, ge=1, le=500),
+):
+    db = _store()
+    if direction == "sent":
+        return db.recognitions_sent(email, limit=limit)
+    return db.recognitions_received(email, limit=limit)
+
+
 class FeedbackPayload(BaseModel):
     email: str
     focus_area: str = Field(..., description="Area the person wants to improve")
@@ -119,11 +244,7 @@ class FeedbackPayload(BaseModel):
 
 @router.post("/feedback")
 def capture_feedback(payload: FeedbackPayload):
-    ctx = interactions.InteractionContext.load(
-        config.EMP_PROFILES_PATH,
-        config.FUNCTIONS_SKILLS_PATH,
-        courses_path=config.COURSES_PATH,
-    )
+    ctx = interactions.InteractionContext.from_snapshot(dataset.current())
     return interactions.feedback_simulation(
         ctx,
         email=payload.email,
@@ -132,11 +253,43 @@ def capture_feedback(payload: FeedbackPayload):
     )
 
 
+@router.get("/feedback")
+def list_feedback(email: str, limit: int = Query(50, ge=1, le=500)):
+    return _store().feedback_for(email, limit=limit)
+
+
 @router.get("/leadership")
-def leadership_league(limit: int = 10):
-    ctx = interactions.InteractionContext.load(
-        config.EMP_PROFILES_PATH,
-        config.FUNCTIONS_SKILLS_PATH,
-        courses_path=config.COURSES_PATH,
-    )
-    return {"items": interactions.leadership_league(ctx, limit=min(max(limit, 1), 50))}
+def leadership_league(
+    request: Request,
+    limit: int = 10,
+    department: Optional[str] = Query(None, description="Only this department (case-insensitive)"),
+    unit: Optional[str] = Query(None, description="Only this unit (case-insensitive)"),
+    offset: int = Query(0, ge=0),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page; overrides offset"),
+):
+    snap = dataset.current()
+
+    def page():
+        ctx = interactions.InteractionContext.from_snapshot(snap)
+        try:
+            return interactions.leadership_page(
+                ctx, limit=min(max(limit, 1), 50), department=department, unit=unit, offset=offset, cursor=cursor,
+            )
+        except InvalidCursor:
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+
+    return caching.respond(request, snap, page)
+
+
+@router.get("/leadership/rank")
+def leadership_rank(request: Request, email: str):
+    """An employee's LPI rank overall, in their department and in their unit."""
+    snap = dataset.current()
+
+    def rank():
+        r = snap.lpi_index.rank(email)
+        if r is None:
+            raise HTTPException(status_code=404, detail="Unknown employee")
+        return r
+
+    return caching.respond(request, snap, rank)
@@ -39,11 +39,39 @@ COURSES_PATH = _pick("COURSES_PATH", [
     "/mnt/data/Courses_Catalog.csv",
 ])
 
+# Seconds between mtime/size checks of the data files above (hot reload)
+DATASET_CHECK_INTERVAL = float(_clean(os.getenv("DATASET_CHECK_INTERVAL")) or "2")
+# Optional compiled snapshot (python -m app.services.compiled) used for fast cold start
+DATASET_SNAPSHOT_PATH = _clean(os.getenv("DATASET_SNAPSHOT_PATH"))
+# Directory where one worker publishes compiled generations for all workers to map (multi-worker mode)
+DATASET_SHARED_DIR = _clean(os.getenv("DATASET_SHARED_DIR"))
+# Rendered JSON of read-only routes, keyed by (path, query, data version)
+RESPONSE_CACHE_ENTRIES = int(_clean(os.getenv("RESPONSE_CACHE_ENTRIES")) or "4096")  # 0 disables
+RESPONSE_CACHE_MB = int(_clean(os.getenv("RESPONSE_CACHE_MB")) or "64")
+# Role adjacency: "exact" scores every pair of roles, "lsh" only MinHash/LSH candidates,
+# "auto" switches to lsh from ROLE_LSH_MIN_ROLES job titles
+ROLE_ADJACENCY = (_clean(os.getenv("ROLE_ADJACENCY")) or "exact").lower()
+ROLE_LSH_MIN_ROLES = int(_clean(os.getenv("ROLE_LSH_MIN_ROLES")) or "10000")
+ROLE_LSH_BANDS = int(_clean(os.getenv("ROLE_LSH_BANDS")) or "32")  # more bands: higher recall, slower
+ROLE_LSH_ROWS = int(_clean(os.getenv("ROLE_LSH_ROWS")) or "2")  # more rows per band: fewer candidates, lower recall
+ROLE_LSH_LEVELS = int(_clean(os.getenv("ROLE_LSH_LEVELS")) or "8")  # skill-weight quantisation; 1 = plain skill sets
+# Opt-in: build every employee's plan in the background after each data change and serve plans from it.
+# Each worker process keeps its own copy (~13 KB per employee)
+PLAN_MATERIALIZER = (_clean(os.getenv("PLAN_MATERIALIZER")) or "0").lower() not in ("0", "false", "no", "off")
+PLAN_MATERIALIZER_WORKERS = int(_clean(os.getenv("PLAN_MATERIALIZER_WORKERS")) or "0")  # forked processes; 0 = in a thread
+PLAN_MATERIALIZER_SHARD = int(_clean(os.getenv("PLAN_MATERIALIZER_SHARD")) or "2000")  # employees per worker task
+# SQLite file for recognitions, mentor requests and feedback; set to "" to keep nothing
+INTERACTIONS_DB_PATH = _clean(os.getenv("INTERACTIONS_DB_PATH", "./data/interactions.db"))
+
 # OpenAI settings (optional)
 OPENAI_API_KEY = _clean(os.getenv("OPENAI_API_KEY"))
 OPENAI_MODEL = _clean(os.getenv("OPENAI_MODEL")) or "gpt-4o-mini"
 OPENAI_BASE_URL = _clean(os.getenv("OPENAI_BASE_URL"))  # optional, non-Azure custom endpoint
 OPENAI_TIMEOUT = float(_clean(os.getenv("OPENAI_TIMEOUT")) or "15")
+OPENAI_MAX_RETRIES = int(_clean(os.getenv("OPENAI_MAX_RETRIES")) or "2")  # client retries on 429/5xx; 0 for load tests
+KAI_CACHE_SIZE = int(_clean(os.getenv("KAI_CACHE_SIZE")) or "2048")  # cached model replies; 0 disables
+KAI_CACHE_TTL = float(_clean(os.getenv("KAI_CACHE_TTL")) or "900")  # seconds
+OPENAI_MAX_CONNECTIONS = int(_clean(os.getenv("OPENAI_MAX_CONNECTIONS")) or "100")  # shared async client pool
 
 # Azure OpenAI (optional)
 AZURE_OPENAI_ENDPOINT = _clean(os.getenv("AZURE_OPENAI_ENDPOINT"))  # e.g. https://your-resource.openai.azure.com
@@ -0,0 +1,193 @@
+"""In-process latency/size histograms, rendered in the Prometheus text format.
+
+Hot code paths wrap themselves in :func:`stage` (or :func:`timed`). Each stage
+feeds the ``pathfinder_stage_seconds`` histogram and, while a request is being
+served through :class:`MetricsMiddleware`, that request's ``Server-Timing``
+header. Recording a sample is a ``perf_counter`` pair, a bisect and a locked
+increment, cheap enough for per-employee stages.
+"""
+
+from __future__ import annotations
+
+import bisect
+import functools
+import os
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Tuple, Union
+
+LATENCY_BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+SIZE_BUCKETS = tuple(float(256 * 4 ** i) for i in range(10))  # 256 B .. 64 MiB
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+class Histogram:
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = (), buckets: Sequence[float] = LATENCY_BUCKETS) -> None:
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # label values -> [per-bucket counts..., +Inf count], sum
+        self._series: Dict[Tuple[str, ...], Tuple[List[int], List[float]]] = {}
+        self._lock = threading.Lock()
+        _registry.append(self)
+
+    def observe(self, value: float, *labels: str) -> None:
+        i = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(labels)
+            if series is None:
+                series = self._series[labels] = ([0] * (len(self.buckets) + 1), [0.0])
+            series[0][i] += 1
+            series[1][0] += value
+
+    def render(self) -> Iterator[str]:
+        yield f"# HELP {self.name} {self.help}"
+        yield f"# TYPE {self.name} histogram"
+        with self._lock:
+            snapshot = [(k, list(c), s[0]) for k, (c, s) in self._series.items()]
+        for labels, counts, total in sorted(snapshot):
+            base = ",".join(f'{n}="{_escape(v)}"' for n, v in zip(self.labelnames, labels))
+            sep = "," if base else ""
+            acc = 0
+            for bound, c in zip(self.buckets, counts):
+                acc += c
+                yield f'{self.name}_bucket{{{base}{sep}le="{_fmt(bound)}"}} {acc}'
+            acc += counts[-1]
+            yield f'{self.name}_bucket{{{base}{sep}le="+Inf"}} {acc}'
+            yield f"{self.name}_sum{{{base}}} {_fmt(total)}" if base else f"{self.name}_sum {_fmt(total)}"
+            yield f"{self.name}_count{{{base}}} {acc}" if base else f"{self.name}_count {acc}"
+
+
+class Counter:
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = ()) -> None:
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self._values: Dict[Tuple[str, ...], float] = {}
+        self._lock = threading.Lock()
+        _registry.append(self)
+
+    def inc(self, value: float = 1.0, *labels: str) -> None:
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0.0) + value
+
+    def render(self) -> Iterator[str]:
+        yield f"# HELP {self.name} {self.help}"
+        yield f"# TYPE {self.name} counter"
+        with self._lock:
+            snapshot = sorted(self._values.items())
+        for labels, value in snapshot:
+            base = ",".join(f'{n}="{_escape(v)}"' for n, v in zip(self.labelnames, labels))
+            yield f"{self.name}{{{base}}} {_fmt(value)}" if base else f"{self.name} {_fmt(value)}"
+
+
+def _escape(v: str) -> str:
+    return str(v).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _fmt(v: float) -> str:
+    return str(int(v)) if float(v).is_integer() else repr(float(v))
+
+
+_registry: List[Union[Histogram, Counter]] = []
+
+
+def _reset_locks_after_fork() -> None:
+    # A forked child (e.g. a plan materializer worker) must not inherit a lock another thread held
+    for h in _registry:
+        h._lock = threading.Lock()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_locks_after_fork)
+
+STAGE_SECONDS = Histogram("pathfinder_stage_seconds", "Time spent in instrumented service stages.", ("stage",))
+HTTP_SECONDS = Histogram("pathfinder_http_request_seconds", "HTTP request latency by route.", ("route", "method", "status"))
+HTTP_BYTES = Histogram("pathfinder_http_response_bytes", "HTTP response body size by route.", ("route", "method"), SIZE_BUCKETS)
+STORE_DROPPED = Counter("pathfinder_store_dropped_rows_total", "Interaction rows the store could not write, by table.", ("table",))
+
+# Per-request stage totals (ms) for the Server-Timing header; None outside a request
+_request_timings: ContextVar[Optional[Dict[str, float]]] = ContextVar("request_timings", default=None)
+
+
+@contextmanager
+def stage(name: str) -> Iterator[None]:
+    t0 = time.perf_counter()
+    try:
+        yield
+    finally:
+        dt = time.perf_counter() - t0
+        STAGE_SECONDS.observe(dt, name)
+        timings = _request_timings.get()
+        if timings is not None:
+            timings[name] = timings.get(name, 0.0) + dt * 1000.0
+
+
+def timed(name: str) -> Callable[[Callable[..., Any]], Callable[..., Any]]:
+    """Decorator form of :func:`stage` for plain (non-generator) functions."""
+    def wrap(fn: Callable[..., Any]) -> Callable[..., Any]:
+        @functools.wraps(fn)
+        def inner(*args: Any, **kwargs: Any) -> Any:
+            with stage(name):
+                return fn(*args, **kwargs)
+        return inner
+    return wrap
+
+
+def render() -> str:
+    lines: List[str] = []
+    for h in _registry:
+        lines.extend(h.render())
+    return "\n".join(lines) + "\n"
+
+
+def _server_timing(timings: Dict[str, float], total_ms: float) -> bytes:
+    parts = [f"{name};dur={ms:.2f}" for name, ms in timings.items()]
+    parts.append(f"total;dur={total_ms:.2f}")
+    return ", ".join(parts).encode("latin-1")
+
+
+class MetricsMiddleware:
+    """ASGI middleware recording per-route latency and response size, and adding ``Server-Timing``.
+
+    Stages that finish before the response headers go out (everything except the
+    body of a streaming response) are listed in the header.
+    """
+
+    def __init__(self, app: Any) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Dict[str, Any], receive: Callable, send: Callable) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        timings: Dict[str, float] = {}
+        token = _request_timings.set(timings)
+        t0 = time.perf_counter()
+        status = 500
+        size = 0
+
+        async def send_wrapper(message: Dict[str, Any]) -> None:
+            nonlocal status, size
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                headers = list(message.get("headers", []))
+                headers.append((b"server-timing", _server_timing(timings, (time.perf_counter() - t0) * 1000.0)))
+                message = dict(message, headers=headers)
+            elif message["type"] == "http.response.body":
+                size += len(message.get("body", b""))
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            _request_timings.reset(token)
+            # Label by route template, not raw path, to keep the series count bounded
+            route = scope.get("route")
+            label = getattr(route, "path", None) or "other"
+            HTTP_SECONDS.observe(time.perf_counter() - t0, label, scope["method"], str(status))
+            HTTP_BYTES.observe(float(size), label, scope["method"])
@@ -1,10 +1,28 @@
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi.staticfiles import StaticFiles
 from fastapi.responses import RedirectResponse
 from fastapi.middleware.cors import CORSMiddleware
+from .api.encoding import FastJSONResponse
 from .api.routers import router
+from .core.metrics import MetricsMiddleware
+from .services import kai, materializer, store
+
+
+@asynccontextmanager
+async def lifespan(_: FastAPI):
+    await kai.startup()
+    materializer.start()
+    yield
+    materializer.shutdown()
+    await kai.shutdown()
+    store.shutdown()
 
-app = FastAPI(title="PSA PathFinder Prototype", version="0.1.0")
+
+app = FastAPI(
+    title="PSA PathFinder Prototype", version="0.1.0", lifespan=lifespan, default_response_class=FastJSONResponse,
+)
 app.include_router(router)
 
 app.add_middleware(
@@ -19,6 +37,9 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Outermost, so its latency covers CORS handling and its Server-Timing header reaches every response
+app.add_middleware(MetricsMiddleware)
+
 # Serve a minimal static UI
 app.mount("/ui", StaticFiles(directory="web", html=True), name="ui")
 
@@ -0,0 +1,315 @@
+"""Versioned binary snapshot of the source files and their derived indexes.
+
+The file holds one interned string table, the employee x skill CSR arrays, the
+role x skill index and adjacency, precomputed LPI with its ranking, the mentor
+scoring arrays and the course search index. ``load_snapshot`` maps it read-only
+and views each array in place, so a new process skips JSON/CSV parsing and
+every index build; employees, emails and roles are read through the
+:mod:`.mapped` views rather than copied into Python objects.
+
+Layout: ``MAGIC``, ``<IQ`` (format version, header length), a JSON header
+describing each array (dtype, shape, offset), then the 64-byte aligned arrays.
+
+Build one with::
+
+    python -m app.services.compiled data/pathfinder.snap
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import mmap
+import os
+import struct
+import time
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from . import recommender
+from .course_index import CourseIndex
+from .dataset import DatasetStore, Signature, Snapshot
+from .lpi_index import LeadershipIndex
+from .mapped import (
+    EmailColumn, EmailMap, EmployeeTable, RoleAdjacency, RoleNames, RoleVectors, StringColumn, StringTable, name_hashes,
+)
+from .mentor_index import MentorIndex
+from .role_index import RoleIndex
+from ..core import config
+from ..core.metrics import timed
+
+MAGIC = b"PSASNAP\0"
+FORMAT_VERSION = 2
+_ALIGN = 64
+_PREFIX = struct.Struct("<IQ")
+_GROUPS = ("skill_rows", "difficulty_rows", "language_rows")
+_MENTOR_ARRAYS = ("seniority", "email_code", "dept", "unit", "role", "similar_ptr", "similar")
+
+
+def _align(n: int) -> int:
+    return -(-n // _ALIGN) * _ALIGN
+
+
+class _Strings:
+    def __init__(self) -> None:
+        self.ids: Dict[str, int] = {}
+        self.items: List[str] = []
+
+    def id(self, s: Optional[str]) -> int:
+        if s is None:
+            return -1
+        i = self.ids.get(s)
+        if i is None:
+            i = self.ids[s] = len(self.items)
+            self.items.append(s)
+        return i
+
+    def arrays(self) -> Tuple[np.ndarray, np.ndarray]:
+        encoded = [s.encode("utf-8") for s in self.items]
+        offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+        np.cumsum([len(b) for b in encoded], out=offsets[1:])
+        return np.frombuffer(b"".join(encoded), dtype=np.uint8), offsets
+
+
+def _csr(rows: Iterable[Sequence[Any]], dtype: Any) -> Tuple[np.ndarray, np.ndarray]:
+    indptr = [0]
+    flat: List[Any] = []
+    for r in rows:
+        flat.extend(r)
+        indptr.append(len(flat))
+    return np.asarray(indptr, dtype=np.int64), np.asarray(flat, dtype=dtype)
+
+
+def _groups(st: _Strings, a: Dict[str, np.ndarray], prefix: str, groups: Dict[str, np.ndarray]) -> None:
+    keys = list(groups)
+    a[f"{prefix}.keys"] = np.asarray([st.id(k) for k in keys], dtype=np.int64)
+    a[f"{prefix}.ptr"], a[prefix] = _csr((groups[k] for k in keys), np.int64)
+
+
+def _read_groups(strings: StringTable, a: Dict[str, np.ndarray], prefix: str) -> Dict[str, np.ndarray]:
+    ptr = a[f"{prefix}.ptr"].tolist()
+    return {k: a[prefix][ptr[i]:ptr[i + 1]] for i, k in enumerate(strings.take(a[f"{prefix}.keys"]))}
+
+
+def dump_snapshot(snap: Snapshot, path: str) -> None:
+    st = _Strings()
+    a: Dict[str, np.ndarray] = {}
+    emps = list(snap.employees)
+
+    # Titles, departments, units, dates, skills, levels and positions come from a
+    # vocabulary that does not grow with headcount: they get the first string ids,
+    # and load_snapshot decodes those ``vocab`` strings once.
+    for name, attr in (("title", "job_title"), ("dept", "department"), ("unit", "unit"), ("since", "in_role_since")):
+        a[f"emp.{name}"] = np.asarray([st.id(getattr(e, attr)) for e in emps], dtype=np.int64)
+    for name, attr in (("skills", "skills"), ("levels", "competency_levels"), ("positions", "position_titles")):
+        a[f"emp.{name}.ptr"], a[f"emp.{name}"] = _csr(([st.id(x) for x in getattr(e, attr)] for e in emps), np.int64)
+    vocab = len(st.items)
+    a["emp.email"] = np.asarray([st.id(e.email) for e in emps], dtype=np.int64)
+    a["emp.outcomes"] = np.asarray([e.outcomes for e in emps], dtype=np.int64)
+    a["emp.lpi"] = np.asarray(snap.lpi, dtype=np.float64)
+    # Distinct emails in first-seen order (by_email's order) with their first and last rows
+    first: Dict[str, int] = {}
+    last: Dict[str, int] = {}
+    for i, e in enumerate(emps):
+        first.setdefault(e.email, i)
+        last[e.email] = i
+    a["email.first"] = np.fromiter(first.values(), dtype=np.int64, count=len(first))
+    a["email.last"] = np.fromiter((last[m] for m in first), dtype=np.int64, count=len(first))
+    a["email.hash"], a["email.hash.pos"] = name_hashes(first)
+
+    li = snap.lpi_index
+    a["lpi.rows"], a["lpi.score"], a["lpi.neg_score"], a["lpi.pos"] = li.rows, li.score, li.neg_score, li.pos
+    a["lpi.rank"] = np.asarray([li.rank_of[m] for m in first], dtype=np.int64)
+    _groups(st, a, "lpi.dept", li.departments)
+    _groups(st, a, "lpi.unit", li.units)
+
+    for col in ("function_area", "specialization", "skill_name"):
+        a[f"taxo.{col}"] = np.asarray([st.id(x) for x in snap.taxonomy[col]], dtype=np.int64)
+
+    ri = snap.role_index
+    roles = list(ri.rsi)
+    role_id = {r: i for i, r in enumerate(roles)}
+    rsi = {r: ri.rsi[r] for r in roles}
+    a["role.name"] = np.asarray([st.id(r) for r in roles], dtype=np.int64)
+    a["role.hash"], a["role.hash.pos"] = name_hashes(roles)
+    a["role.skill.ptr"], a["role.skill"] = _csr(([st.id(sk) for sk in rsi[r]] for r in roles), np.int64)
+    _, a["role.weight"] = _csr((list(rsi[r].values()) for r in roles), np.float64)
+    _, a["role.unit"] = _csr(([ri.unit[r][sk] for sk in rsi[r]] for r in roles), np.float64)
+    a["role.adj.ptr"], a["role.adj"] = _csr(([role_id[n] for n, _ in ri.adjacency.get(r, [])] for r in roles), np.int64)
+    _, a["role.adj.sim"] = _csr(([s for _, s in ri.adjacency.get(r, [])] for r in roles), np.float64)
+    mi = snap.mentor_index
+    for name in _MENTOR_ARRAYS:
+        a[f"mentor.{name}"] = getattr(mi, name)
+
+    course_cols: List[List[str]] = []
+    if snap.courses is not None:
+        for i, col in enumerate(snap.courses.columns):
+            series = snap.courses[col]
+            if pd.api.types.is_numeric_dtype(series):
+                course_cols.append([str(col), "num"])
+                a[f"course.col{i}"] = series.to_numpy()
+            else:
+                course_cols.append([str(col), "str"])
+                a[f"course.col{i}"] = np.asarray(
+                    [st.id(v if isinstance(v, str) else None if pd.isna(v) else str(v)) for v in series], dtype=np.int64
+                )
+        ci = snap.course_index
+        a["ci.terms"] = np.asarray([st.id(t) for t in ci.terms], dtype=np.int64)
+        a["ci.post.ptr"], a["ci.post"], a["ci.post.w"] = ci.post_ptr, ci.post_ids, ci.post_w
+        for g in _GROUPS:
+            _groups(st, a, f"ci.{g}", getattr(ci, g))
+        a["ci.hours"] = ci.hours
+
+    a["strings.blob"], a["strings.offsets"] = st.arrays()
+    header = {
+        "format": FORMAT_VERSION,
+        "compiled_at": datetime.utcnow().isoformat(timespec="seconds") + "Z",
+        # role weights depend on tenure as of this date
+        "today": recommender.TODAY.isoformat(),
+        "signature": snap.signature,
+        "top_k": ri.top_k,
+        "vocab": vocab,
+        "course_columns": course_cols if snap.courses is not None else None,
+        "arrays": {},
+    }
+    offset = 0
+    for name, arr in a.items():
+        arr = a[name] = np.ascontiguousarray(arr)
+        offset = _align(offset)
+        header["arrays"][name] = [arr.dtype.str, list(arr.shape), offset]
+        offset += arr.nbytes
+    hbytes = json.dumps(header).encode("utf-8")
+    base = _align(len(MAGIC) + _PREFIX.size + len(hbytes))
+
+    tmp = f"{path}.tmp"
+    with open(tmp, "wb") as f:
+        f.write(MAGIC)
+        f.write(_PREFIX.pack(FORMAT_VERSION, len(hbytes)))
+        f.write(hbytes)
+        for name, arr in a.items():
+            f.seek(base + header["arrays"][name][2])
+            f.write(arr.tobytes())
+        f.truncate(base + offset)
+    os.replace(tmp, path)
+
+
+def _read(path: str) -> Tuple[Dict[str, Any], Dict[str, np.ndarray]]:
+    with open(path, "rb") as f:
+        mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    if mm[:len(MAGIC)] != MAGIC:
+        raise ValueError(f"{path}: not a compiled snapshot")
+    fmt, hlen = _PREFIX.unpack_from(mm, len(MAGIC))
+    if fmt != FORMAT_VERSION:
+        raise ValueError(f"{path}: snapshot format {fmt}, expected {FORMAT_VERSION}")
+    start = len(MAGIC) + _PREFIX.size
+    header = json.loads(mm[start:start + hlen].decode("utf-8"))
+    base = _align(start + hlen)
+    arrays: Dict[str, np.ndarray] = {}
+    for name, (dt, shape, off) in header["arrays"].items():
+        count = int(np.prod(shape))
+        dtype = np.dtype(dt)
+        arrays[name] = (
+            np.frombuffer(mm, dtype=dtype, count=count, offset=base + off).reshape(shape)
+            if count else np.empty(shape, dtype=dtype)
+        )
+    return header, arrays
+
+
+def source_signature(path: str) -> Signature:
+    """Signature of the source files a compiled snapshot was built from."""
+    header, _ = _read(path)
+    return tuple(tuple(x) if x is not None else None for x in header["signature"])  # type: ignore[return-value]
+
+
+@timed("load_compiled")
+def load_snapshot(path: str, version: int = 1, signature: Optional[Signature] = None) -> Snapshot:
+    """Rebuild a :class:`Snapshot` from a compiled file, seeding its derived indexes."""
+    header, a = _read(path)
+    strings = StringTable(a["strings.blob"], a["strings.offsets"], header["vocab"])
+    employees = EmployeeTable(strings, a)
+    by_email = EmailMap(employees, a["email.first"], a["email.last"], a["email.hash"], a["email.hash.pos"])
+    taxonomy = pd.DataFrame({col: strings.take(a[f"taxo.{col}"]) for col in ("function_area", "specialization", "skill_name")})
+
+    courses = None
+    if header["course_columns"] is not None:
+        cols: Dict[str, Any] = {}
+        for i, (name, kind) in enumerate(header["course_columns"]):
+            arr = a[f"course.col{i}"]
+            cols[name] = arr if kind == "num" else [strings[j] if j >= 0 else np.nan for j in arr.tolist()]
+        courses = pd.DataFrame(cols)
+
+    built_from = tuple(tuple(x) if x is not None else None for x in header["signature"])
+    sig = built_from if signature is None else signature
+    snap = Snapshot(
+        version=version,
+        signature=sig,  # type: ignore[arg-type]
+        loaded_at=time.time(),
+        employees=employees,
+        taxonomy=taxonomy,
+        courses=courses,
+        revision=None if sig == built_from else f"compiled:{built_from!r}",
+    )
+    snap._derived["by_email"] = by_email
+    snap._derived["lpi"] = a["emp.lpi"]
+    snap._derived["lpi_index"] = LeadershipIndex.from_parts(
+        employees, a["lpi.rows"], a["lpi.score"], a["lpi.neg_score"], a["lpi.pos"],
+        EmailColumn(by_email, a["lpi.rank"]), _read_groups(strings, a, "lpi.dept"), _read_groups(strings, a, "lpi.unit"),
+    )
+
+    if header["today"] == recommender.TODAY.isoformat():
+        roles = RoleNames(strings, a["role.name"], a["role.hash"], a["role.hash.pos"])
+        ptr, skills = a["role.skill.ptr"], a["role.skill"]
+        snap._derived["role_index"] = RoleIndex(
+            RoleVectors(roles, ptr, skills, a["role.weight"]),
+            RoleAdjacency(roles, a["role.adj.ptr"], a["role.adj"], a["role.adj.sim"]),
+            header["top_k"],
+            unit=RoleVectors(roles, ptr, skills, a["role.unit"]),
+        )
+        # mentor scoring reads role adjacency, so it is only as current as the role index
+        snap._derived["mentor_index"] = MentorIndex.from_parts(
+            employees, a["emp.lpi"], *(a[f"mentor.{name}"] for name in _MENTOR_ARRAYS),
+            row_of=EmailColumn(by_email, a["email.first"]), mentee_rows=a["email.first"],
+        )
+
+    if courses is not None:
+        snap._derived["course_index"] = CourseIndex.from_parts(
+            courses.to_dict(orient="records"), StringColumn(strings, a["ci.terms"]),
+            a["ci.post.ptr"], a["ci.post"], a["ci.post.w"], hours=a["ci.hours"],
+            **{g: _read_groups(strings, a, f"ci.{g}") for g in _GROUPS},
+        )
+    return snap
+
+
+def compile_snapshot(
+    out_path: str,
+    employees_path: str = config.EMP_PROFILES_PATH,
+    taxonomy_path: str = config.FUNCTIONS_SKILLS_PATH,
+    courses_path: Optional[str] = config.COURSES_PATH,
+) -> Snapshot:
+    """Load and index the three source files, then write them to ``out_path``."""
+    snap = DatasetStore(employees_path, taxonomy_path, courses_path=courses_path).current()
+    dump_snapshot(snap, out_path)
+    return snap
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    ap = argparse.ArgumentParser(description="Compile the PathFinder data files into a binary snapshot.")
+    ap.add_argument("out", help="output snapshot path, e.g. data/pathfinder.snap")
+    ap.add_argument("--employees", default=config.EMP_PROFILES_PATH)
+    ap.add_argument("--taxonomy", default=config.FUNCTIONS_SKILLS_PATH)
+    ap.add_argument("--courses", default=config.COURSES_PATH)
+    args = ap.parse_args(argv)
+    t0 = time.perf_counter()
+    snap = compile_snapshot(args.out, args.employees, args.taxonomy, args.courses)
+    print(
+        f"Wrote {args.out}: {len(snap.employees)} employees, {len(snap.role_skill_index)} roles, "
+        f"{0 if snap.courses is None else len(snap.courses)} courses "
+        f"({os.path.getsize(args.out)} bytes, {time.perf_counter() - t0:.2f}s)"
+    )
+
+
+if __name__ == "__main__":
+    main()
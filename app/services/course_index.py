@@ -0,0 +1,237 @@
+"""Tokenised inverted index over the course catalog for `/courses` search."""
+
+from __future__ import annotations
+
+import bisect
+import math
+import re
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from .cache import MISSING, LRUCache
+from ..core.metrics import timed
+
+TEXT_FIELDS = ["title", "description", "skill_name", "provider"]
+BM25_K1 = 1.2
+BM25_B = 0.75
+# Distinct skill filters whose matching rows are remembered per index
+SKILL_MEMO_SIZE = 4096
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+
+def tokenize(text: str) -> List[str]:
+    return _TOKEN_RE.findall(text.lower())
+
+
+def _none_if_nan(v: Any) -> Any:
+    return None if isinstance(v, float) and math.isnan(v) else v
+
+
+class CourseIndex:
+    """BM25-ranked keyword search with prefix matching and filter masks.
+
+    Built once per catalog load; every query works on numpy arrays sized to the
+    catalog instead of re-scanning DataFrame rows.
+    """
+
+    def __init__(self, df: pd.DataFrame) -> None:
+        self.records: Sequence[Dict[str, Any]] = df.to_dict(orient="records")
+        n = len(self.records)
+        self.size = n
+
+        postings: Dict[str, Dict[int, int]] = {}
+        doc_len = np.zeros(n, dtype=np.float64)
+        fields = [c for c in TEXT_FIELDS if c in df]
+        for i, row in enumerate(df[fields].fillna("").astype(str).itertuples(index=False)):
+            toks = tokenize(" ".join(row))
+            doc_len[i] = len(toks)
+            for t in toks:
+                tf = postings.setdefault(t, {})
+                tf[i] = tf.get(i, 0) + 1
+        avg_len = float(doc_len.mean()) if n and doc_len.mean() > 0 else 1.0
+        norm = BM25_K1 * (1 - BM25_B + BM25_B * doc_len / avg_len)
+
+        # Per-term doc ids and precomputed BM25 weights, as CSR over the sorted terms
+        # (term i owns post_ptr[i]:post_ptr[i + 1]); query time is a lookup and a scatter-add.
+        self.terms: Sequence[str] = sorted(postings)
+        self.post_ptr = np.zeros(len(self.terms) + 1, dtype=np.int64)
+        np.cumsum([len(postings[t]) for t in self.terms], out=self.post_ptr[1:])
+        self.post_ids = np.empty(int(self.post_ptr[-1]), dtype=np.int64)
+        self.post_w = np.empty(int(self.post_ptr[-1]), dtype=np.float64)
+        for i, t in enumerate(self.terms):
+            tf = postings[t]
+            lo, hi = self.post_ptr[i], self.post_ptr[i + 1]
+            ids = self.post_ids[lo:hi] = np.fromiter(tf.keys(), dtype=np.int64, count=len(tf))
+            freqs = np.fromiter(tf.values(), dtype=np.float64, count=len(tf))
+            idf = math.log(1 + (n - len(ids) + 0.5) / (len(ids) + 0.5))
+            self.post_w[lo:hi] = idf * freqs * (BM25_K1 + 1) / (freqs + norm[ids])
+
+        self.skill_rows = self._group(df, "skill_name")
+        self.difficulty_rows = self._group(df, "difficulty")
+        self.language_rows = self._group(df, "language")
+        hours = df["duration_hours"] if "duration_hours" in df else pd.Series(np.nan, index=df.index)
+        self.hours = pd.to_numeric(hours, errors="coerce").fillna(0).to_numpy(dtype=np.float64)
+        self._skill_memo = LRUCache(SKILL_MEMO_SIZE)
+
+    @classmethod
+    def from_parts(
+        cls,
+        records: Sequence[Dict[str, Any]],
+        terms: Sequence[str],
+        post_ptr: np.ndarray,
+        post_ids: np.ndarray,
+        post_w: np.ndarray,
+        skill_rows: Dict[str, np.ndarray],
+        difficulty_rows: Dict[str, np.ndarray],
+        language_rows: Dict[str, np.ndarray],
+        hours: np.ndarray,
+    ) -> "CourseIndex":
+        """Reassemble an index from previously built parts (see ``compiled``)."""
+        self = cls.__new__(cls)
+        self.records = records
+        self.size = len(records)
+        self.terms = terms
+        self.post_ptr = post_ptr
+        self.post_ids = post_ids
+        self.post_w = post_w
+        self.skill_rows = skill_rows
+        self.difficulty_rows = difficulty_rows
+        self.language_rows = language_rows
+        self.hours = hours
+        self._skill_memo = LRUCache(SKILL_MEMO_SIZE)
+        return self
+
+    @staticmethod
+    def _group(df: pd.DataFrame, col: str) -> Dict[str, np.ndarray]:
+        if col not in df:
+            return {}
+        keys = df[col].astype(str).str.lower().to_numpy()
+        out: Dict[str, List[int]] = {}
+        for i, k in enumerate(keys):
+            out.setdefault(k, []).append(i)
+        return {k: np.asarray(v, dtype=np.int64) for k, v in out.items()}
+
+    def skill_rows_for(self, skill: str) -> np.ndarray:
+        """Catalog rows whose skill name contains ``skill`` (case-insensitive), in catalog order.
+
+        The same rows a ``search(skill=...)`` filter keeps; memoised per skill, so
+        plan building and Kai pay for the scan over skill names once.
+        """
+        sl = skill.lower()
+        rows = self._skill_memo.get(sl)
+        if rows is MISSING:
+            keys = [k for k in self.skill_rows if sl in k]
+            if len(keys) == 1:
+                rows = self.skill_rows[keys[0]]
+            else:
+                rows = np.flatnonzero(self._mask(self.skill_rows, keys))
+            self._skill_memo.set(sl, rows)
+        return rows
+
+    def ranked_skill_rows(self, skill: str) -> np.ndarray:
+        """:meth:`skill_rows_for`, best match first: BM25 of the skill's terms over the course text, ties in catalog order."""
+        key = ("ranked", skill.lower())
+        rows = self._skill_memo.get(key)
+        if rows is MISSING:
+            rows = self.skill_rows_for(skill)
+            scores = np.zeros(self.size, dtype=np.float64)
+            for t in set(tokenize(skill)):
+                i = self._term(t)
+                if i is not None:
+                    ids, w = self._posting(i)
+                    scores[ids] += w
+            rows = rows[np.lexsort((rows, -scores[rows]))]
+            self._skill_memo.set(key, rows)
+        return rows
+
+    def for_skill(self, skill: str, limit: int = 3, fields: Optional[Tuple[str, ...]] = None) -> List[Dict[str, Any]]:
+        """Top ``limit`` courses for a skill; equals ``search(skill=skill, limit=limit)["items"]``.
+
+        With ``fields``, each course is cut down to those keys (missing values as
+        None) and the projection is memoised alongside the skill's rows.
+        """
+        if fields is None:
+            return [dict(self.records[i]) for i in self.ranked_skill_rows(skill)[:limit]]
+        key = (skill.lower(), limit, fields)
+        cards = self._skill_memo.get(key)
+        if cards is MISSING:
+            cards = [
+                {f: _none_if_nan(self.records[i].get(f)) for f in fields}
+                for i in self.ranked_skill_rows(skill)[:limit]
+            ]
+            self._skill_memo.set(key, cards)
+        return [dict(c) for c in cards]
+
+    def _term(self, term: str) -> Optional[int]:
+        i = bisect.bisect_left(self.terms, term)
+        return i if i < len(self.terms) and self.terms[i] == term else None
+
+    def _expand(self, prefix: str) -> range:
+        """Positions of the terms starting with ``prefix``."""
+        lo = bisect.bisect_left(self.terms, prefix)
+        hi = bisect.bisect_left(self.terms, prefix + "\uffff", lo)
+        return range(lo, hi)
+
+    def _posting(self, i: int) -> Tuple[np.ndarray, np.ndarray]:
+        lo, hi = self.post_ptr[i], self.post_ptr[i + 1]
+        return self.post_ids[lo:hi], self.post_w[lo:hi]
+
+    def _mask(self, groups: Dict[str, np.ndarray], keys: List[str]) -> np.ndarray:
+        mask = np.zeros(self.size, dtype=bool)
+        for k in keys:
+            mask[groups[k]] = True
+        return mask
+
+    @timed("course_search")
+    def search(
+        self,
+        q: Optional[str] = None,
+        skill: Optional[str] = None,
+        difficulty: Optional[str] = None,
+        min_hours: Optional[float] = None,
+        max_hours: Optional[float] = None,
+        language: Optional[str] = None,
+        limit: int = 10,
+    ) -> Dict[str, Any]:
+        mask = np.ones(self.size, dtype=bool)
+        if skill:
+            keep = np.zeros(self.size, dtype=bool)
+            keep[self.skill_rows_for(skill)] = True
+            mask &= keep
+        if difficulty:
+            mask &= self._mask(self.difficulty_rows, [k for k in [difficulty.lower()] if k in self.difficulty_rows])
+        if language:
+            mask &= self._mask(self.language_rows, [k for k in [language.lower()] if k in self.language_rows])
+        if min_hours is not None:
+            mask &= self.hours >= float(min_hours)
+        if max_hours is not None:
+            mask &= self.hours <= float(max_hours)
+
+        scores = None
+        if q:
+            terms = tokenize(q)
+            if not terms:
+                mask[:] = False
+            scores = np.zeros(self.size, dtype=np.float64)
+            # Every query term must match (as a token prefix) somewhere in the course text.
+            for term in terms:
+                hit = np.zeros(self.size, dtype=bool)
+                for i in self._expand(term):
+                    ids, w = self._posting(i)
+                    hit[ids] = True
+                    scores[ids] += w
+                mask &= hit
+
+        if scores is None and skill:
+            # Skill filter alone: the skill's courses by relevance to it, as for_skill lists them
+            rows = self.ranked_skill_rows(skill)
+            rows = rows[mask[rows]]
+        else:
+            rows = np.flatnonzero(mask)
+        if scores is not None:
+            rows = rows[np.lexsort((rows, -scores[rows]))]
+        items = [dict(self.records[i]) for i in rows[:limit]]
+        return {"total": int(len(rows)), "items": items}
@@ -0,0 +1,378 @@
+"""Process-wide, versioned in-memory copy of the employee, taxonomy and course files.
+
+Routes read an immutable :class:`Snapshot` via :func:`current`. The store stats the
+source files (mtime + size) at most once per ``DATASET_CHECK_INTERVAL`` seconds and,
+when they change, parses them on a background thread and swaps the finished snapshot
+in with a single reference assignment, so readers never observe a partial load.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import os
+import secrets
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterable, List, Mapping, Optional, Sequence, Tuple
+
+import pandas as pd
+
+from . import recommender
+from .course_index import CourseIndex
+from .directory import EmployeeDirectory
+from .lpi_index import LeadershipIndex
+from .mentor_index import MentorIndex
+from .role_index import RoleIndex
+from .role_names import RoleNameIndex
+from ..core import config
+
+# Adjacency is built once per snapshot at the widest neighbourhood any caller uses
+# (mentor matching); plan building slices the first five.
+ADJACENCY_TOP_K = 10
+
+FileSig = Optional[Tuple[int, int]]
+Signature = Tuple[FileSig, FileSig, FileSig]
+
+# Slots of a Signature, and which of them each derived structure is built from.
+# On reload, parsed files and derived structures whose sources did not change are
+# carried over from the previous snapshot instead of being rebuilt.
+EMPLOYEES, TAXONOMY, COURSES = 0, 1, 2
+DERIVED_SOURCES: Dict[str, Tuple[int, ...]] = {
+    "by_email": (EMPLOYEES,),
+    "directory": (EMPLOYEES,),
+    "role_index": (EMPLOYEES,),
+    "role_names": (EMPLOYEES,),
+    "lpi": (EMPLOYEES,),
+    "lpi_index": (EMPLOYEES,),
+    "mentor_index": (EMPLOYEES,),
+    "course_index": (COURSES,),
+    "taxonomy_lookup": (TAXONOMY,),
+}
+
+
+def _file_sig(path: Optional[str]) -> FileSig:
+    if not path:
+        return None
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return (st.st_mtime_ns, st.st_size)
+
+
+@dataclass
+class Snapshot:
+    """One fully-loaded generation of the source data plus lazily derived indexes."""
+
+    version: int
+    signature: Signature
+    loaded_at: float
+    employees: Sequence[recommender.EmployeeLite]  # a list, or a mapped.EmployeeTable for compiled snapshots
+    taxonomy: pd.DataFrame
+    courses: Optional[pd.DataFrame]
+    # Identifies data the file signature does not describe: in-memory profile
+    # edits, or a compiled file served without its sources on disk
+    revision: Optional[str] = None
+    _derived: Dict[str, Any] = field(default_factory=dict, repr=False)
+    _lock: threading.RLock = field(default_factory=threading.RLock, repr=False)
+
+    def derived(self, name: str, factory: Callable[["Snapshot"], Any]) -> Any:
+        """Return the structure cached under ``name``, building it once per snapshot."""
+        try:
+            return self._derived[name]
+        except KeyError:
+            pass
+        with self._lock:
+            if name not in self._derived:
+                self._derived[name] = factory(self)
+            return self._derived[name]
+
+    @property
+    def etag(self) -> str:
+        """Strong entity tag for responses computed from this snapshot; equal across workers serving the same data."""
+        return self.derived("etag", lambda s: '"%s"' % hashlib.blake2b(
+            repr((s.signature, s.revision)).encode("utf-8"), digest_size=12).hexdigest())
+
+    @property
+    def last_modified(self) -> float:
+        """Newest source-file mtime (epoch seconds), or the load time for edited/compiled-only data."""
+        mtimes = [sig[0] / 1e9 for sig in self.signature if sig is not None]
+        return self.loaded_at if self.revision is not None or not mtimes else max(mtimes)
+
+    @property
+    def by_email(self) -> Mapping[str, recommender.EmployeeLite]:
+        return self.derived("by_email", lambda s: {e.email: e for e in s.employees})
+
+    def employee(self, email: str) -> Optional[recommender.EmployeeLite]:
+        return self.by_email.get(email)
+
+    @property
+    def directory(self) -> EmployeeDirectory:
+        return self.derived("directory", lambda s: EmployeeDirectory(s.by_email, s.adjacency))
+
+    @property
+    def role_index(self) -> RoleIndex:
+        return self.derived("role_index", lambda s: RoleIndex.build(s.employees, top_k=ADJACENCY_TOP_K))
+
+    @property
+    def role_skill_index(self) -> Mapping[str, Dict[str, float]]:
+        return self.role_index.rsi
+
+    @property
+    def adjacency(self) -> Mapping[str, List[Tuple[str, float]]]:
+        return self.role_index.adjacency
+
+    @property
+    def taxonomy_lookup(self) -> recommender.TaxonomyLookup:
+        return self.derived("taxonomy_lookup", lambda s: recommender.TaxonomyLookup(s.taxonomy))
+
+    @property
+    def role_names(self) -> RoleNameIndex:
+        return self.derived("role_names", lambda s: RoleNameIndex(s.role_skill_index))
+
+    @property
+    def lpi(self) -> Sequence[float]:
+        """Leadership Potential Index per employee, aligned with ``employees`` (an array view for compiled snapshots)."""
+        return self.derived("lpi", lambda s: [recommender.compute_lpi(e) for e in s.employees])
+
+    @property
+    def lpi_index(self) -> LeadershipIndex:
+        return self.derived("lpi_index", lambda s: LeadershipIndex(s.employees, s.lpi))
+
+    @property
+    def mentor_index(self) -> MentorIndex:
+        return self.derived("mentor_index", lambda s: MentorIndex(s.employees, s.adjacency, s.lpi))
+
+    @property
+    def course_index(self) -> Optional[CourseIndex]:
+        return self.derived("course_index", lambda s: CourseIndex(s.courses) if s.courses is not None else None)
+
+
+# Callbacks run against a freshly loaded snapshot before it is published, so the
+# derived indexes they build are ready by the time the first request sees it.
+_warmers: List[Callable[[Snapshot], None]] = []
+
+
+def register_warmer(fn: Callable[[Snapshot], None]) -> Callable[[Snapshot], None]:
+    _warmers.append(fn)
+    return fn
+
+
+@register_warmer
+def _warm_role_index(snap: Snapshot) -> None:
+    snap.by_email
+    snap.directory
+    snap.mentor_index
+    snap.role_names
+
+
+@register_warmer
+def _warm_lpi_index(snap: Snapshot) -> None:
+    snap.lpi_index
+
+
+@register_warmer
+def _warm_course_index(snap: Snapshot) -> None:
+    snap.course_index
+    snap.taxonomy_lookup
+
+
+class DatasetStore:
+    def __init__(
+        self,
+        employees_path: str,
+        taxonomy_path: str,
+        courses_path: Optional[str] = None,
+        check_interval: float = 1.0,
+        compiled_path: Optional[str] = None,
+    ) -> None:
+        self.employees_path = employees_path
+        self.taxonomy_path = taxonomy_path
+        self.courses_path = courses_path
+        self.check_interval = check_interval
+        self.compiled_path = compiled_path
+        self._snapshot: Optional[Snapshot] = None
+        self._version = 0
+        self._last_check = 0.0
+        self._load_lock = threading.Lock()
+        self._reloading = False
+
+    def signature(self) -> Signature:
+        return (
+            _file_sig(self.employees_path),
+            _file_sig(self.taxonomy_path),
+            _file_sig(self.courses_path),
+        )
+
+    def current(self) -> Snapshot:
+        snap = self._snapshot
+        if snap is None:
+            with self._load_lock:
+                if self._snapshot is None:
+                    self._publish(self._initial())
+            return self._snapshot  # type: ignore[return-value]
+        self._maybe_refresh(snap)
+        return snap
+
+    def _initial(self) -> Snapshot:
+        sig = self.signature()
+        if self.compiled_path and os.path.exists(self.compiled_path):
+            from .compiled import load_snapshot, source_signature
+
+            try:
+                # Use the compiled file when it was built from the files on disk,
+                # or when the pod ships only the compiled file.
+                if source_signature(self.compiled_path) == sig or all(x is None for x in sig):
+                    snap = load_snapshot(self.compiled_path, version=self._version + 1, signature=sig)
+                    for warm in _warmers:
+                        warm(snap)
+                    return snap
+            except Exception as e:
+                print(f"Compiled snapshot {self.compiled_path} not used: {e}", flush=True)
+        return self._build(sig)
+
+    def reload(self) -> Snapshot:
+        """Synchronously re-read changed files and publish a new snapshot."""
+        with self._load_lock:
+            self._publish(self._build(self.signature()))
+        return self._snapshot  # type: ignore[return-value]
+
+    def update_employees(
+        self,
+        upserts: Iterable[recommender.EmployeeLite] = (),
+        deletes: Iterable[str] = (),
+    ) -> Snapshot:
+        """Publish a snapshot with individual profiles added, replaced (by email) or deleted.
+
+        The role index is updated incrementally; other employee-derived structures are
+        rebuilt by the warmers. A later change to the profiles file on disk replaces
+        these in-memory edits with the file's contents.
+        """
+        self.current()
+        with self._load_lock:
+            prev = self._snapshot
+            assert prev is not None
+            employees = list(prev.employees)
+            pos = {e.email: i for i, e in enumerate(employees)}
+            added: List[recommender.EmployeeLite] = []
+            removed: List[recommender.EmployeeLite] = []
+            for e in upserts:
+                i = pos.get(e.email)
+                if i is None:
+                    pos[e.email] = len(employees)
+                    employees.append(e)
+                else:
+                    removed.append(employees[i])
+                    employees[i] = e
+                added.append(e)
+            drop = {email for email in deletes if email in pos}
+            if drop:
+                removed += [e for e in employees if e.email in drop]
+                employees = [e for e in employees if e.email not in drop]
+            snap = Snapshot(
+                version=self._version + 1,
+                signature=prev.signature,
+                loaded_at=time.time(),
+                employees=employees,
+                taxonomy=prev.taxonomy,
+                courses=prev.courses,
+                revision=secrets.token_hex(8),
+            )
+            for name, sources in DERIVED_SOURCES.items():
+                if name in prev._derived and EMPLOYEES not in sources:
+                    snap._derived[name] = prev._derived[name]
+            snap._derived["role_index"] = prev.role_index.updated(added=added, removed=removed)
+            for warm in _warmers:
+                warm(snap)
+            self._publish(snap)
+        return snap
+
+    def _maybe_refresh(self, snap: Snapshot) -> None:
+        now = time.monotonic()
+        if self._reloading or now - self._last_check < self.check_interval:
+            return
+        self._last_check = now
+        if self.signature() == snap.signature:
+            return
+        with self._load_lock:
+            if self._reloading:
+                return
+            self._reloading = True
+        threading.Thread(target=self._background_reload, name="dataset-reload", daemon=True).start()
+
+    def _background_reload(self) -> None:
+        try:
+            with self._load_lock:
+                sig = self.signature()
+                if self._snapshot is not None and sig == self._snapshot.signature:
+                    return
+                self._publish(self._build(sig))
+        except Exception as e:
+            # Keep serving the previous generation; the next check will retry.
+            print(f"Dataset reload failed: {e}", flush=True)
+        finally:
+            self._reloading = False
+
+    def _build(self, sig: Signature) -> Snapshot:
+        prev = self._snapshot
+        same = [prev is not None and prev.signature[i] == sig[i] for i in range(3)]
+        if same[EMPLOYEES]:
+            employees = prev.employees
+        else:
+            employees = recommender.load_employees(self.employees_path)
+        taxonomy = prev.taxonomy if same[TAXONOMY] else recommender.load_taxonomy(self.taxonomy_path)
+        courses = None
+        if same[COURSES]:
+            courses = prev.courses
+        elif self.courses_path and sig[COURSES] is not None:
+            courses = recommender.load_courses(self.courses_path)
+        snap = Snapshot(
+            version=self._version + 1,
+            signature=sig,
+            loaded_at=time.time(),
+            employees=employees,
+            taxonomy=taxonomy,
+            courses=courses,
+            revision=prev.revision if same[EMPLOYEES] else None,
+        )
+        if prev is not None:
+            for name, sources in DERIVED_SOURCES.items():
+                if name in prev._derived and all(same[i] for i in sources):
+                    snap._derived[name] = prev._derived[name]
+        for warm in _warmers:
+            warm(snap)
+        return snap
+
+    def _publish(self, snap: Snapshot) -> None:
+        self._version = snap.version
+        self._snapshot = snap
+
+
+_store: Optional[DatasetStore] = None
+_store_lock = threading.Lock()
+
+
+def get_store() -> DatasetStore:
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                kwargs = dict(
+                    courses_path=config.COURSES_PATH,
+                    check_interval=config.DATASET_CHECK_INTERVAL,
+                    compiled_path=config.DATASET_SNAPSHOT_PATH,
+                )
+                if config.DATASET_SHARED_DIR:
+                    from .shared import SharedDatasetStore
+
+                    _store = SharedDatasetStore(
+                        config.DATASET_SHARED_DIR, config.EMP_PROFILES_PATH, config.FUNCTIONS_SKILLS_PATH, **kwargs
+                    )
+                else:
+                    _store = DatasetStore(config.EMP_PROFILES_PATH, config.FUNCTIONS_SKILLS_PATH, **kwargs)
+    return _store
+
+
+def current() -> Snapshot:
+    return get_store().current()
@@ -0,0 +1,58 @@
+"""Email-keyed employee directory for the interaction (write-path) endpoints.
+
+Mentor requests, recognitions and feedback only need to know that an email
+exists and to render a one-line summary; building a whole career plan for that
+is wasted work. Summary fields are computed on first use and kept for the life
+of the snapshot.
+"""
+
+from __future__ import annotations
+
+from typing import Any, Dict, List, Optional, Tuple
+
+from .recommender import EmployeeLite, compute_lpi, next_role_names
+
+
+class EmployeeDirectory:
+    def __init__(
+        self,
+        by_email: Dict[str, EmployeeLite],
+        adjacency: Dict[str, List[Tuple[str, float]]],
+    ) -> None:
+        self.by_email = by_email
+        self.adjacency = adjacency
+        self._summaries: Dict[str, Dict[str, Any]] = {}
+
+    def __contains__(self, email: object) -> bool:
+        return email in self.by_email
+
+    def __len__(self) -> int:
+        return len(self.by_email)
+
+    def get(self, email: str) -> Optional[EmployeeLite]:
+        return self.by_email.get(email)
+
+    def summary(self, email: str) -> Optional[Dict[str, Any]]:
+        """Role, department, LPI and top three next roles, as the employee's plan would list them."""
+        s = self._summaries.get(email)
+        if s is None:
+            e = self.by_email.get(email)
+            if e is None:
+                return None
+            s = self._summaries[email] = {
+                "email": e.email,
+                "role": e.job_title,
+                "department": e.department,
+                "leadership_potential_index": compute_lpi(e),
+                "next_roles": next_role_names(e, self.adjacency)[:3],
+            }
+        return s
+
+    def summary_line(self, email: str) -> str:
+        s = self.summary(email)
+        if s is None:
+            return "Unknown employee"
+        return (
+            f"{s['email']} | {s['role']} | {s['department']} | "
+            f"LPI {s['leadership_potential_index']} | Next roles: {', '.join(s['next_roles']) or 'n/a'}"
+        )
@@ -0,0 +1,74 @@
+"""Keyword intent detection for Kai, compiled once at import.
+
+Every keyword set is folded into a single alternation, so one pass over the
+lower-cased message reports all intents it mentions. Matching is plain substring
+containment, as the ``any(phrase in ql ...)`` checks it replaces were.
+"""
+
+from __future__ import annotations
+
+import re
+from typing import Dict, FrozenSet, Iterable, Optional
+
+WELLBEING = "wellbeing"
+CAREER = "career"
+
+KEYWORDS: Dict[str, tuple] = {
+    WELLBEING: ("stress", "overwhelm", "burnout", "tired", "anxious"),
+    CAREER: (
+        "career path",
+        "next role",
+        "advance",
+        "growth goal",
+        "development plan",
+        "improve my skills",
+        "grow in my career",
+        "how to progress",
+        "move up",
+    ),
+}
+
+_TARGET_ROLE_RE = re.compile(r"(?:become|be|to\s+be)\s+(?:an?\s+)?([^?!.]+)", re.IGNORECASE)
+_ROLE_NOISE_RE = re.compile(r"\b(role|position)\b", re.IGNORECASE)
+_TRANSITION_RE = re.compile(r"\b(?:move|transition|advance)\s+(?:into|to)\s+([A-Z][A-Za-z]+(?:\s+[A-Z][A-Za-z]+)*)")
+
+
+class IntentMatcher:
+    """Report which named keyword sets occur (as substrings) in a text."""
+
+    def __init__(self, keywords: Dict[str, Iterable[str]]) -> None:
+        groups = []
+        for name, phrases in keywords.items():
+            # Longest first so a phrase is not shadowed by a shorter prefix of it
+            alts = sorted({p.lower() for p in phrases}, key=len, reverse=True)
+            groups.append(f"(?P<{name}>{'|'.join(map(re.escape, alts))})")
+        # Zero-width lookahead lets overlapping phrases from different sets all be seen
+        self._re = re.compile(f"(?=(?:{'|'.join(groups)}))")
+        self.names = frozenset(keywords)
+
+    def detect(self, text: str) -> FrozenSet[str]:
+        found = set()
+        for m in self._re.finditer(text):
+            found.add(m.lastgroup)
+            if len(found) == len(self.names):
+                break
+        return frozenset(found)
+
+
+matcher = IntentMatcher(KEYWORDS)
+
+
+def detect(ql: str) -> FrozenSet[str]:
+    """Intents mentioned in an already lower-cased message."""
+    return matcher.detect(ql)
+
+
+def extract_target_role(query: str) -> Optional[str]:
+    match = _TARGET_ROLE_RE.search(query)
+    if match:
+        role = _ROLE_NOISE_RE.sub("", match.group(1)).strip()
+        return role or None
+    match2 = _TRANSITION_RE.search(query)
+    if match2:
+        return match2.group(1).strip()
+    return None
@@ -6,7 +6,8 @@ from dataclasses import dataclass
 from datetime import datetime
 from typing import Dict, List, Optional
 
-from . import recommender
+from . import recommender, store
+from .dataset import Snapshot
 
 
 @dataclass
@@ -14,6 +15,7 @@ class InteractionContext:
     """Small data container hydrated from recommender outputs."""
 
     plans: Dict[str, Dict]
+    snapshot: Optional[Snapshot] = None
 
     @classmethod
     def load(
@@ -35,11 +37,34 @@ class InteractionContext:
             )
         return cls(plans=plans)
 
+    @classmethod
+    def from_snapshot(cls, snap: Snapshot) -> "InteractionContext":
+        """Context whose plans are computed per employee on first use."""
+        return cls(plans={}, snapshot=snap)
+
+    def plan(self, email: str) -> Optional[Dict]:
+        if email not in self.plans and self.snapshot is not None:
+            p = recommender.recommend_for(email, self.snapshot)
+            if p is None:
+                return None
+            self.plans[email] = p
+        return self.plans.get(email)
+
+    def all_plans(self) -> Dict[str, Dict]:
+        if self.snapshot is not None:
+            for e in self.snapshot.employees:
+                self.plan(e.email)
+        return self.plans
+
     def employee_exists(self, email: str) -> bool:
+        if self.snapshot is not None:
+            return email in self.snapshot.directory
         return email in self.plans
 
     def get_employee_summary(self, email: str) -> str:
-        p = self.plans.get(email)
+        if self.snapshot is not None:
+            return self.snapshot.directory.summary_line(email)
+        p = self.plan(email)
         if not p:
             return "Unknown employee"
         emp = p.get("employee", {})
@@ -61,8 +86,10 @@ def mentor_request_message(ctx: InteractionContext, email: str, mentor_email: st
         }
     mentee_summary = ctx.get_employee_summary(email)
     mentor_summary = ctx.get_employee_summary(mentor_email)
+    db = store.get()
     return {
         "status": "submitted",
+        "id": db.record_mentor_request(email, mentor_email, message.strip(), timestamp) if db else None,
         "timestamp": timestamp,
         "mentee": mentee_summary,
         "mentor": mentor_summary,
@@ -85,8 +112,10 @@ def recognition_message(ctx: InteractionContext, sender_email: str, recipient_em
         }
     sender = ctx.get_employee_summary(sender_email)
     recipient = ctx.get_employee_summary(recipient_email)
+    db = store.get()
     return {
         "status": "recorded",
+        "id": db.record_recognition(sender_email, recipient_email, value, note.strip(), timestamp) if db else None,
         "timestamp": timestamp,
         "sender": sender,
         "recipient": recipient,
@@ -103,8 +132,10 @@ def recognition_message(ctx: InteractionContext, sender_email: str, recipient_em
 
 def feedback_simulation(_: InteractionContext, email: str, strengths: List[str], focus: str) -> Dict:
     timestamp = datetime.utcnow().isoformat(timespec="seconds") + "Z"
+    db = store.get()
     return {
         "status": "captured",
+        "id": db.record_feedback(email, focus.strip(), strengths, timestamp) if db else None,
         "timestamp": timestamp,
         "reflection_prompt": (
             "Thank you for sharing. Consider booking a 15‑min retro with your partner "
@@ -125,20 +156,50 @@ def feedback_simulation(_: InteractionContext, email: str, strengths: List[str],
     }
 
 
+def _league_entry(p: Dict) -> Dict:
+    emp = p.get("employee", {})
+    return {
+        "email": emp.get("email"),
+        "role": emp.get("role"),
+        "department": emp.get("department"),
+        "leadership_potential_index": p.get("leadership_potential_index"),
+        "next_roles": [r.get("role") for r in p.get("next_roles", [])[:3]],
+    }
+
+
 def leadership_league(ctx: InteractionContext, limit: int) -> List[Dict]:
+    if ctx.snapshot is not None:
+        return leadership_page(ctx, limit=limit)["items"]
     ranked = sorted(
-        ctx.plans.values(), key=lambda p: p.get("leadership_potential_index", 0), reverse=True
+        ctx.all_plans().values(), key=lambda p: p.get("leadership_potential_index", 0), reverse=True
     )
-    output: List[Dict] = []
-    for p in ranked[:limit]:
-        emp = p.get("employee", {})
-        output.append(
-            {
-                "email": emp.get("email"),
-                "role": emp.get("role"),
-                "department": emp.get("department"),
-                "leadership_potential_index": p.get("leadership_potential_index"),
-                "next_roles": [r.get("role") for r in p.get("next_roles", [])[:3]],
-            }
-        )
-    return output
+    return [_league_entry(p) for p in ranked[:limit]]
+
+
+def leadership_page(
+    ctx: InteractionContext,
+    limit: int,
+    department: Optional[str] = None,
+    unit: Optional[str] = None,
+    offset: int = 0,
+    cursor: Optional[str] = None,
+) -> Dict:
+    """One page of the snapshot's LPI ranking, with directory summaries for the listed employees."""
+    assert ctx.snapshot is not None
+    index = ctx.snapshot.lpi_index
+    directory = ctx.snapshot.directory
+    ranks, total, start = index.page(department=department, unit=unit, offset=offset, limit=limit, cursor=cursor)
+    items = []
+    for i, k in enumerate(ranks.tolist()):
+        e = index.employee(k)
+        entry = dict(directory.summary(e.email) or {})
+        entry["unit"] = e.unit
+        entry["rank"] = start + i + 1
+        items.append(entry)
+    more = start + len(ranks) < total
+    return {
+        "items": items,
+        "total": total,
+        "offset": start,
+        "next_cursor": index.cursor(int(ranks[-1])) if more and len(ranks) else None,
+    }
@@ -1,10 +1,13 @@
 from __future__ import annotations
 
+import asyncio
+import hashlib
 import re
-from typing import Optional, Dict, Any, List
+from typing import Any, AsyncIterator, Dict, FrozenSet, List, NamedTuple, Optional, Tuple
 
-from . import recommender
-from ..core import config
+from . import dataset, intents, materializer
+from .cache import MISSING, LRUCache, SingleFlight
+from ..core import config, metrics
 
 
 def _format_context_for_email(plans: Dict[str, Any], email: Optional[str]) -> str:
@@ -25,62 +28,31 @@ def _format_context_for_email(plans: Dict[str, Any], email: Optional[str]) -> st
     return "\n".join(parts)
 
 
-def _extract_target_role(query: str) -> Optional[str]:
-    match = re.search(r"(?:become|be|to\s+be)\s+(?:an?\s+)?([^?!.]+)", query, flags=re.IGNORECASE)
-    if match:
-        role = re.sub(r"\b(role|position)\b", "", match.group(1), flags=re.IGNORECASE).strip()
-        return role or None
-    match2 = re.search(r"\b(?:move|transition|advance)\s+(?:into|to)\s+([A-Z][A-Za-z]+(?:\s+[A-Z][A-Za-z]+)*)", query)
-    if match2:
-        return match2.group(1).strip()
-    return None
-
-
-def _career_coach_reply(q: str, ql: str, email: Optional[str], plans: Dict[str, Any]) -> Optional[str]:
+def _career_coach_reply(
+    q: str,
+    ql: str,
+    email: Optional[str],
+    plans: Dict[str, Any],
+    found: Optional[FrozenSet[str]] = None,
+) -> Optional[str]:
     if not email or email not in plans:
         return None
 
-    target_role = _extract_target_role(q)
-    career_query = any(
-        phrase in ql
-        for phrase in [
-            "career path",
-            "next role",
-            "advance",
-            "growth goal",
-            "development plan",
-            "improve my skills",
-            "grow in my career",
-            "how to progress",
-            "move up",
-        ]
-    )
+    target_role = intents.extract_target_role(q)
+    career_query = intents.CAREER in (found if found is not None else intents.detect(ql))
 
     if not target_role and not career_query:
         return None
 
-    try:
-        emps = recommender.load_employees(config.EMP_PROFILES_PATH)
-    except Exception:
-        emps = []
-    me = next((emp for emp in emps if emp.email == email), None)
+    snap = dataset.current()
+    me = snap.employee(email)
     current_skills = {s.lower() for s in (me.skills if me else [])}
-    rsi = recommender.build_role_skill_index(emps) if emps else {}
+    rsi = snap.role_skill_index
 
     reply_parts: List[str] = []
 
     if target_role:
-        target_lower = target_role.lower()
-        candidate_role = None
-        for role in rsi.keys():
-            if role.lower() == target_lower:
-                candidate_role = role
-                break
-        if not candidate_role:
-            for role in rsi.keys():
-                if target_lower in role.lower():
-                    candidate_role = role
-                    break
+        candidate_role = snap.role_names.resolve(target_role)
         if candidate_role:
             target_skills = list(rsi.get(candidate_role, {}).keys())
             missing = [sk for sk in target_skills if sk.lower() not in current_skills][:3]
@@ -91,13 +63,9 @@ def _career_coach_reply(q: str, ql: str, email: Optional[str], plans: Dict[str,
                     f"To become a {candidate_role}, focus on building skills like {focus_text}."
                 )
                 course_skill = focus_skills[0]
-                course_resp = recommender.find_courses(
-                    courses_path=config.COURSES_PATH,
-                    skill=course_skill,
-                    limit=1,
-                )
-                if course_resp.get("items"):
-                    course_title = course_resp["items"][0].get("title")
+                courses = snap.course_index.for_skill(course_skill, 1) if snap.course_index is not None else []
+                if courses:
+                    course_title = courses[0].get("title")
                     if course_title:
                         reply_parts.append(
                             f"Consider taking \"{course_title}\" to develop your {course_skill} capability."
@@ -132,13 +100,9 @@ def _career_coach_reply(q: str, ql: str, email: Optional[str], plans: Dict[str,
                 reply_parts.append(
                     f"Consider developing skills like {skills_text} to prepare."
                 )
-                course_resp = recommender.find_courses(
-                    courses_path=config.COURSES_PATH,
-                    skill=missing_skills[0],
-                    limit=1,
-                )
-                if course_resp.get("items"):
-                    course_title = course_resp["items"][0].get("title")
+                courses = snap.course_index.for_skill(missing_skills[0], 1) if snap.course_index is not None else []
+                if courses:
+                    course_title = courses[0].get("title")
                     if course_title:
                         reply_parts.append(
                             f"For example, \"{course_title}\" is a good starting point for {missing_skills[0]}."
@@ -151,109 +115,246 @@ def _career_coach_reply(q: str, ql: str, email: Optional[str], plans: Dict[str,
     return " ".join(reply_parts) if reply_parts else None
 
 
-def chat_reply(q: str, email: Optional[str] = None, locale: Optional[str] = None) -> Dict[str, Any]:
+FALLBACK_REPLY = "I can help with roles, mentors, and courses. Try /plans or /courses."
+SNAG_REPLY = "Sorry, I hit a snag. Try asking about roles, mentors, or courses."
+
+SYSTEM_PROMPT = (
+    "You are ‘Kai’, a concise, friendly career assistant for PSA. "
+    "Use the provided context faithfully. Be accessibility-first, "
+    "avoid PII beyond what’s given, and keep answers under ~120 words."
+    "Give practical, actionable advice that can help users grow career path. "
+)
+
+# Model replies keyed on (dataset version, normalised query, grounding-context hash)
+_reply_cache = LRUCache(config.KAI_CACHE_SIZE, ttl=config.KAI_CACHE_TTL)
+_flights = SingleFlight()
+_cache_version: Optional[int] = None
+_WORD_RE = re.compile(r"[^\W_]+")
+
+# One long-lived async client per process (its httpx pool is shared by every /chat call).
+_client: Any = None
+_model_name: Optional[str] = None
+
+
+def _build_client() -> Tuple[Any, str]:
+    from openai import DefaultAsyncHttpxClient  # type: ignore
+    import httpx
+
+    http_client = DefaultAsyncHttpxClient(
+        limits=httpx.Limits(
+            max_connections=config.OPENAI_MAX_CONNECTIONS,
+            max_keepalive_connections=config.OPENAI_MAX_CONNECTIONS,
+        ),
+    )
+    if config.AZURE_OPENAI_DEPLOYMENT:
+        from openai import AsyncAzureOpenAI  # type: ignore
+
+        endpoint = config.AZURE_OPENAI_ENDPOINT or config.OPENAI_BASE_URL
+        if not endpoint:
+            raise RuntimeError("AZURE_OPENAI_ENDPOINT (or OPENAI_BASE_URL) must be set for Azure OpenAI")
+        client = AsyncAzureOpenAI(
+            api_key=config.OPENAI_API_KEY,
+            api_version=config.AZURE_OPENAI_API_VERSION,
+            azure_endpoint=endpoint,
+            timeout=config.OPENAI_TIMEOUT,
+            max_retries=config.OPENAI_MAX_RETRIES,
+            http_client=http_client,
+        )
+        return client, config.AZURE_OPENAI_DEPLOYMENT
+
+    from openai import AsyncOpenAI  # type: ignore
+
+    client_kwargs = {}
+    if config.OPENAI_BASE_URL:
+        client_kwargs["base_url"] = config.OPENAI_BASE_URL
+    client = AsyncOpenAI(
+        api_key=config.OPENAI_API_KEY,
+        timeout=config.OPENAI_TIMEOUT,
+        max_retries=config.OPENAI_MAX_RETRIES,
+        http_client=http_client,
+        **client_kwargs,
+    )
+    return client, config.OPENAI_MODEL
+
+
+def _get_client() -> Tuple[Any, str]:
+    global _client, _model_name
+    if _client is None:
+        _client, _model_name = _build_client()
+    return _client, _model_name  # type: ignore[return-value]
+
+
+async def startup() -> None:
+    """Create the shared LLM client; called from the app lifespan."""
+    if not config.OPENAI_API_KEY:
+        return
     try:
-        """
-        Returns a reply. If OpenAI key is present, uses the model with grounded context from plans.
-        Otherwise falls back to simple heuristics.
-        """
-        # Well-being quick path
-        ql = q.lower()
-        if any(x in ql for x in ["stress", "overwhelm", "burnout", "tired", "anxious"]):
+        _get_client()
+    except Exception as e:
+        # Each request retries and falls back to the canned reply.
+        print(f"Kai client not initialised: {e}", flush=True)
+
+
+async def shutdown() -> None:
+    global _client, _model_name
+    if _client is not None:
+        await _client.close()
+    _client, _model_name = None, None
+
+
+class _Prompt(NamedTuple):
+    messages: List[Dict[str, str]]
+    cache_key: Tuple[int, str, str]
+
+
+def _normalise_query(q: str) -> str:
+    return " ".join(_WORD_RE.findall(q.lower()))
+
+
+def _route(q: str, email: Optional[str]) -> Tuple[Optional[Dict[str, Any]], Optional[_Prompt]]:
+    """Answer locally when a heuristic applies; otherwise return the grounded LLM prompt."""
+    # Well-being quick path
+    ql = q.lower()
+    found = intents.detect(ql)
+    if intents.WELLBEING in found:
+        return {
+            "reply": (
+                "I’m here for you. Try a 5‑minute pause, breathe 4‑4‑6, "
+                "and consider a short walk. You can access PSA Well‑being resources "
+                "or EAP for confidential support."
+            )
+        }, None
+
+    # Generate context
+    source = materializer.plans()
+    snap = source.snapshot
+    plan = source.get(email) if email else None
+    plans = {email: plan} if plan else {}
+    ctx = _format_context_for_email(plans, email)
+
+    # Career guidance if explicitly requested
+    career_reply = _career_coach_reply(q, ql, email, plans, found)
+    if career_reply:
+        return {"reply": career_reply}, None
+
+    # If OpenAI key not present, return a heuristic response
+    if not config.OPENAI_API_KEY:
+        if "skills" in ql and email and email in plans:
             return {
                 "reply": (
-                    "I’m here for you. Try a 5‑minute pause, breathe 4‑4‑6, "
-                    "and consider a short walk. You can access PSA Well‑being resources "
-                    "or EAP for confidential support."
+                    f"You’re in {plans[email]['employee']['role']} "
+                    f"({plans[email]['employee']['department']}). "
+                    "I can suggest next roles and courses. Try /plans or /courses."
                 )
-            }
+            }, None
+        return {"reply": "Ask about roles, skills, mentors, or courses. Try: /plans or /courses"}, None
 
-        # Generate context
-        try:
-            plans = recommender.recommend(
-                config.EMP_PROFILES_PATH,
-                config.FUNCTIONS_SKILLS_PATH,
-                courses_path=config.COURSES_PATH,
-            )
-        except TypeError:
-            plans = recommender.recommend(
-                config.EMP_PROFILES_PATH,
-                config.FUNCTIONS_SKILLS_PATH,
-            )
-        ctx = _format_context_for_email(plans, email)
-
-        # Career guidance if explicitly requested
-        career_reply = _career_coach_reply(q, ql, email, plans)
-        if career_reply:
-            return {"reply": career_reply}
-
-        # If OpenAI key not present, return a heuristic response
-        if not config.OPENAI_API_KEY:
-            if "skills" in ql and email and email in plans:
-                return {
-                    "reply": (
-                        f"You’re in {plans[email]['employee']['role']} "
-                        f"({plans[email]['employee']['department']}). "
-                        "I can suggest next roles and courses. Try /plans or /courses."
-                    )
-                }
-            return {"reply": "Ask about roles, skills, mentors, or courses. Try: /plans or /courses"}
-
-        # Use OpenAI (or Azure OpenAI) when key is available
-        try:
-            client = None
-            model_name = config.OPENAI_MODEL
-
-            if config.AZURE_OPENAI_DEPLOYMENT:
-                from openai import AzureOpenAI  # type: ignore
-
-                endpoint = config.AZURE_OPENAI_ENDPOINT or config.OPENAI_BASE_URL
-                if not endpoint:
-                    raise RuntimeError("AZURE_OPENAI_ENDPOINT (or OPENAI_BASE_URL) must be set for Azure OpenAI")
-                client = AzureOpenAI(
-                    api_key=config.OPENAI_API_KEY,
-                    api_version=config.AZURE_OPENAI_API_VERSION,
-                    azure_endpoint=endpoint,
-                )
-                model_name = config.AZURE_OPENAI_DEPLOYMENT
-            else:
-                from openai import OpenAI  # type: ignore
+    user = (
+        f"User query: {q}\n"
+        f"Context (employee):\n{ctx}\n"
+        "If user asks for next steps, reference available endpoints: /plans, /mentors, /courses."
+    )
+    messages = [
+        {"role": "system", "content": SYSTEM_PROMPT},
+        {"role": "user", "content": user},
+    ]
+    _sync_cache_version(snap.version)
+    key = (snap.version, _normalise_query(q), hashlib.sha1(ctx.encode("utf-8")).hexdigest())
+    return None, _Prompt(messages, key)
 
-                client_kwargs = {}
-                if config.OPENAI_BASE_URL:
-                    client_kwargs["base_url"] = config.OPENAI_BASE_URL
-                client = OpenAI(api_key=config.OPENAI_API_KEY, **client_kwargs)
 
-            system = (
-                "You are ‘Kai’, a concise, friendly career assistant for PSA. "
-                "Use the provided context faithfully. Be accessibility-first, "
-                "avoid PII beyond what’s given, and keep answers under ~120 words."
-                "Give practical, actionable advice that can help users grow career path. "
+def _sync_cache_version(version: int) -> None:
+    # Cached replies are grounded in one dataset generation; drop them when it changes.
+    global _cache_version
+    if version != _cache_version:
+        _cache_version = version
+        _reply_cache.clear()
 
-            )
-            user = (
-                f"User query: {q}\n"
-                f"Context (employee):\n{ctx}\n"
-                "If user asks for next steps, reference available endpoints: /plans, /mentors, /courses."
-            )
 
-            # Chat Completions API
-            resp = client.chat.completions.create(
-                model=model_name,
-                messages=[
-                    {"role": "system", "content": system},
-                    {"role": "user", "content": user},
-                ],
-                temperature=0.3,
-            )
-            txt = resp.choices[0].message.content.strip() if resp.choices else ""
+async def _complete(messages: List[Dict[str, str]]) -> str:
+    client, model_name = _get_client()
+    resp = await client.chat.completions.create(
+        model=model_name,
+        messages=messages,
+        temperature=0.3,
+    )
+    return resp.choices[0].message.content.strip() if resp.choices else ""
+
+
+async def chat_reply(q: str, email: Optional[str] = None, locale: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Returns a reply. If OpenAI key is present, uses the model with grounded context from plans.
+    Otherwise falls back to simple heuristics.
+    """
+    try:
+        # Intent routing builds plans and searches courses: keep it off the event loop
+        reply, prompt = await asyncio.to_thread(_route, q, email)
+        if reply is not None:
+            return reply
+        cached = _reply_cache.get(prompt.cache_key)
+        if cached is not MISSING:
+            return {"reply": cached}
+
+        # Use OpenAI (or Azure OpenAI) when key is available; identical
+        # concurrent prompts share one upstream call.
+        try:
+            with metrics.stage("llm"):
+                txt = await _flights.run(prompt.cache_key, lambda: _complete(prompt.messages))
             if not txt:
-                txt = "I can help with roles, mentors, and courses. Try /plans or /courses."
+                return {"reply": FALLBACK_REPLY}
+            _reply_cache.set(prompt.cache_key, txt)
             return {"reply": txt}
         except Exception as e:
             print(f"Kai OpenAI fallback: {e}", flush=True)
-            return {"reply": "I can help with roles, mentors, and courses. Try /plans or /courses."}
+            return {"reply": FALLBACK_REPLY}
     except Exception as outer:
         # Ensure the API never returns non-JSON on unexpected errors
         print(f"Kai handler error: {outer}", flush=True)
-        return {"reply": "Sorry, I hit a snag. Try asking about roles, mentors, or courses."}
+        return {"reply": SNAG_REPLY}
+
+
+async def chat_stream(q: str, email: Optional[str] = None, locale: Optional[str] = None) -> AsyncIterator[str]:
+    """Yield reply text as it is generated; local replies arrive as a single chunk."""
+    try:
+        reply, prompt = await asyncio.to_thread(_route, q, email)
+    except Exception as outer:
+        print(f"Kai handler error: {outer}", flush=True)
+        yield SNAG_REPLY
+        return
+    if reply is not None:
+        yield reply["reply"]
+        return
+    cached = _reply_cache.get(prompt.cache_key)
+    if cached is not MISSING:
+        yield cached
+        return
+
+    parts: List[str] = []
+    complete = False
+    stream = None
+    try:
+        with metrics.stage("llm_stream"):
+            client, model_name = _get_client()
+            stream = await client.chat.completions.create(
+                model=model_name,
+                messages=prompt.messages,
+                temperature=0.3,
+                stream=True,
+            )
+            async for chunk in stream:
+                delta = chunk.choices[0].delta.content if chunk.choices else None
+                if delta:
+                    parts.append(delta)
+                    yield delta
+        complete = True
+    except Exception as e:
+        print(f"Kai OpenAI fallback: {e}", flush=True)
+    finally:
+        # Also runs when the SSE client disconnects: release the upstream connection
+        if stream is not None:
+            await stream.close()
+    txt = "".join(parts).strip()
+    if not parts:
+        yield FALLBACK_REPLY
+    elif complete and txt:
+        _reply_cache.set(prompt.cache_key, txt)
@@ -0,0 +1,165 @@
+"""Employees ranked by Leadership Potential Index, built once per dataset snapshot.
+
+Ranking matches the sort `/leadership` used to do over every plan: LPI
+descending, ties in file order, one entry per email (its last profile, at the
+position of its first). Department and unit groups are arrays of overall ranks,
+so filtering, paging and rank lookups are slices and binary searches.
+"""
+
+from __future__ import annotations
+
+from typing import Dict, List, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .recommender import EmployeeLite
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+def _groups(keys: List[str]) -> Dict[str, np.ndarray]:
+    out: Dict[str, List[int]] = {}
+    for k, key in enumerate(keys):
+        out.setdefault(key.lower(), []).append(k)
+    return {key: np.asarray(ks, dtype=np.int64) for key, ks in out.items()}
+
+
+class LeadershipIndex:
+    def __init__(self, employees: Sequence[EmployeeLite], lpi: Sequence[float]) -> None:
+        first: Dict[str, int] = {}
+        last: Dict[str, int] = {}
+        for i, e in enumerate(employees):
+            first.setdefault(e.email, i)
+            last[e.email] = i
+        pos = np.fromiter(first.values(), dtype=np.int64, count=len(first))
+        rows = np.fromiter((last[m] for m in first), dtype=np.int64, count=len(first))
+        score = np.asarray(lpi, dtype=np.float64)[rows] if len(rows) else np.zeros(0)
+        order = np.lexsort((pos, -score))
+        rank = np.empty(len(order), dtype=np.int64)
+        rank[order] = np.arange(len(order))
+        ranked = [employees[r] for r in rows[order].tolist()]
+        self._init(
+            employees, rows[order], score[order], pos[order],
+            dict(zip(first, rank.tolist())),
+            _groups([e.department for e in ranked]),
+            _groups([e.unit for e in ranked]),
+        )
+
+    @classmethod
+    def from_parts(
+        cls,
+        employees: Sequence[EmployeeLite],
+        rows: np.ndarray,
+        score: np.ndarray,
+        neg_score: np.ndarray,
+        pos: np.ndarray,
+        rank_of: Mapping[str, int],
+        departments: Dict[str, np.ndarray],
+        units: Dict[str, np.ndarray],
+    ) -> "LeadershipIndex":
+        """Reassemble an index from previously built parts (see ``compiled``)."""
+        self = cls.__new__(cls)
+        self._init(employees, rows, score, pos, rank_of, departments, units, neg_score)
+        return self
+
+    def _init(
+        self,
+        employees: Sequence[EmployeeLite],
+        rows: np.ndarray,
+        score: np.ndarray,
+        pos: np.ndarray,
+        rank_of: Mapping[str, int],
+        departments: Dict[str, np.ndarray],
+        units: Dict[str, np.ndarray],
+        neg_score: Optional[np.ndarray] = None,
+    ) -> None:
+        self.employees = employees
+        # Everything below is indexed by overall rank (0-based)
+        self.rows = rows
+        self.score = score
+        self.pos = pos
+        self.neg_score = -score if neg_score is None else neg_score
+        # email -> overall rank, in first-seen order
+        self.rank_of = rank_of
+        self.departments = departments
+        self.units = units
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    def employee(self, rank: int) -> EmployeeLite:
+        return self.employees[int(self.rows[rank])]
+
+    def select(self, department: Optional[str] = None, unit: Optional[str] = None) -> np.ndarray:
+        """Overall ranks of the employees matching the (case-insensitive) filters, best first."""
+        ks: Optional[np.ndarray] = None
+        for groups, key in ((self.departments, department), (self.units, unit)):
+            if not key:
+                continue
+            g = groups.get(key.lower(), np.zeros(0, dtype=np.int64))
+            ks = g if ks is None else np.intersect1d(ks, g, assume_unique=True)
+        return np.arange(len(self.rows), dtype=np.int64) if ks is None else ks
+
+    def cursor(self, rank: int) -> str:
+        # repr of a Python float: numpy 2 would render its own scalars as np.float64(...)
+        return f"{float(self.score[rank])!r}:{int(self.pos[rank])}"
+
+    def _after(self, cursor: str) -> int:
+        """First overall rank strictly after the entry a cursor points at."""
+        try:
+            s, p = cursor.rsplit(":", 1)
+            neg, pos = -float(s), int(p)
+        except ValueError:
+            raise InvalidCursor(cursor) from None
+        lo = int(np.searchsorted(self.neg_score, neg, side="left"))
+        hi = int(np.searchsorted(self.neg_score, neg, side="right"))
+        return lo + int(np.searchsorted(self.pos[lo:hi], pos, side="right"))
+
+    def page(
+        self,
+        department: Optional[str] = None,
+        unit: Optional[str] = None,
+        offset: int = 0,
+        limit: int = 10,
+        cursor: Optional[str] = None,
+    ) -> Tuple[np.ndarray, int, int]:
+        """(overall ranks on this page, filtered total, index of the page's first entry in the filtered list).
+
+        A ``cursor`` (from :meth:`cursor`) continues after the entry it names and
+        takes precedence over ``offset``.
+        """
+        after = self._after(cursor) if cursor else None
+        if not department and not unit:
+            n = len(self.rows)
+            start = max(0, min(after if after is not None else offset, n))
+            return np.arange(start, min(start + limit, n), dtype=np.int64), n, start
+        ks = self.select(department, unit)
+        start = int(np.searchsorted(ks, after, side="left")) if after is not None else offset
+        start = max(0, min(start, len(ks)))
+        return ks[start:start + limit], len(ks), start
+
+    def scores(self, email: Optional[str] = None) -> Dict[str, Optional[float]]:
+        """``{email: LPI}`` for one email (None if unknown) or for everyone in file order, as ``get_lpi`` lists it."""
+        if email:
+            k = self.rank_of.get(email)
+            return {email: float(self.score[k]) if k is not None else None}
+        score = self.score.tolist()
+        return {m: score[k] for m, k in self.rank_of.items()}
+
+    def rank(self, email: str) -> Optional[Dict[str, object]]:
+        """1-based rank of one employee overall, within their department and within their unit."""
+        k = self.rank_of.get(email)
+        if k is None:
+            return None
+        e = self.employee(k)
+        dept = self.departments[e.department.lower()]
+        unit = self.units[e.unit.lower()]
+        return {
+            "email": email,
+            "leadership_potential_index": float(self.score[k]),
+            "overall": {"rank": k + 1, "total": len(self.rows)},
+            "department": {"name": e.department, "rank": int(np.searchsorted(dept, k)) + 1, "total": len(dept)},
+            "unit": {"name": e.unit, "rank": int(np.searchsorted(unit, k)) + 1, "total": len(unit)},
+        }
@@ -0,0 +1,318 @@
+"""Read-only views over the arrays of a mapped compiled snapshot.
+
+:func:`.compiled.load_snapshot` hands these to a snapshot in place of a Python
+object per string, employee and role: each view decodes only the entries a
+request reads, straight from the mapping, so a worker attached to a shared
+generation (``DATASET_SHARED_DIR``) keeps little of its own beyond the page
+cache. They are the ``Sequence``/``Mapping`` types the services already read
+(``employees``, ``by_email``, the role-skill index and adjacency), so callers do
+not tell them apart from the dicts and lists a parsed snapshot holds.
+
+Lookups by name binary-search a sorted array of 64-bit name hashes
+(:func:`name_hashes`, written by the compiler) and confirm the decoded name.
+Single entries are read through ``memoryview``s of the arrays, which index to
+plain Python ints and floats without numpy's per-scalar overhead.
+"""
+
+from __future__ import annotations
+
+import bisect
+import hashlib
+from collections.abc import Mapping, Sequence, ValuesView
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+from .cache import MISSING, LRUCache
+from .recommender import EmployeeLite
+
+# Entries decoded per batch when iterating a view
+CHUNK = 4096
+# Decoded rows kept per role view: plans read the same few roles' vectors and neighbours over and over
+ROLE_MEMO_SIZE = 2048
+
+
+def name_hash(name: str) -> int:
+    """Process-independent 64-bit hash of a name (``hash()`` is salted per process)."""
+    return int.from_bytes(hashlib.blake2b(name.encode("utf-8"), digest_size=8).digest(), "little")
+
+
+def name_hashes(names: Iterable[str]) -> Tuple[np.ndarray, np.ndarray]:
+    """(sorted hashes, position of each in ``names``), the arrays a :class:`NameIndex` searches."""
+    hashes = np.fromiter((name_hash(n) for n in names), dtype=np.uint64)
+    order = np.argsort(hashes, kind="stable")
+    return hashes[order], order.astype(np.int64)
+
+
+class NameIndex:
+    """Position of a name among unique names, found by hash and confirmed with ``name_at``."""
+
+    def __init__(self, hashes: np.ndarray, positions: np.ndarray, name_at: Callable[[int], str]) -> None:
+        self.hashes = memoryview(hashes)
+        self.positions = memoryview(positions)
+        self.name_at = name_at
+
+    def find(self, name: object) -> int:
+        """Position of ``name``, or -1."""
+        if not isinstance(name, str):
+            return -1
+        h = name_hash(name)
+        hashes = self.hashes
+        i = bisect.bisect_left(hashes, h)
+        while i < len(hashes) and hashes[i] == h:
+            k = self.positions[i]
+            if self.name_at(k) == name:
+                return k
+            i += 1
+        return -1
+
+
+class StringTable(Sequence):
+    """The snapshot's string table (UTF-8 blob + offsets), decoded on access.
+
+    The first ``vocab`` strings (titles, skills and the like, shared by many
+    rows) are decoded once up front; the rest, such as emails, on every access.
+    """
+
+    def __init__(self, blob: np.ndarray, offsets: np.ndarray, vocab: int = 0) -> None:
+        self._blob = memoryview(blob)
+        self._offsets = memoryview(offsets)
+        self._vocab: List[str] = []
+        self._vocab = self.take(range(vocab))
+
+    def __len__(self) -> int:
+        return len(self._offsets) - 1
+
+    def __getitem__(self, i: int) -> str:  # type: ignore[override]
+        if i < len(self._vocab):
+            return self._vocab[i]
+        offs = self._offsets
+        return str(self._blob[offs[i]:offs[i + 1]], "utf-8")
+
+    def get(self, i: int) -> Optional[str]:
+        """String ``i``, or None for the -1 the compiler writes for a missing value."""
+        return self[i] if i >= 0 else None
+
+    def take(self, ids: Iterable[int]) -> List[str]:
+        """Strings for ids (all >= 0): an array, a memoryview slice or a list."""
+        offs, blob, vocab = self._offsets, self._blob, self._vocab
+        n = len(vocab)
+        return [
+            vocab[i] if i < n else str(blob[offs[i]:offs[i + 1]], "utf-8")
+            for i in (ids.tolist() if hasattr(ids, "tolist") else ids)
+        ]
+
+
+class StringColumn(Sequence):
+    """A column of string ids read as the strings themselves (e.g. sorted course terms, for ``bisect``)."""
+
+    def __init__(self, strings: StringTable, ids: np.ndarray) -> None:
+        self.strings = strings
+        self.ids = ids
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def __getitem__(self, i):  # type: ignore[override]
+        if isinstance(i, slice):
+            return self.strings.take(self.ids[i])
+        return self.strings[self.ids[i]]
+
+    def __iter__(self) -> Iterator[str]:
+        for lo in range(0, len(self.ids), CHUNK):
+            yield from self.strings.take(self.ids[lo:lo + CHUNK])
+
+
+class EmployeeTable(Sequence):
+    """Employee records of a compiled snapshot (the ``emp.*`` arrays), built on access."""
+
+    def __init__(self, strings: StringTable, a: Dict[str, np.ndarray]) -> None:
+        self.strings = strings
+        self.email = a["emp.email"]
+        self._cols = tuple(memoryview(a[f"emp.{k}"]) for k in (
+            "email", "title", "dept", "unit", "since", "outcomes",
+            "skills.ptr", "skills", "levels.ptr", "levels", "positions.ptr", "positions",
+        ))
+
+    def __len__(self) -> int:
+        return len(self.email)
+
+    def __getitem__(self, i):  # type: ignore[override]
+        if isinstance(i, slice):
+            return [self[j] for j in range(*i.indices(len(self)))]
+        i = int(i)
+        if i < 0:
+            i += len(self)
+        if not 0 <= i < len(self):
+            raise IndexError(i)
+        s = self.strings
+        email, title, dept, unit, since, outcomes, sp, sk, lp, lv, pp, pos = self._cols
+        return EmployeeLite(
+            email=s[email[i]],
+            job_title=s[title[i]],
+            department=s[dept[i]],
+            unit=s[unit[i]],
+            in_role_since=s.get(since[i]),
+            skills=tuple(s.take(sk[sp[i]:sp[i + 1]])),
+            competency_levels=tuple(s.take(lv[lp[i]:lp[i + 1]])),
+            position_titles=tuple(s.get(j) for j in pos[pp[i]:pp[i + 1]].tolist()),
+            outcomes=outcomes[i],
+        )
+
+    def __iter__(self) -> Iterator[EmployeeLite]:
+        for i in range(len(self)):
+            yield self[i]
+
+    def email_at(self, i: int) -> str:
+        return self.strings[self._cols[0][i]]
+
+
+class EmailMap(Mapping):
+    """``{email: employee}`` like ``Snapshot.by_email``: each email's last profile, in first-seen order.
+
+    Entry ``k`` is the ``k``-th distinct email; ``first[k]``/``last[k]`` are the
+    employee rows of its first and last profile.
+    """
+
+    def __init__(
+        self, employees: EmployeeTable, first: np.ndarray, last: np.ndarray, hashes: np.ndarray, positions: np.ndarray,
+    ) -> None:
+        self.employees = employees
+        self.first = first
+        self.last = last
+        first_mv, self._last = memoryview(first), memoryview(last)
+        self._index = NameIndex(hashes, positions, lambda k: employees.email_at(first_mv[k]))
+
+    def entry(self, email: object) -> int:
+        """Entry number of ``email``, or -1."""
+        return self._index.find(email)
+
+    def __getitem__(self, email: str) -> EmployeeLite:
+        k = self.entry(email)
+        if k < 0:
+            raise KeyError(email)
+        return self.employees[self._last[k]]
+
+    def __contains__(self, email: object) -> bool:
+        return self.entry(email) >= 0
+
+    def __len__(self) -> int:
+        return len(self.first)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(StringColumn(self.employees.strings, self.employees.email[self.first]))
+
+    def values(self) -> "_EmailValues":
+        return _EmailValues(self)
+
+
+class _EmailValues(ValuesView):
+    def __iter__(self) -> Iterator[EmployeeLite]:
+        emails: EmailMap = self._mapping  # type: ignore[assignment]
+        for row in emails.last.tolist():
+            yield emails.employees[row]
+
+
+class EmailColumn(Mapping):
+    """``{email: values[k]}`` over the entries of an :class:`EmailMap` (e.g. rank or first row per email)."""
+
+    def __init__(self, emails: EmailMap, values: np.ndarray) -> None:
+        self.emails = emails
+        self.column = values
+        self._column = memoryview(values)
+
+    def __getitem__(self, email: str) -> int:
+        k = self.emails.entry(email)
+        if k < 0:
+            raise KeyError(email)
+        return self._column[k]
+
+    def __contains__(self, email: object) -> bool:
+        return self.emails.entry(email) >= 0
+
+    def __len__(self) -> int:
+        return len(self.emails)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.emails)
+
+    def items(self) -> Iterator[Tuple[str, int]]:  # type: ignore[override]
+        return zip(self.emails, self.column.tolist())
+
+
+class RoleNames(StringColumn):
+    """Role names in role-index order, with a name -> row lookup."""
+
+    def __init__(self, strings: StringTable, ids: np.ndarray, hashes: np.ndarray, positions: np.ndarray) -> None:
+        super().__init__(strings, ids)
+        self._ids = memoryview(ids)
+        self._index = NameIndex(hashes, positions, self.name)
+
+    def name(self, i: int) -> str:
+        return self.strings[self._ids[i]]
+
+    def find(self, role: object) -> int:
+        return self._index.find(role)
+
+
+class RoleVectors(Mapping):
+    """``{role: {skill: weight}}`` over a role x skill CSR table (raw or L2-normalised weights)."""
+
+    def __init__(self, roles: RoleNames, ptr: np.ndarray, skills: np.ndarray, weights: np.ndarray) -> None:
+        self.roles = roles
+        self.ptr = memoryview(ptr)
+        self.skills = memoryview(skills)
+        self.weights = memoryview(weights)
+        self._memo = LRUCache(ROLE_MEMO_SIZE)
+
+    def __getitem__(self, role: str) -> Dict[str, float]:
+        vec = self._memo.get(role)
+        if vec is MISSING:
+            i = self.roles.find(role)
+            if i < 0:
+                raise KeyError(role)
+            lo, hi = self.ptr[i], self.ptr[i + 1]
+            vec = dict(zip(self.roles.strings.take(self.skills[lo:hi]), self.weights[lo:hi].tolist()))
+            self._memo.set(role, vec)
+        return vec
+
+    def __contains__(self, role: object) -> bool:
+        return self.roles.find(role) >= 0
+
+    def __len__(self) -> int:
+        return len(self.roles)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.roles)
+
+
+class RoleAdjacency(Mapping):
+    """``{role: [(neighbour, similarity), ...]}`` over the adjacency CSR (neighbours as role rows)."""
+
+    def __init__(self, roles: RoleNames, ptr: np.ndarray, neighbours: np.ndarray, sims: np.ndarray) -> None:
+        self.roles = roles
+        self.ptr = memoryview(ptr)
+        self.neighbours = memoryview(neighbours)
+        self.sims = memoryview(sims)
+        self._memo = LRUCache(ROLE_MEMO_SIZE)
+
+    def __getitem__(self, role: str) -> List[Tuple[str, float]]:
+        row = self._memo.get(role)
+        if row is MISSING:
+            i = self.roles.find(role)
+            if i < 0:
+                raise KeyError(role)
+            lo, hi = self.ptr[i], self.ptr[i + 1]
+            names = [self.roles.name(j) for j in self.neighbours[lo:hi].tolist()]
+            row = list(zip(names, self.sims[lo:hi].tolist()))
+            self._memo.set(role, row)
+        return row
+
+    def __contains__(self, role: object) -> bool:
+        return self.roles.find(role) >= 0
+
+    def __len__(self) -> int:
+        return len(self.roles)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.roles)
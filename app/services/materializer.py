@@ -0,0 +1,189 @@
+"""Every employee's plan, computed ahead of requests and swapped in whole.
+
+With ``PLAN_MATERIALIZER`` on, a background thread (started from the app
+lifespan) watches the dataset store and, whenever it publishes a snapshot with
+different data, builds the plan of every employee in it, optionally sharded by
+employee range across forked worker processes (``PLAN_MATERIALIZER_WORKERS``).
+The finished :class:`MaterializedPlans` replaces the previous one with a single
+reference assignment, so handlers read plans without locking and keep getting
+the previous generation, together with the snapshot it was built from, until
+the next one is complete. Until the first generation exists, and when the
+materializer is off, :func:`plans` builds plans on demand. Every worker process
+holds its own generation (about 13 KB per employee), which is why this is opt-in.
+"""
+
+from __future__ import annotations
+
+import multiprocessing
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Collection, Dict, Iterable, Iterator, List, Optional
+
+from . import dataset, recommender
+from ..core import config, metrics
+
+Plan = Dict[str, Any]
+
+
+def _project(plan: Plan, fields: Optional[Collection[str]]) -> Plan:
+    if fields is None:
+        return plan
+    return {k: plan[k] for k in recommender.PLAN_FIELDS if k in fields and k in plan}
+
+
+class OnDemandPlans:
+    """Plans built per request from ``snapshot`` (the recommender functions)."""
+
+    def __init__(self, snapshot: dataset.Snapshot) -> None:
+        self.snapshot = snapshot
+
+    def get(self, email: str, fields: Optional[Collection[str]] = None) -> Optional[Plan]:
+        return recommender.recommend_for(email, self.snapshot, fields)
+
+    def many(self, emails: Iterable[str], fields: Optional[Collection[str]] = None) -> Dict[str, Optional[Plan]]:
+        return recommender.recommend_many(emails, self.snapshot, fields)
+
+    def iter(self, fields: Optional[Collection[str]] = None) -> Iterator[Plan]:
+        return recommender.iter_plans(self.snapshot, fields)
+
+    def all(self, fields: Optional[Collection[str]] = None) -> Dict[str, Plan]:
+        return recommender.recommend_all(self.snapshot, fields)
+
+
+class MaterializedPlans(OnDemandPlans):
+    """Every plan of ``snapshot``, keyed by email in employee order; read-only once published."""
+
+    def __init__(self, snapshot: dataset.Snapshot, plans: Dict[str, Plan]) -> None:
+        super().__init__(snapshot)
+        self.plans = plans
+
+    def get(self, email: str, fields: Optional[Collection[str]] = None) -> Optional[Plan]:
+        plan = self.plans.get(email)
+        return _project(plan, fields) if plan is not None else None
+
+    def many(self, emails: Iterable[str], fields: Optional[Collection[str]] = None) -> Dict[str, Optional[Plan]]:
+        return {email: self.get(email, fields) for email in emails}
+
+    def iter(self, fields: Optional[Collection[str]] = None) -> Iterator[Plan]:
+        return (_project(p, fields) for p in self.plans.values())
+
+    def all(self, fields: Optional[Collection[str]] = None) -> Dict[str, Plan]:
+        if fields is None:
+            return self.plans
+        return {email: _project(p, fields) for email, p in self.plans.items()}
+
+
+# Snapshot being materialized and its emails, inherited by forked workers instead of pickled to them
+_source: Optional[dataset.Snapshot] = None
+_emails: List[str] = []
+
+
+def _plan_range(lo: int, hi: int) -> List[Plan]:
+    snap = _source
+    assert snap is not None
+    taxo, rsi, adj, courses = snap.taxonomy, snap.role_skill_index, snap.adjacency, snap.course_index
+    lookup, unit, by_email = snap.taxonomy_lookup, snap.role_index.unit, snap.by_email
+    return [
+        recommender.build_plan(by_email[email], taxo, rsi, adj, courses, None, lookup, unit)
+        for email in _emails[lo:hi]
+    ]
+
+
+def build_plans(snap: dataset.Snapshot, workers: int = 0, shard: int = 2000) -> MaterializedPlans:
+    """Materialize ``snap``; with ``workers`` > 0, in forked processes ``shard`` employees at a time."""
+    global _source, _emails
+    emails = list(snap.by_email)
+    if workers <= 0 or len(emails) <= shard or "fork" not in multiprocessing.get_all_start_methods():
+        return MaterializedPlans(snap, dict(zip(emails, recommender.iter_plans(snap))))
+    _source, _emails = snap, emails
+    try:
+        starts = range(0, len(emails), shard)
+        with ProcessPoolExecutor(workers, mp_context=multiprocessing.get_context("fork")) as pool:
+            plans: Dict[str, Plan] = {}
+            for lo, part in zip(starts, pool.map(_plan_range, starts, [lo + shard for lo in starts])):
+                plans.update(zip(emails[lo:lo + shard], part))
+    finally:
+        _source, _emails = None, []
+    return MaterializedPlans(snap, plans)
+
+
+class Materializer:
+    def __init__(self, workers: int = 0, shard: int = 2000, interval: float = 2.0) -> None:
+        self.workers = workers
+        self.shard = shard
+        self.interval = interval
+        self.current: Optional[MaterializedPlans] = None
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="plan-materializer", daemon=True)
+            self._thread.start()
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def refresh(self) -> Optional[MaterializedPlans]:
+        """Materialize the store's current snapshot if its data differs from the published generation."""
+        snap = dataset.current()
+        cur = self.current
+        if cur is not None and cur.snapshot.etag == snap.etag:
+            if cur.snapshot is not snap:
+                # Same data reloaded (e.g. another worker's generation): keep the plans, follow the snapshot
+                self.current = MaterializedPlans(snap, cur.plans)
+            return None
+        t0 = time.perf_counter()
+        with metrics.stage("plan_materialize"):
+            built = build_plans(snap, self.workers, self.shard)
+        self.current = built
+        print(f"Materialized {len(built.plans)} plans in {time.perf_counter() - t0:.1f}s", flush=True)
+        return built
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            try:
+                self.refresh()
+            except Exception as e:
+                # Keep serving the previous generation; the next check will retry.
+                print(f"Plan materialization failed: {e}", flush=True)
+            self._stop.wait(self.interval)
+
+
+_materializer: Optional[Materializer] = None
+_lock = threading.Lock()
+
+
+def start() -> Optional[Materializer]:
+    """Start the process-wide materializer; None when ``PLAN_MATERIALIZER`` is off."""
+    global _materializer
+    if not config.PLAN_MATERIALIZER:
+        return None
+    with _lock:
+        if _materializer is None:
+            _materializer = Materializer(
+                workers=config.PLAN_MATERIALIZER_WORKERS,
+                shard=config.PLAN_MATERIALIZER_SHARD,
+                interval=config.DATASET_CHECK_INTERVAL,
+            )
+            _materializer.start()
+    return _materializer
+
+
+def shutdown() -> None:
+    global _materializer
+    with _lock:
+        if _materializer is not None:
+            _materializer.stop(timeout=5)
+        _materializer = None
+
+
+def plans() -> OnDemandPlans:
+    """The latest materialized generation, or on-demand plans for the current snapshot until there is one."""
+    m = _materializer
+    cur = m.current if m is not None else None
+    return cur if cur is not None else OnDemandPlans(dataset.current())
@@ -0,0 +1,145 @@
+"""Precomputed arrays for mentor matching, built once per dataset snapshot."""
+
+from __future__ import annotations
+
+from typing import Any, Dict, Iterable, Iterator, List, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .recommender import EmployeeLite, compute_lpi, top_k_indices
+
+# Upper bound on cells in one (mentees x employees) score block when matching several mentees
+MENTOR_BLOCK_CELLS = 1 << 22
+
+
+def _codes(values: Sequence[str]) -> Tuple[np.ndarray, Dict[str, int]]:
+    table: Dict[str, int] = {}
+    return np.fromiter((table.setdefault(v, len(table)) for v in values), dtype=np.int64, count=len(values)), table
+
+
+class MentorIndex:
+    """Employees indexed by department, unit and role with LPI and seniority precomputed.
+
+    Scoring follows the original heuristic: 0.35 same department + 0.2 same unit
+    + 0.25 role among the mentee's adjacent roles + 0.02 per LPI point above the
+    mentee + 0.05 per previous position.
+    """
+
+    def __init__(
+        self,
+        employees: Sequence[EmployeeLite],
+        adjacency: Mapping[str, List[Tuple[str, float]]],
+        lpi: Optional[Sequence[float]] = None,
+    ) -> None:
+        self.employees = employees
+        self.lpi = np.asarray(lpi if lpi is not None else [compute_lpi(e) for e in employees], dtype=np.float64)
+        self.seniority = np.asarray([len(e.position_titles) for e in employees], dtype=np.float64)
+        self.email_code, _ = _codes([e.email for e in employees])
+        self.dept, _ = _codes([e.department for e in employees])
+        self.unit, _ = _codes([e.unit for e in employees])
+        self.role, roles = _codes([e.job_title for e in employees])
+        # first row per email, matching the linear scan this replaces
+        row_of: Dict[str, int] = {}
+        for i, e in enumerate(employees):
+            row_of.setdefault(e.email, i)
+        self.row_of: Mapping[str, int] = row_of
+        self.mentee_rows = np.asarray(sorted(row_of.values()), dtype=np.int64)
+        # Roles adjacent to each role code, as CSR (similar_ptr, similar)
+        similar = [[roles[r] for r, _ in adjacency.get(title, []) if r in roles] for title in roles]
+        self.similar_ptr = np.zeros(len(similar) + 1, dtype=np.int64)
+        np.cumsum([len(x) for x in similar], out=self.similar_ptr[1:])
+        self.similar = np.fromiter((j for x in similar for j in x), dtype=np.int64, count=int(self.similar_ptr[-1]))
+
+    @classmethod
+    def from_parts(
+        cls,
+        employees: Sequence[EmployeeLite],
+        lpi: np.ndarray,
+        seniority: np.ndarray,
+        email_code: np.ndarray,
+        dept: np.ndarray,
+        unit: np.ndarray,
+        role: np.ndarray,
+        similar_ptr: np.ndarray,
+        similar: np.ndarray,
+        row_of: Mapping[str, int],
+        mentee_rows: np.ndarray,
+    ) -> "MentorIndex":
+        """Reassemble an index from previously built parts (see ``compiled``)."""
+        self = cls.__new__(cls)
+        self.employees = employees
+        self.lpi = lpi
+        self.seniority = seniority
+        self.email_code = email_code
+        self.dept = dept
+        self.unit = unit
+        self.role = role
+        self.similar_ptr = similar_ptr
+        self.similar = similar
+        self.row_of = row_of
+        self.mentee_rows = mentee_rows
+        return self
+
+    @property
+    def n_roles(self) -> int:
+        return len(self.similar_ptr) - 1
+
+    def _scores(self, rows: np.ndarray) -> np.ndarray:
+        role_sim = np.zeros((len(rows), self.n_roles), dtype=np.float64)
+        ptr = self.similar_ptr
+        for i, r in enumerate(self.role[rows].tolist()):
+            role_sim[i, self.similar[ptr[r]:ptr[r + 1]]] = 1.0
+        same_dept = (self.dept[rows][:, None] == self.dept[None, :]).astype(np.float64)
+        same_unit = (self.unit[rows][:, None] == self.unit[None, :]).astype(np.float64)
+        lift = np.maximum(0.0, self.lpi[None, :] - self.lpi[rows][:, None])
+        score = (
+            0.35*same_dept + 0.2*same_unit + 0.25*role_sim[:, self.role]
+            + 0.2*lift/10.0 + 0.05*self.seniority[None, :]
+        )
+        score[self.email_code[rows][:, None] == self.email_code[None, :]] = -np.inf
+        return score
+
+    def _entries(self, score: np.ndarray, limit: int) -> List[Dict[str, Any]]:
+        out = []
+        for j in top_k_indices(np.round(score, 3), max(1, limit)):
+            if score[j] == -np.inf:
+                break
+            e = self.employees[j]
+            out.append({
+                "email": e.email,
+                "role": e.job_title,
+                "department": e.department,
+                "unit": e.unit,
+                "leadership_potential_index": float(self.lpi[j]),
+                "score": round(float(score[j]), 3),
+            })
+        return out
+
+    def match(self, email: str, limit: int = 3) -> Dict[str, Any]:
+        row = self.row_of.get(email)
+        if row is None:
+            return {"email": email, "mentors": []}
+        score = self._scores(np.asarray([row]))[0]
+        return {"email": email, "mentors": self._entries(score, limit)}
+
+    def _match_rows(self, rows: np.ndarray, limit: int) -> Iterator[Tuple[int, List[Dict[str, Any]]]]:
+        """(row, top mentors) for each mentee row, scoring them in blocks."""
+        step = max(1, MENTOR_BLOCK_CELLS // max(1, len(self.employees)))
+        for start in range(0, len(rows), step):
+            block = rows[start:start + step]
+            for row, score in zip(block, self._scores(block)):
+                yield int(row), self._entries(score, limit)
+
+    def match_many(self, emails: Iterable[str], limit: int = 3) -> Dict[str, Dict[str, Any]]:
+        """:meth:`match` for several mentees at once, keyed by email in first-seen order."""
+        out = {email: {"email": email, "mentors": []} for email in emails}
+        known = [email for email in out if email in self.row_of]
+        rows = np.asarray([self.row_of[email] for email in known], dtype=np.int64)
+        for email, (_, mentors) in zip(known, self._match_rows(rows, limit)):
+            out[email]["mentors"] = mentors
+        return out
+
+    def match_all(self, limit: int = 3) -> Iterator[Dict[str, Any]]:
+        """Top mentors for every employee, scoring mentees in blocks of rows."""
+        for row, mentors in self._match_rows(self.mentee_rows, limit):
+            yield {"email": self.employees[row].email, "mentors": mentors}
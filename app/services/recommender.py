@@ -1,14 +1,33 @@
 from __future__ import annotations
 
-import json, math
+import json, math, sys
 from dataclasses import dataclass, field
 from datetime import datetime, date
-from typing import Any, Dict, List, Optional, Tuple
+from typing import TYPE_CHECKING, Any, Collection, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple, Union
 
+import numpy as np
 import pandas as pd
 
+try:
+    from scipy import sparse  # type: ignore
+except Exception:  # scipy is optional; fall back to dense numpy matrices
+    sparse = None
+
+from .course_index import CourseIndex
+from ..core.metrics import timed
+
+if TYPE_CHECKING:
+    from .dataset import Snapshot
+    from .lpi_index import LeadershipIndex
+    from .mentor_index import MentorIndex
+
 TODAY = date.today()
 LEVEL_WEIGHTS = {"Beginner": 0.25, "Intermediate": 0.5, "Advanced": 0.85, "Expert": 1.0}
+# Upper bound on cells in one dense block of the role x role similarity product
+ADJACENCY_BLOCK_CELLS = 1 << 22
+UPSKILLING_SKILLS = 8
+COURSES_PER_SKILL = 3
+COURSE_FIELDS = ("title", "provider", "difficulty", "duration_hours", "language", "url")
 
 def _parse_date(s: Optional[str]):
     if not s: return None
@@ -17,36 +36,85 @@ def _parse_date(s: Optional[str]):
 
 @dataclass
 class EmployeeLite:
+    """Compact profile holding only what the recommender reads.
+
+    Repeated strings are interned so the whole org shares one copy of each
+    skill, title, department and unit name.
+    """
+
+    __slots__ = (
+        "email", "job_title", "department", "unit", "in_role_since",
+        "skills", "competency_levels", "position_titles", "outcomes",
+    )
+
     email: str
     job_title: str
     department: str
     unit: str
     in_role_since: Optional[str]
-    skills: List[str]
-    competencies: List[Dict[str, str]]
-    positions_history: List[Dict[str, Any]]
-    projects: List[Dict[str, Any]]
+    skills: Tuple[str, ...]
+    competency_levels: Tuple[str, ...]
+    position_titles: Tuple[Optional[str], ...]
+    outcomes: int
 
-def load_employees(path: str) -> List[EmployeeLite]:
-    with open(path, "r", encoding="utf-8") as f:
-        raw = json.load(f)
-    out: List[EmployeeLite] = []
-    for e in raw:
-        out.append(
-            EmployeeLite(
-                email=e["personal_info"]["email"],
-                job_title=e["employment_info"]["job_title"],
-                department=e["employment_info"]["department"],
-                unit=e["employment_info"]["unit"],
-                in_role_since=e["employment_info"].get("in_role_since"),
-                skills=[s["skill_name"] for s in e.get("skills", [])],
-                competencies=e.get("competencies", []),
-                positions_history=e.get("positions_history", []),
-                projects=e.get("projects", []),
-            )
+    @classmethod
+    def from_profile(cls, e: Dict[str, Any]) -> "EmployeeLite":
+        emp = e["employment_info"]
+        return cls(
+            email=e["personal_info"]["email"],
+            job_title=sys.intern(emp["job_title"]),
+            department=sys.intern(emp["department"]),
+            unit=sys.intern(emp["unit"]),
+            in_role_since=emp.get("in_role_since"),
+            skills=tuple(sys.intern(s["skill_name"]) for s in e.get("skills", [])),
+            competency_levels=tuple(sys.intern(c.get("level", "Intermediate")) for c in e.get("competencies", [])),
+            position_titles=tuple(
+                sys.intern(t) if isinstance(t, str) else t
+                for t in (ph.get("role_title") for ph in e.get("positions_history", []))
+            ),
+            outcomes=sum(len(p.get("outcomes", [])) for p in e.get("projects", [])),
         )
-    return out
 
+def iter_json_array(path: str, chunk_size: int = 1 << 20) -> Iterator[Any]:
+    """Yield the elements of a top-level JSON array without reading the whole file."""
+    dec = json.JSONDecoder()
+    with open(path, "r", encoding="utf-8") as f:
+        buf, pos, want = "", 0, chunk_size
+        started = False
+        while True:
+            while pos < len(buf) and buf[pos] in " \t\r\n,":
+                pos += 1
+            if pos < len(buf):
+                if not started:
+                    if buf[pos] != "[":
+                        raise ValueError(f"{path}: expected a JSON array")
+                    started = True; pos += 1
+                    continue
+                if buf[pos] == "]":
+                    return
+                try:
+                    obj, end = dec.raw_decode(buf, pos)
+                except json.JSONDecodeError:
+                    pass
+                else:
+                    yield obj
+                    pos, want = end, chunk_size
+                    continue
+            chunk = f.read(want)
+            if not chunk:
+                if pos < len(buf):
+                    dec.raw_decode(buf, pos)  # re-raise the decode error with context
+                raise ValueError(f"{path}: unexpected end of JSON array")
+            buf = buf[pos:] + chunk
+            pos = 0
+            # an element larger than the buffer: grow reads geometrically
+            want = max(chunk_size, len(buf))
+
+@timed("load_employees")
+def load_employees(path: str) -> List[EmployeeLite]:
+    return [EmployeeLite.from_profile(e) for e in iter_json_array(path)]
+
+@timed("load_taxonomy")
 def load_taxonomy(path: str) -> pd.DataFrame:
     df = pd.read_csv(path)
     cols = {c.lower().strip(): c for c in df.columns}
@@ -60,6 +128,7 @@ def load_taxonomy(path: str) -> pd.DataFrame:
         df[c] = df[c].astype(str).str.strip()
     return df[["function_area", "specialization", "skill_name"]].dropna()
 
+@timed("load_courses")
 def load_courses(path: str) -> pd.DataFrame:
     df = pd.read_csv(path)
     cols = {c.lower().strip(): c for c in df.columns}
@@ -85,16 +154,37 @@ def load_courses(path: str) -> pd.DataFrame:
         df["duration_hours"] = pd.to_numeric(df["duration_hours"], errors="coerce")
     return df
 
+def _as_employees(src: Union[str, List[EmployeeLite]]) -> List[EmployeeLite]:
+    return load_employees(src) if isinstance(src, str) else src
+
+def _as_taxonomy(src: Union[str, pd.DataFrame]) -> pd.DataFrame:
+    return load_taxonomy(src) if isinstance(src, str) else src
+
+def _as_courses(src: Union[str, pd.DataFrame, None]) -> Optional[pd.DataFrame]:
+    return load_courses(src) if isinstance(src, str) else src
+
+def _as_course_index(src: Union[str, pd.DataFrame, CourseIndex, None]) -> Optional[CourseIndex]:
+    if src is None or isinstance(src, CourseIndex):
+        return src
+    df = _as_courses(src)
+    return CourseIndex(df) if df is not None else None
+
+def tenure_weight(e: EmployeeLite) -> float:
+    """Weight one employee's skills add to their role vector: years in role, clamped to [0.5, 2]."""
+    tenure = 1.0
+    d = _parse_date(e.in_role_since)
+    if d:
+        tenure = max(0.5, (TODAY - d).days / 365.0)
+    return min(2.0, tenure)
+
+@timed("build_role_skill_index")
 def build_role_skill_index(employees: List[EmployeeLite]) -> Dict[str, Dict[str, float]]:
     idx: Dict[str, Dict[str, float]] = {}
     for e in employees:
-        tenure = 1.0
-        d = _parse_date(e.in_role_since)
-        if d:
-            tenure = max(0.5, (TODAY - d).days / 365.0)
+        w = tenure_weight(e)
         for s in e.skills:
             idx.setdefault(e.job_title, {}).setdefault(s, 0.0)
-            idx[e.job_title][s] += min(2.0, tenure)
+            idx[e.job_title][s] += w
     return idx
 
 def cosine(a: List[float], b: List[float]) -> float:
@@ -102,18 +192,57 @@ def cosine(a: List[float], b: List[float]) -> float:
     na = math.sqrt(sum(x*x for x in a)); nb = math.sqrt(sum(y*y for y in b))
     return 0.0 if na == 0 or nb == 0 else dot/(na*nb)
 
-def role_adjacency(role_skill_index: Dict[str, Dict[str, float]], top_k: int = 5) -> Dict[str, List[Tuple[str, float]]]:
+def role_skill_matrix(role_skill_index: Dict[str, Dict[str, float]]):
+    """L2-normalised role x skill matrix (CSR when scipy is available), with row/column labels."""
+    roles = list(role_skill_index.keys())
     vocab = sorted({sk for r in role_skill_index for sk in role_skill_index[r]})
-    vecs = {r: [role_skill_index[r].get(sk, 0.0) for sk in vocab] for r in role_skill_index}
-    roles = list(vecs.keys())
-    adj = {}
-    for i, r in enumerate(roles):
-        sims = []
-        for j, r2 in enumerate(roles):
-            if i == j: continue
-            sims.append((r2, cosine(vecs[r], vecs[r2])))
-        sims.sort(key=lambda x: x[1], reverse=True)
-        adj[r] = sims[:top_k]
+    col = {sk: j for j, sk in enumerate(vocab)}
+    indptr = [0]; indices: List[int] = []; data: List[float] = []
+    for r in roles:
+        for sk, w in role_skill_index[r].items():
+            indices.append(col[sk]); data.append(w)
+        indptr.append(len(indices))
+    vals = np.asarray(data, dtype=np.float64)
+    ptr = np.asarray(indptr, dtype=np.int64)
+    row_of = np.repeat(np.arange(len(roles)), np.diff(ptr))
+    norms = np.sqrt(np.bincount(row_of, weights=vals * vals, minlength=len(roles)))
+    norms[norms == 0] = 1.0
+    vals = vals / norms[row_of]
+    shape = (len(roles), len(vocab))
+    if sparse is not None:
+        mat = sparse.csr_matrix((vals, np.asarray(indices, dtype=np.int64), ptr), shape=shape)
+    else:
+        mat = np.zeros(shape)
+        mat[row_of, indices] = vals
+    return roles, vocab, mat
+
+def top_k_indices(values: np.ndarray, k: int) -> np.ndarray:
+    # argpartition finds the k-th best score; everything tied with it is kept so the
+    # final (score desc, index asc) ordering matches a stable full sort.
+    if k < len(values):
+        part = np.argpartition(-values, k - 1)[:k]
+        cand = np.flatnonzero(values >= values[part].min())
+    else:
+        cand = np.arange(len(values))
+    return cand[np.lexsort((cand, -values[cand]))][:k]
+
+@timed("role_adjacency")
+def role_adjacency(role_skill_index: Dict[str, Dict[str, float]], top_k: int = 5) -> Dict[str, List[Tuple[str, float]]]:
+    roles, _, mat = role_skill_matrix(role_skill_index)
+    n = len(roles)
+    k = min(top_k, n - 1)
+    if k <= 0:
+        return {r: [] for r in roles}
+    mat_t = mat.T.tocsc() if sparse is not None else mat.T
+    block = max(1, ADJACENCY_BLOCK_CELLS // n)
+    adj: Dict[str, List[Tuple[str, float]]] = {}
+    for start in range(0, n, block):
+        sims = mat[start:start + block] @ mat_t
+        sims = sims.toarray() if sparse is not None else np.asarray(sims)
+        rows = np.arange(sims.shape[0])
+        sims[rows, rows + start] = -np.inf
+        for i, row in enumerate(sims):
+            adj[roles[start + i]] = [(roles[j], float(row[j])) for j in top_k_indices(row, k)]
     return adj
 
 def gap_score(current: List[str], target: List[str]) -> float:
@@ -125,113 +254,226 @@ def gap_score(current: List[str], target: List[str]) -> float:
 
 def compute_lpi(e: EmployeeLite) -> float:
     # competencies
-    if e.competencies:
-        comp = sum(LEVEL_WEIGHTS.get(c.get("level","Intermediate"), 0.5) for c in e.competencies)/len(e.competencies)
+    if e.competency_levels:
+        comp = sum(LEVEL_WEIGHTS.get(lvl, 0.5) for lvl in e.competency_levels)/len(e.competency_levels)
     else:
         comp = 0.5
-    impact = min(1.0, 0.3 + 0.1*sum(len(p.get("outcomes",[])) for p in e.projects))
-    prog = 0.2 + 0.1*len(e.positions_history)
+    impact = min(1.0, 0.3 + 0.1*e.outcomes)
+    prog = 0.2 + 0.1*len(e.position_titles)
     score = (0.4*comp + 0.3*impact + 0.3*min(1.0, prog))*10
     return round(max(0.0, min(10.0, score)), 2)
 
-def recommend(employees_path: str, taxonomy_path: str) -> Dict[str, Any]:
-    emps = load_employees(employees_path)
-    taxo = load_taxonomy(taxonomy_path)
+class TaxonomyLookup:
+    """Taxonomy rows keyed by skill name (first occurrence wins), plus the rows in file order."""
+
+    def __init__(self, taxo: pd.DataFrame) -> None:
+        self.rows = list(zip(taxo["skill_name"], taxo["function_area"], taxo["specialization"]))
+        self.pos: Dict[str, int] = {}
+        for i, (sk, _, _) in enumerate(self.rows):
+            self.pos.setdefault(sk, i)
+
+def upskilling_plan(
+    e: EmployeeLite,
+    taxo: pd.DataFrame,
+    rsi: Dict[str, Dict[str, float]],
+    target_roles: List[str],
+    courses: Optional[CourseIndex] = None,
+    lookup: Optional[TaxonomyLookup] = None,
+    unit: Optional[Dict[str, Dict[str, float]]] = None,
+) -> List[Dict[str, Any]]:
+    """Taxonomy skills the employee lacks, most relevant to their target roles first.
+
+    A skill's relevance is the sum of its L2-normalised weight in each target role's
+    skill vector. Remaining slots are filled in taxonomy order, as before. Each skill
+    carries the top-ranked catalog courses for it when a course index is available.
+    Pass the snapshot's ``taxonomy_lookup`` and ``role_index.unit`` (normalised role
+    vectors) to avoid rebuilding them per call.
+    """
+    have = set(e.skills)
+    if lookup is None:
+        lookup = TaxonomyLookup(taxo)
+    relevance: Dict[str, float] = {}
+    for r in target_roles:
+        vec = unit.get(r) if unit is not None else None
+        if vec is None:
+            raw = rsi.get(r)
+            if not raw:
+                continue
+            norm = math.sqrt(sum(w * w for w in raw.values()))
+            if norm <= 0:
+                continue
+            vec = {sk: w / norm for sk, w in raw.items()}
+        for sk, w in vec.items():
+            if w > 0 and sk not in have and sk in lookup.pos:
+                relevance[sk] = relevance.get(sk, 0.0) + w
+    picked = sorted(relevance, key=lambda sk: (-relevance[sk], lookup.pos[sk]))[:UPSKILLING_SKILLS]
+    if len(picked) < UPSKILLING_SKILLS:
+        chosen = set(picked)
+        for sk, _, _ in lookup.rows:
+            if sk not in have and sk not in chosen:
+                picked.append(sk); chosen.add(sk)
+                if len(picked) >= UPSKILLING_SKILLS: break
+
+    plan = []
+    for sk in picked:
+        _, fa, sp = lookup.rows[lookup.pos[sk]]
+        found = courses.for_skill(sk, COURSES_PER_SKILL, COURSE_FIELDS) if courses is not None else []
+        plan.append({
+            "skill": sk,
+            "function_area": fa,
+            "specialization": sp,
+            "relevance": round(relevance.get(sk, 0.0), 3),
+            "suggested_learning": (
+                f"Course: {found[0]['title']} ({found[0]['provider']})" if found else f"No catalog course for {sk} yet"
+            ),
+            "courses": found,
+        })
+    return plan
+
+def next_role_names(e: EmployeeLite, adj: Dict[str, List[Tuple[str, float]]]) -> List[str]:
+    """Up to five candidate next roles: close neighbours of the current role plus business-rule nudges."""
+    # candidate roles
+    cand = [r for r, s in adj.get(e.job_title, [])[:5] if s > 0.2]
+    # business-rule nudge
+    if "Cloud" in e.job_title: cand += ["Enterprise Architect", "IT Strategy Manager"]
+    if e.department == "Finance": cand += ["Senior FP&A Manager", "Finance Business Partner"]
+    if e.department.startswith("Human Resource"): cand += ["Head of Talent Management", "OD & Leadership Lead"]
+    # unique preserve order
+    seen=set(); next_roles=[]
+    for r in cand:
+        if r not in seen: seen.add(r); next_roles.append(r)
+    return next_roles[:5]
+
+# Top-level keys of a plan, in output order; build_plan(fields=...) returns a subset
+PLAN_FIELDS = (
+    "employee", "leadership_potential_index", "next_roles", "upskilling_plan",
+    "internal_mobility_options", "mentors", "recognition_nudges",
+)
+RECOGNITION_NUDGES = (
+    "Give a shout‑out to a teammate exemplifying Teamwork.",
+    "Share one lesson learned in your team channel this week.",
+    "Nominate a peer for monthly recognition program.",
+)
+
+@timed("build_plan")
+def build_plan(
+    e: EmployeeLite,
+    taxo: pd.DataFrame,
+    rsi: Dict[str, Dict[str, float]],
+    adj: Dict[str, List[Tuple[str, float]]],
+    courses: Optional[CourseIndex] = None,
+    fields: Optional[Collection[str]] = None,
+    lookup: Optional[TaxonomyLookup] = None,
+    unit: Optional[Dict[str, Dict[str, float]]] = None,
+) -> Dict[str, Any]:
+    """Career plan for one employee; with ``fields``, only those keys are computed and returned.
+
+    ``lookup`` and ``unit`` are the per-snapshot helpers :func:`upskilling_plan` takes.
+    """
+    def want(key: str) -> bool:
+        return fields is None or key in fields
+
+    out: Dict[str, Any] = {}
+    if want("employee"):
+        out["employee"] = {"email": e.email, "role": e.job_title, "department": e.department}
+    if want("leadership_potential_index"):
+        out["leadership_potential_index"] = compute_lpi(e)
+    if want("next_roles") or want("upskilling_plan"):
+        have = set(e.skills)
+        roles = next_role_names(e, adj)
+        if want("next_roles"):
+            # enrich
+            enriched=[]
+            for r in roles:
+                target_sk = list(rsi.get(r, {}).keys())
+                enriched.append({
+                    "role": r,
+                    "fit": round(1.0 - gap_score(e.skills, target_sk), 2),
+                    "missing_skills_example": [sk for sk in target_sk if sk not in have][:5]
+                })
+            out["next_roles"] = enriched
+        if want("upskilling_plan"):
+            out["upskilling_plan"] = upskilling_plan(e, taxo, rsi, roles, courses, lookup, unit)
+    if want("internal_mobility_options"):
+        out["internal_mobility_options"] = list({t for t in e.position_titles if t})[:6]
+    if want("mentors"):
+        # mentors: simple placeholder (none until we add directory) -> could pick managers later
+        out["mentors"] = []
+    if want("recognition_nudges"):
+        out["recognition_nudges"] = list(RECOGNITION_NUDGES)
+    return out
+
+def recommend(
+    employees_path: Union[str, List[EmployeeLite]],
+    taxonomy_path: Union[str, pd.DataFrame],
+    courses_path: Union[str, pd.DataFrame, CourseIndex, None] = None,
+) -> Dict[str, Any]:
+    emps = _as_employees(employees_path)
+    taxo = _as_taxonomy(taxonomy_path)
+    courses = _as_course_index(courses_path)
     rsi = build_role_skill_index(emps)
     adj = role_adjacency(rsi, top_k=5)
+    lookup = TaxonomyLookup(taxo)
+    return {e.email: build_plan(e, taxo, rsi, adj, courses, lookup=lookup) for e in emps}
 
-    results: Dict[str, Any] = {}
-    for e in emps:
-        # candidate roles
-        cand = [r for r, s in adj.get(e.job_title, []) if s > 0.2]
-        # business-rule nudge
-        if "Cloud" in e.job_title: cand += ["Enterprise Architect", "IT Strategy Manager"]
-        if e.department == "Finance": cand += ["Senior FP&A Manager", "Finance Business Partner"]
-        if e.department.startswith("Human Resource"): cand += ["Head of Talent Management", "OD & Leadership Lead"]
-        # unique preserve order
-        seen=set(); next_roles=[]
-        for r in cand:
-            if r not in seen: seen.add(r); next_roles.append(r)
-        # enrich
-        enriched=[]
-        for r in next_roles[:5]:
-            target_sk = list(rsi.get(r, {}).keys())
-            enriched.append({
-                "role": r,
-                "fit": round(1.0 - gap_score(e.skills, target_sk), 2),
-                "missing_skills_example": [sk for sk in target_sk if sk not in e.skills][:5]
-            })
-        # upskilling plan: pick skills in same function area not possessed
-        # We don't have function areas per employee here, so we fallback to top of taxonomy
-        plan=[]
-        for _, row in taxo.iterrows():
-            sk = row["skill_name"]
-            if sk not in e.skills:
-                plan.append({
-                    "skill": sk,
-                    "function_area": row["function_area"],
-                    "specialization": row["specialization"],
-                    "suggested_learning": f"Course: {sk} Foundations (mock)"
-                })
-            if len(plan)>=8: break
+def recommend_for(email: str, snap: "Snapshot", fields: Optional[Collection[str]] = None) -> Optional[Dict[str, Any]]:
+    """Plan for a single employee, reusing the snapshot's role-skill index and adjacency."""
+    e = snap.employee(email)
+    if e is None:
+        return None
+    return build_plan(
+        e, snap.taxonomy, snap.role_skill_index, snap.adjacency, snap.course_index, fields,
+        snap.taxonomy_lookup, snap.role_index.unit,
+    )
 
-        # mentors: simple placeholder (none until we add directory) -> could pick managers later
-        mentors=[]
-
-        results[e.email] = {
-            "employee": {"email": e.email, "role": e.job_title, "department": e.department},
-            "leadership_potential_index": compute_lpi(e),
-            "next_roles": enriched,
-            "upskilling_plan": plan,
-            "internal_mobility_options": list({ph.get("role_title") for ph in e.positions_history if ph.get("role_title")})[:6],
-            "mentors": mentors,
-            "recognition_nudges": [
-                "Give a shout‑out to a teammate exemplifying Teamwork.",
-                "Share one lesson learned in your team channel this week.",
-                "Nominate a peer for monthly recognition program."
-            ]
-        }
-    return results
-
-def get_lpi(employees_path: str, email: Optional[str] = None) -> Dict[str, Any]:
-    emps = load_employees(employees_path)
+def recommend_many(
+    emails: Iterable[str], snap: "Snapshot", fields: Optional[Collection[str]] = None,
+) -> Dict[str, Optional[Dict[str, Any]]]:
+    """Plans for several employees from one snapshot, keyed by email (None if unknown); repeats are built once."""
+    taxo, rsi, adj, courses = snap.taxonomy, snap.role_skill_index, snap.adjacency, snap.course_index
+    lookup, unit = snap.taxonomy_lookup, snap.role_index.unit
+    out: Dict[str, Optional[Dict[str, Any]]] = {}
+    for email in emails:
+        if email not in out:
+            e = snap.employee(email)
+            out[email] = build_plan(e, taxo, rsi, adj, courses, fields, lookup, unit) if e is not None else None
+    return out
+
+def iter_plans(snap: "Snapshot", fields: Optional[Collection[str]] = None) -> Iterator[Dict[str, Any]]:
+    """Yield every employee's plan one at a time, in the same order as recommend()."""
+    rsi, adj, courses = snap.role_skill_index, snap.adjacency, snap.course_index
+    lookup, unit = snap.taxonomy_lookup, snap.role_index.unit
+    for e in snap.by_email.values():
+        yield build_plan(e, snap.taxonomy, rsi, adj, courses, fields, lookup, unit)
+
+def recommend_all(snap: "Snapshot", fields: Optional[Collection[str]] = None) -> Dict[str, Dict[str, Any]]:
+    """recommend() for the whole snapshot, reusing its role index and adjacency."""
+    return dict(zip(snap.by_email, iter_plans(snap, fields)))
+
+def get_lpi(employees_path: Union[str, Sequence[EmployeeLite], "LeadershipIndex"], email: Optional[str] = None) -> Dict[str, Any]:
+    from .lpi_index import LeadershipIndex
+    if isinstance(employees_path, LeadershipIndex):
+        return employees_path.scores(email)
+    emps = _as_employees(employees_path)
     scores = {e.email: compute_lpi(e) for e in emps}
     if email:
         return {email: scores.get(email)}
     return scores
 
-def get_mentors(employees_path: str, email: str, limit: int = 3) -> Dict[str, Any]:
-    emps = load_employees(employees_path)
-    me = next((e for e in emps if e.email == email), None)
-    if not me:
-        return {"email": email, "mentors": []}
-    rsi = build_role_skill_index(emps)
-    adj = role_adjacency(rsi, top_k=10)
-    similar_roles = {r for r, _ in adj.get(me.job_title, [])}
-    my_lpi = compute_lpi(me)
-    cand = []
-    for e in emps:
-        if e.email == email:
-            continue
-        lpi = compute_lpi(e)
-        seniority = len(e.positions_history)
-        same_dept = 1.0 if e.department == me.department else 0.0
-        same_unit = 1.0 if e.unit == me.unit else 0.0
-        role_sim = 1.0 if e.job_title in similar_roles else 0.0
-        score = 0.35*same_dept + 0.2*same_unit + 0.25*role_sim + 0.2*max(0.0, lpi - my_lpi)/10.0 + 0.05*seniority
-        cand.append({
-            "email": e.email,
-            "role": e.job_title,
-            "department": e.department,
-            "unit": e.unit,
-            "leadership_potential_index": lpi,
-            "score": round(score, 3)
-        })
-    cand.sort(key=lambda x: x["score"], reverse=True)
-    return {"email": email, "mentors": cand[:max(1, limit)]}
+def get_mentors(employees_path: Union[str, List[EmployeeLite], "MentorIndex"], email: str, limit: int = 3) -> Dict[str, Any]:
+    if isinstance(employees_path, (str, list)):
+        from .mentor_index import MentorIndex
+        emps = _as_employees(employees_path)
+        index = MentorIndex(emps, role_adjacency(build_role_skill_index(emps), top_k=10))
+    else:
+        index = employees_path
+    return index.match(email, limit=limit)
+
+def get_mentors_many(index: "MentorIndex", emails: Iterable[str], limit: int = 3) -> Dict[str, Dict[str, Any]]:
+    return index.match_many(emails, limit=limit)
 
 def find_courses(
-    courses_path: str,
+    courses_path: Union[str, pd.DataFrame, CourseIndex, None],
     q: Optional[str] = None,
     skill: Optional[str] = None,
     difficulty: Optional[str] = None,
@@ -240,25 +482,35 @@ def find_courses(
     language: Optional[str] = None,
     limit: int = 10,
 ) -> Dict[str, Any]:
-    df = load_courses(courses_path)
-    if skill:
-        df = df[df["skill_name"].str.lower().str.contains(skill.lower())]
-    if difficulty:
-        df = df[df["difficulty"].str.lower() == difficulty.lower()]
-    if language:
-        df = df[df["language"].str.lower() == language.lower()]
-    if min_hours is not None:
-        df = df[(df["duration_hours"].fillna(0) >= float(min_hours))]
-    if max_hours is not None:
-        df = df[(df["duration_hours"].fillna(0) <= float(max_hours))]
-    if q:
-        ql = q.lower()
-        text = df[[c for c in ["title", "description", "skill_name", "provider"] if c in df]].fillna("")
-        df = df.assign(_score=(
-            text.apply(lambda r: sum(1 for v in r.values if ql in str(v).lower()), axis=1)
-        ))
-        df = df[df["_score"] > 0].sort_values("_score", ascending=False)
-    rows = df.head(limit).to_dict(orient="records")
-    for r in rows:
-        r.pop("_score", None)
-    return {"total": int(len(df)), "items": rows}
+    index = _as_course_index(courses_path)
+    if index is None:
+        return {"total": 0, "items": []}
+    return index.search(
+        q=q,
+        skill=skill,
+        difficulty=difficulty,
+        min_hours=min_hours,
+        max_hours=max_hours,
+        language=language,
+        limit=limit,
+    )
+
+def find_courses_many(
+    courses_path: Union[str, pd.DataFrame, CourseIndex, None],
+    skills: Iterable[str],
+    difficulty: Optional[str] = None,
+    min_hours: Optional[float] = None,
+    max_hours: Optional[float] = None,
+    language: Optional[str] = None,
+    limit: int = 10,
+) -> Dict[str, Dict[str, Any]]:
+    """find_courses(skill=...) for each skill against one course index, keyed by skill."""
+    index = _as_course_index(courses_path)
+    out: Dict[str, Dict[str, Any]] = {}
+    for skill in skills:
+        if skill not in out:
+            out[skill] = find_courses(
+                index, skill=skill, difficulty=difficulty, min_hours=min_hours,
+                max_hours=max_hours, language=language, limit=limit,
+            )
+    return out
@@ -0,0 +1,176 @@
+"""Role-skill index and role adjacency that can absorb single-profile changes.
+
+A full :func:`recommender.build_role_skill_index` + :func:`recommender.role_adjacency`
+pass is only done once per snapshot load. Afterwards :meth:`RoleIndex.updated`
+applies the tenure-weighted delta of added/removed employees to the affected role
+vectors and refreshes adjacency only where those roles can appear.
+"""
+
+from __future__ import annotations
+
+import math
+from typing import Dict, Iterable, List, Mapping, Optional, Set, Tuple
+
+from . import role_lsh
+from .recommender import EmployeeLite, build_role_skill_index, role_adjacency, tenure_weight
+from ..core import config
+
+# Role weights whose magnitude falls below this after a removal are treated as gone
+EPSILON = 1e-9
+
+Adjacency = Dict[str, List[Tuple[str, float]]]
+
+
+class RoleIndex:
+    """Immutable view of the role-skill index, its adjacency and a skill -> role posting map.
+
+    ``rsi``, ``adjacency`` and ``unit`` are dicts, or for a compiled snapshot
+    the :mod:`.mapped` views of its CSR tables.
+    """
+
+    def __init__(
+        self,
+        rsi: Mapping[str, Dict[str, float]],
+        adjacency: Mapping[str, List[Tuple[str, float]]],
+        top_k: int,
+        order: Optional[Dict[str, int]] = None,
+        unit: Optional[Mapping[str, Dict[str, float]]] = None,
+        postings: Optional[Dict[str, Dict[str, float]]] = None,
+    ) -> None:
+        self.rsi = rsi
+        self.adjacency = adjacency
+        self.top_k = top_k
+        self.unit = unit if unit is not None else {r: _normalise(v) for r, v in rsi.items()}
+        # Only incremental updates read these, so they are built on first use
+        self._order = order
+        self._postings = postings
+        self._ordered: Optional[List[str]] = None
+
+    @property
+    def order(self) -> Dict[str, int]:
+        """Position used to break similarity ties, as the stable sort in role_adjacency does."""
+        if self._order is None:
+            self._order = {r: i for i, r in enumerate(self.rsi)}
+        return self._order
+
+    @property
+    def postings(self) -> Dict[str, Dict[str, float]]:
+        """skill -> {role: normalised weight}."""
+        if self._postings is None:
+            postings: Dict[str, Dict[str, float]] = {}
+            for r, vec in self.unit.items():
+                for sk, w in vec.items():
+                    postings.setdefault(sk, {})[r] = w
+            self._postings = postings
+        return self._postings
+
+    @classmethod
+    def build(cls, employees: List[EmployeeLite], top_k: int) -> "RoleIndex":
+        rsi = build_role_skill_index(employees)
+        return cls(rsi, build_adjacency(rsi, top_k), top_k)
+
+    def _sims(self, role: str) -> Dict[str, float]:
+        acc: Dict[str, float] = {}
+        for sk, w in self.unit[role].items():
+            for r2, w2 in self.postings[sk].items():
+                if r2 != role:
+                    acc[r2] = acc.get(r2, 0.0) + w * w2
+        return acc
+
+    def _row(self, role: str, sims: Dict[str, float]) -> List[Tuple[str, float]]:
+        ranked = sorted(sims.items(), key=lambda x: (-x[1], self.order[x[0]]))[:self.top_k]
+        if len(ranked) < self.top_k:
+            # role_adjacency also lists zero-similarity roles, in role order, to fill top_k
+            if self._ordered is None:
+                self._ordered = sorted(self.order, key=self.order.__getitem__)
+            for r in self._ordered:
+                if len(ranked) >= self.top_k:
+                    break
+                if r != role and r not in sims:
+                    ranked.append((r, 0.0))
+        return ranked
+
+    def updated(
+        self,
+        added: Iterable[EmployeeLite] = (),
+        removed: Iterable[EmployeeLite] = (),
+    ) -> "RoleIndex":
+        """Return a new index with ``removed`` profiles subtracted and ``added`` ones added.
+
+        A modified profile is passed as its old record in ``removed`` and its new
+        record in ``added``. Only the outer dicts are copied; untouched role vectors,
+        postings and adjacency rows are shared with ``self``.
+        """
+        rsi = dict(self.rsi)
+        touched: Set[str] = set()
+        for sign, emps in ((-1.0, removed), (1.0, added)):
+            for e in emps:
+                if e.job_title not in touched:
+                    rsi[e.job_title] = dict(rsi.get(e.job_title, {}))
+                    touched.add(e.job_title)
+                vec = rsi[e.job_title]
+                w = sign * tenure_weight(e)
+                for s in e.skills:
+                    vec[s] = vec.get(s, 0.0) + w
+        if not touched:
+            return self
+
+        order = dict(self.order)
+        unit = dict(self.unit)
+        postings = dict(self.postings)
+        copied: Set[str] = set()
+        next_pos = max(order.values(), default=-1) + 1
+        gone: Set[str] = set()
+        for r in touched:
+            vec = {sk: w for sk, w in rsi[r].items() if abs(w) > EPSILON}
+            for sk in unit.get(r, {}):
+                if sk not in copied:
+                    postings[sk] = dict(postings[sk]); copied.add(sk)
+                del postings[sk][r]
+                if not postings[sk]:
+                    del postings[sk]
+            if not vec:
+                del rsi[r]; unit.pop(r, None); order.pop(r, None)
+                gone.add(r)
+                continue
+            rsi[r] = vec
+            if r not in order:
+                order[r] = next_pos; next_pos += 1
+            unit[r] = _normalise(vec)
+            for sk, w in unit[r].items():
+                if sk not in copied and sk in postings:
+                    postings[sk] = dict(postings[sk]); copied.add(sk)
+                postings.setdefault(sk, {})[r] = w
+
+        nxt = RoleIndex(rsi, {}, self.top_k, order=order, unit=unit, postings=postings)
+        changed = touched - gone
+        sims = {r: nxt._sims(r) for r in changed}
+        adj: Adjacency = {}
+        for r in rsi:
+            if r in changed:
+                adj[r] = nxt._row(r, sims[r])
+                continue
+            row = self.adjacency.get(r, [])
+            if any(r2 in touched for r2, _ in row):
+                # a listed neighbour moved or vanished; a replacement may come from anywhere
+                adj[r] = nxt._row(r, nxt._sims(r))
+                continue
+            extra = [(c, sims[c].get(r, 0.0)) for c in changed]
+            adj[r] = sorted(row + extra, key=lambda x: (-x[1], order[x[0]]))[:self.top_k]
+        nxt.adjacency = adj
+        return nxt
+
+
+def build_adjacency(rsi: Dict[str, Dict[str, float]], top_k: int) -> Adjacency:
+    """Exact or LSH adjacency, as ``ROLE_ADJACENCY`` selects."""
+    mode = config.ROLE_ADJACENCY
+    if mode == "lsh" or (mode == "auto" and len(rsi) >= config.ROLE_LSH_MIN_ROLES):
+        return role_lsh.approx_role_adjacency(
+            rsi, top_k=top_k, bands=config.ROLE_LSH_BANDS, rows=config.ROLE_LSH_ROWS, levels=config.ROLE_LSH_LEVELS,
+        )
+    return role_adjacency(rsi, top_k=top_k)
+
+
+def _normalise(vec: Dict[str, float]) -> Dict[str, float]:
+    norm = math.sqrt(sum(w * w for w in vec.values()))
+    return {sk: (w / norm if norm else 0.0) for sk, w in vec.items()}
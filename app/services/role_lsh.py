@@ -0,0 +1,180 @@
+"""Approximate role adjacency: MinHash + LSH banding to pick candidates, exact cosine to rank them.
+
+Exact :func:`recommender.role_adjacency` scores every pair of roles, which grows
+quadratically with the number of job titles. Here each role gets a MinHash
+signature of ``bands * rows`` values; roles that agree on all ``rows`` values of
+any band share a bucket and become candidate pairs. Only those pairs get the
+tenure-weighted cosine, and each role keeps its ``top_k`` best, ranked and
+padded exactly as ``role_adjacency`` does.
+
+A role is hashed as a set of weighted tokens (:func:`weighted_tokens`): a skill
+carrying the role's top weight contributes ``levels`` tokens, a light one a
+single token. Tenure weighting makes a few core skills dominate each role, so
+close roles often share little of their long tails; plain skill-set Jaccard
+(``levels=1``) misses most of them while the weighted tokens do not.
+
+A pair whose token sets have Jaccard similarity ``s`` becomes a candidate with
+probability ``1 - (1 - s**rows)**bands``: more bands raise recall, more rows
+per band cut candidates (and time). Buckets larger than ``max_bucket`` (e.g.
+many titles sharing one tiny skill set) link each member only to its next
+``max_bucket`` neighbours in role order instead of to every member.
+``scripts/bench_role_lsh.py`` measures time and recall against the exact output.
+"""
+
+from __future__ import annotations
+
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+from .recommender import role_skill_matrix, sparse
+from ..core.metrics import timed
+
+BANDS = 32
+ROWS = 2
+LEVELS = 8  # weight quantisation steps per skill; 1 hashes the plain skill set
+MAX_BUCKET = 64
+PAIR_BLOCK = 1 << 20  # candidate pairs scored per step
+
+EMPTY = np.uint64(1 << 32)  # signature of a role without skills; real hashes are below it
+
+
+def _csr_parts(mat) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    if sparse is not None:
+        return mat.indptr.astype(np.int64), mat.indices.astype(np.int64), mat.data
+    rows, cols = np.nonzero(mat)
+    indptr = np.zeros(mat.shape[0] + 1, dtype=np.int64)
+    np.cumsum(np.bincount(rows, minlength=mat.shape[0]), out=indptr[1:])
+    return indptr, cols.astype(np.int64), mat[rows, cols]
+
+
+def weighted_tokens(indptr: np.ndarray, indices: np.ndarray, data: np.ndarray, levels: int) -> Tuple[np.ndarray, np.ndarray]:
+    """CSR of tokens ``skill * levels + t`` for ``t < ceil(levels * weight / row max)``.
+
+    Set Jaccard over these tokens tracks the weighted Jaccard of the quantised
+    rows, so a role's few heavy skills count for more than its long tail.
+    """
+    n = len(indptr) - 1
+    counts = np.diff(indptr)
+    if not len(indices):
+        return np.zeros(n + 1, dtype=np.int64), indices
+    row_max = np.zeros(n)
+    row_max[counts > 0] = np.maximum.reduceat(data, indptr[:-1][counts > 0])
+    rid = np.repeat(np.arange(n), counts)
+    reps = np.clip(np.ceil(levels * data / row_max[rid] - 1e-9), 1, levels).astype(np.int64)
+    tok_indptr = np.zeros(n + 1, dtype=np.int64)
+    np.cumsum(np.bincount(rid, weights=reps, minlength=n).astype(np.int64), out=tok_indptr[1:])
+    starts = np.cumsum(reps) - reps
+    return tok_indptr, np.repeat(indices * levels - starts, reps) + np.arange(reps.sum())
+
+
+def minhash_signatures(indptr: np.ndarray, indices: np.ndarray, num_perm: int, seed: int = 0) -> np.ndarray:
+    """(rows x num_perm) MinHash of each CSR row's column set; empty rows get the sentinel ``EMPTY``."""
+    rng = np.random.default_rng(seed)
+    # Multiply-shift hashing: the top 32 bits of (a*x + b) mod 2**64, odd a
+    a = rng.integers(0, 1 << 63, size=num_perm, dtype=np.uint64) * np.uint64(2) + np.uint64(1)
+    b = rng.integers(0, 1 << 63, size=num_perm, dtype=np.uint64)
+    n = len(indptr) - 1
+    sig = np.full((n, num_perm), EMPTY, dtype=np.uint64)
+    nonempty = np.flatnonzero(np.diff(indptr) > 0)
+    if not len(nonempty):
+        return sig
+    x = indices.astype(np.uint64)[None, :]
+    # Hash every (permutation, entry) and reduce to a per-row minimum, a few permutations at a time
+    step = max(1, (1 << 24) // max(1, len(indices)))
+    for c in range(0, num_perm, step):
+        h = (a[c:c + step, None] * x + b[c:c + step, None]) >> np.uint64(32)
+        sig[nonempty, c:c + step] = np.minimum.reduceat(h, indptr[nonempty], axis=1).T
+    return sig
+
+
+def lsh_pairs(sig: np.ndarray, bands: int, rows: int, max_bucket: int = MAX_BUCKET) -> np.ndarray:
+    """Unique (i, j) candidate pairs, i < j, of rows sharing a bucket in at least one band."""
+    n = sig.shape[0]
+    live = np.flatnonzero(sig[:, 0] != EMPTY) if n else np.zeros(0, dtype=np.int64)
+    keys: List[np.ndarray] = []
+    for band in range(bands):
+        cols = sig[live, band * rows:(band + 1) * rows]
+        # Mix the band's values into one 64-bit bucket key
+        h = np.zeros(len(live), dtype=np.uint64)
+        for j in range(cols.shape[1]):
+            h = h * np.uint64(1000003) ^ cols[:, j]
+        order = np.lexsort((live, h))
+        hs, members = h[order], live[order]
+        # Pair each member with the next few members of its bucket (all of them in small buckets)
+        for off in range(1, max_bucket + 1):
+            same = np.flatnonzero(hs[off:] == hs[:-off]) if off < len(hs) else np.zeros(0, dtype=np.int64)
+            if not len(same):
+                break
+            keys.append(members[same] * n + members[same + off])
+    if not keys:
+        return np.zeros((0, 2), dtype=np.int64)
+    uniq = np.unique(np.concatenate(keys))
+    return np.stack([uniq // n, uniq % n], axis=1)
+
+
+def _pair_sims(mat, pairs: np.ndarray) -> np.ndarray:
+    out = np.empty(len(pairs), dtype=np.float64)
+    for s in range(0, len(pairs), PAIR_BLOCK):
+        i, j = pairs[s:s + PAIR_BLOCK, 0], pairs[s:s + PAIR_BLOCK, 1]
+        if sparse is not None:
+            out[s:s + len(i)] = np.asarray(mat[i].multiply(mat[j]).sum(axis=1)).ravel()
+        else:
+            out[s:s + len(i)] = (mat[i] * mat[j]).sum(axis=1)
+    return out
+
+
+@timed("role_adjacency_lsh")
+def approx_role_adjacency(
+    role_skill_index: Dict[str, Dict[str, float]],
+    top_k: int = 5,
+    bands: int = BANDS,
+    rows: int = ROWS,
+    levels: int = LEVELS,
+    max_bucket: int = MAX_BUCKET,
+    seed: int = 0,
+) -> Dict[str, List[Tuple[str, float]]]:
+    """Drop-in for :func:`recommender.role_adjacency` that only scores LSH candidate pairs."""
+    roles, _, mat = role_skill_matrix(role_skill_index)
+    n = len(roles)
+    k = min(top_k, n - 1)
+    if k <= 0:
+        return {r: [] for r in roles}
+    indptr, indices, data = _csr_parts(mat)
+    if levels > 1:
+        indptr, indices = weighted_tokens(indptr, indices, data, levels)
+    pairs = lsh_pairs(minhash_signatures(indptr, indices, bands * rows, seed), bands, rows, max_bucket)
+    sims = _pair_sims(mat, pairs)
+    # Both directions, then per source role: similarity desc, target index asc
+    src = np.concatenate([pairs[:, 0], pairs[:, 1]])
+    dst = np.concatenate([pairs[:, 1], pairs[:, 0]])
+    val = np.concatenate([sims, sims])
+    order = np.lexsort((dst, -val, src))
+    src, dst, val = src[order], dst[order], val[order]
+    starts = np.searchsorted(src, np.arange(n + 1))
+    fill = np.arange(min(n, k + 1))  # lowest-index roles pad short rows, like zero similarities do
+    adj: Dict[str, List[Tuple[str, float]]] = {}
+    for i in range(n):
+        lo, hi = starts[i], min(starts[i + 1], starts[i] + k)
+        row = [(roles[j], float(v)) for j, v in zip(dst[lo:hi].tolist(), val[lo:hi].tolist())]
+        if len(row) < k:
+            seen = set(dst[lo:hi].tolist())
+            seen.add(i)
+            extra = [j for j in fill.tolist() if j not in seen]
+            if len(row) + len(extra) < k:
+                extra = [j for j in range(n) if j not in seen]
+            row += [(roles[j], 0.0) for j in extra[:k - len(row)]]
+        adj[roles[i]] = row
+    return adj
+
+
+def recall_at_k(exact: Dict[str, List[Tuple[str, float]]], approx: Dict[str, List[Tuple[str, float]]]) -> float:
+    """Share of exact top-k neighbours with positive similarity that the approximate rows also list."""
+    hit = total = 0
+    for role, row in exact.items():
+        want = {r for r, s in row if s > 0}
+        got = {r for r, _ in approx.get(role, [])}
+        hit += len(want & got)
+        total += len(want)
+    return hit / total if total else 1.0
+
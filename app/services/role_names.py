@@ -0,0 +1,83 @@
+"""Resolve free-text role names (from chat messages) to job titles in the dataset.
+
+Built once per snapshot. Resolution order matches the linear scans it replaces:
+a case-insensitive exact title, then the first title (in role-index order) that
+contains the text. Only when both fail does it try a punctuation-insensitive
+exact match and finally the closest title by trigram overlap.
+"""
+
+from __future__ import annotations
+
+import re
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+
+# Minimum Dice coefficient over character trigrams for a fuzzy match
+FUZZY_MIN_SCORE = 0.6
+
+_NON_WORD_RE = re.compile(r"[\W_]+")
+
+
+def _normalise(text: str) -> str:
+    return _NON_WORD_RE.sub(" ", text.lower()).strip()
+
+
+def _trigrams(text: str) -> set:
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+class RoleNameIndex:
+    def __init__(self, roles: Iterable[str]) -> None:
+        self.roles: List[str] = list(roles)
+        self.lowered = [r.lower() for r in self.roles]
+        self.exact: Dict[str, int] = {}
+        self.normalised: Dict[str, int] = {}
+        grams: Dict[str, List[int]] = {}
+        gram_counts = np.zeros(len(self.roles), dtype=np.int32)
+        for i, low in enumerate(self.lowered):
+            self.exact.setdefault(low, i)
+            self.normalised.setdefault(_normalise(low), i)
+            tg = _trigrams(low)
+            gram_counts[i] = len(tg)
+            for g in tg:
+                grams.setdefault(g, []).append(i)
+        # Postings are in role order, so the first verified hit is the earliest title
+        self.postings = {g: np.asarray(ids, dtype=np.int32) for g, ids in grams.items()}
+        self.gram_counts = gram_counts
+
+    def __len__(self) -> int:
+        return len(self.roles)
+
+    def resolve(self, text: str) -> Optional[str]:
+        low = text.lower()
+        if not low:
+            return None
+        i = self.exact.get(low)
+        if i is None:
+            i = self._containing(low)
+        if i is None:
+            i = self.normalised.get(_normalise(low))
+        if i is None:
+            i = self._closest(low)
+        return self.roles[i] if i is not None else None
+
+    def _containing(self, low: str) -> Optional[int]:
+        tg = _trigrams(low)
+        if not tg:
+            return next((i for i, r in enumerate(self.lowered) if low in r), None)
+        lists = [self.postings.get(g) for g in tg]
+        if any(p is None for p in lists):
+            return None
+        rarest = min(lists, key=len)
+        return next((i for i in rarest.tolist() if low in self.lowered[i]), None)
+
+    def _closest(self, low: str) -> Optional[int]:
+        tg = _trigrams(low)
+        lists = [p for p in (self.postings.get(g) for g in tg) if p is not None]
+        if not lists:
+            return None
+        shared = np.bincount(np.concatenate(lists), minlength=len(self.roles))
+        score = 2.0 * shared / (len(tg) + self.gram_counts)
+        best = int(np.argmax(score))  # first maximum, i.e. earliest title on ties
+        return best if score[best] >= FUZZY_MIN_SCORE else None
@@ -0,0 +1,173 @@
+"""One loader, many readers: dataset generations shared by worker processes.
+
+With ``DATASET_SHARED_DIR`` set, workers (e.g. ``uvicorn --workers 8``) do not
+parse the source files themselves. Whichever worker holds ``loader.lock`` in that
+directory watches the sources and, when they change, compiles them into
+``gen-<n>.snap`` (:mod:`.compiled` format) and repoints ``CURRENT`` at it with an
+atomic rename. Every worker, the loader included, maps the file ``CURRENT`` names
+read-only and swaps to a newer generation on its next check, as the single
+process store does for changed files.
+
+The arrays of a generation (string blob, employee x skill CSR tables, LPI and
+its ranking, mentor scoring arrays, role weights and adjacency, course
+postings) are views of that mapping, so their pages live once in the page cache
+however many workers attach, and the parsing and index builds run once per
+generation rather than once per worker. Employees, emails and roles are read
+through the :mod:`.mapped` views, so an attached worker's own memory does not
+grow with headcount. The lock is released when the loader exits, and the next
+worker to check takes over. POSIX only (``fcntl``).
+"""
+
+from __future__ import annotations
+
+import fcntl
+import os
+import re
+import threading
+import time
+from typing import List, Optional
+
+from .compiled import dump_snapshot, load_snapshot, source_signature
+from .dataset import DatasetStore, Signature, Snapshot, _warmers
+
+LOCK_FILE = "loader.lock"
+CURRENT_FILE = "CURRENT"
+KEEP_GENERATIONS = 3  # older files are unlinked; workers still mapping them are unaffected
+ATTACH_TIMEOUT = 120.0  # seconds a starting worker waits for the loader's first generation
+
+_GEN_RE = re.compile(r"^gen-(\d+)\.snap$")
+
+
+class SharedDatasetStore(DatasetStore):
+    def __init__(
+        self,
+        shared_dir: str,
+        employees_path: str,
+        taxonomy_path: str,
+        courses_path: Optional[str] = None,
+        check_interval: float = 1.0,
+        compiled_path: Optional[str] = None,
+    ) -> None:
+        super().__init__(
+            employees_path, taxonomy_path, courses_path=courses_path,
+            check_interval=check_interval, compiled_path=compiled_path,
+        )
+        self.shared_dir = shared_dir
+        os.makedirs(shared_dir, exist_ok=True)
+        self._lock_fd: Optional[int] = None
+        self._generation: Optional[str] = None  # file name of the attached generation
+
+    def _path(self, name: str) -> str:
+        return os.path.join(self.shared_dir, name)
+
+    def is_loader(self) -> bool:
+        """Whether this process publishes generations, taking the role if it is free."""
+        if self._lock_fd is None:
+            fd = os.open(self._path(LOCK_FILE), os.O_RDWR | os.O_CREAT, 0o644)
+            try:
+                fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except OSError:
+                os.close(fd)
+                return False
+            self._lock_fd = fd
+        return True
+
+    def current_generation(self) -> Optional[str]:
+        try:
+            with open(self._path(CURRENT_FILE), encoding="utf-8") as f:
+                return f.read().strip() or None
+        except FileNotFoundError:
+            return None
+
+    def _generations(self) -> List[str]:
+        names = [n for n in os.listdir(self.shared_dir) if _GEN_RE.match(n)]
+        return sorted(names, key=lambda n: int(_GEN_RE.match(n).group(1)))  # type: ignore[union-attr]
+
+    def _write_generation(self, snap: Snapshot) -> str:
+        existing = self._generations()
+        n = int(_GEN_RE.match(existing[-1]).group(1)) + 1 if existing else 1  # type: ignore[union-attr]
+        name = f"gen-{n:06d}.snap"
+        dump_snapshot(snap, self._path(name))
+        tmp = self._path(CURRENT_FILE + ".tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            f.write(name + "\n")
+        os.replace(tmp, self._path(CURRENT_FILE))
+        for old in self._generations()[:-KEEP_GENERATIONS]:
+            try:
+                os.unlink(self._path(old))
+            except OSError:
+                pass
+        print(f"Published dataset generation {name} ({len(snap.employees)} employees)", flush=True)
+        return name
+
+    def _generation_signature(self, name: str) -> Optional[Signature]:
+        """Source signature a generation was compiled from, read from its header."""
+        if name == self._generation and self._snapshot is not None:
+            return self._snapshot.signature
+        try:
+            return source_signature(self._path(name))
+        except (OSError, ValueError):
+            return None
+
+    def _sync(self) -> Optional[Snapshot]:
+        """Publish a generation if this is the loader and the sources moved on; attach ``CURRENT`` if new.
+
+        Returns the snapshot to publish in this process, or None when nothing changed.
+        """
+        if self.is_loader():
+            name = self.current_generation()
+            sig = self.signature()
+            if name is None or self._generation_signature(name) != sig:
+                built = self._build(sig) if self._snapshot is not None else super()._initial()
+                self._write_generation(built)
+        name = self.current_generation()
+        if name is None or name == self._generation:
+            return None
+        snap = load_snapshot(self._path(name), version=self._version + 1)
+        for warm in _warmers:
+            warm(snap)
+        self._generation = name
+        return snap
+
+    def _initial(self) -> Snapshot:
+        deadline = time.monotonic() + ATTACH_TIMEOUT
+        while True:
+            snap = self._sync()
+            if snap is not None:
+                return snap
+            if time.monotonic() > deadline:
+                print(f"No dataset generation in {self.shared_dir}; loading privately", flush=True)
+                return super()._initial()
+            time.sleep(0.2)
+
+    def reload(self) -> Snapshot:
+        with self._load_lock:
+            snap = self._sync()
+            if snap is not None:
+                self._publish(snap)
+        return self._snapshot  # type: ignore[return-value]
+
+    def _maybe_refresh(self, snap: Snapshot) -> None:
+        now = time.monotonic()
+        if self._reloading or now - self._last_check < self.check_interval:
+            return
+        self._last_check = now
+        if self.current_generation() == self._generation and not (self.is_loader() and self.signature() != snap.signature):
+            return
+        with self._load_lock:
+            if self._reloading:
+                return
+            self._reloading = True
+        threading.Thread(target=self._background_reload, name="dataset-reload", daemon=True).start()
+
+    def _background_reload(self) -> None:
+        try:
+            with self._load_lock:
+                snap = self._sync()
+                if snap is not None:
+                    self._publish(snap)
+        except Exception as e:
+            # Keep serving the attached generation; the next check will retry.
+            print(f"Dataset generation sync failed: {e}", flush=True)
+        finally:
+            self._reloading = False
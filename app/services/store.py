@@ -0,0 +1,237 @@
+"""Durable log of recognitions, mentor requests and feedback (SQLite in WAL mode).
+
+Request threads never touch the database file for writes: they enqueue a row and
+return. A single writer thread drains the queue and commits everything waiting
+in one transaction (group commit), so a burst of N submissions costs one WAL
+sync instead of N. Readers use their own per-thread connection and, thanks to
+WAL, never wait for the writer; they see rows once committed, normally a few
+milliseconds after submission (:meth:`InteractionStore.flush` waits for that).
+A batch that fails is retried once, then written row by row, so only rows that
+fail on their own are dropped (logged and counted in
+``pathfinder_store_dropped_rows_total``).
+"""
+
+from __future__ import annotations
+
+import atexit
+import itertools
+import json
+import os
+import queue
+import secrets
+import sqlite3
+import threading
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from ..core import config, metrics
+
+BATCH_MAX = 2048  # rows per transaction
+BATCH_ATTEMPTS = 2  # tries per batch before falling back to one row per transaction
+QUEUE_MAX = 100_000  # submissions block (backpressure) beyond this many uncommitted rows
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS recognitions (
+    id TEXT PRIMARY KEY, created TEXT NOT NULL,
+    sender TEXT NOT NULL, recipient TEXT NOT NULL, value TEXT NOT NULL, note TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS recognitions_recipient ON recognitions (recipient);
+CREATE INDEX IF NOT EXISTS recognitions_sender ON recognitions (sender);
+CREATE TABLE IF NOT EXISTS mentor_requests (
+    id TEXT PRIMARY KEY, created TEXT NOT NULL,
+    mentee TEXT NOT NULL, mentor TEXT NOT NULL, message TEXT NOT NULL, status TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS mentor_requests_mentor ON mentor_requests (mentor, status);
+CREATE INDEX IF NOT EXISTS mentor_requests_mentee ON mentor_requests (mentee);
+CREATE TABLE IF NOT EXISTS feedback (
+    id TEXT PRIMARY KEY, created TEXT NOT NULL,
+    email TEXT NOT NULL, focus TEXT NOT NULL, strengths TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS feedback_email ON feedback (email);
+"""
+
+_INSERT_RECOGNITION = "INSERT INTO recognitions VALUES (?, ?, ?, ?, ?, ?)"
+_INSERT_MENTOR_REQUEST = "INSERT INTO mentor_requests VALUES (?, ?, ?, ?, ?, 'pending')"
+_INSERT_FEEDBACK = "INSERT INTO feedback VALUES (?, ?, ?, ?, ?)"
+
+
+def _new_id() -> str:
+    return secrets.token_hex(8)
+
+
+def _table(sql: str) -> str:
+    return sql.split()[2]  # "INSERT INTO <table> ..."
+
+
+class InteractionStore:
+    def __init__(self, path: str, batch_max: int = BATCH_MAX, queue_max: int = QUEUE_MAX) -> None:
+        self.path = path
+        self.batch_max = batch_max
+        self._queue: "queue.Queue[Optional[Tuple[str, Tuple[Any, ...]]]]" = queue.Queue(maxsize=queue_max)
+        self._local = threading.local()
+        self._done = threading.Condition()
+        self._submit_lock = threading.Lock()  # orders submissions against close()
+        self._submitted = 0
+        self._written = 0  # rows the writer has finished with (committed or dropped)
+        self._closed = False
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        conn = self._connect()
+        conn.executescript(SCHEMA)
+        self._writer = threading.Thread(target=self._run, args=(conn,), name="interaction-store", daemon=True)
+        self._writer.start()
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.path, isolation_level=None, check_same_thread=False)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=FULL")
+        conn.execute("PRAGMA busy_timeout=5000")
+        return conn
+
+    def _reader(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = self._local.conn = self._connect()
+            conn.execute("PRAGMA query_only=ON")
+            conn.row_factory = sqlite3.Row
+        return conn
+
+    # Writes
+
+    def _submit(self, sql: str, params: Tuple[Any, ...]) -> None:
+        # Under the lock close() takes, so nothing is queued behind its stop marker
+        with self._submit_lock:
+            if self._closed:
+                raise RuntimeError("interaction store is closed")
+            with self._done:
+                self._submitted += 1
+            self._queue.put((sql, params))
+
+    def _run(self, conn: sqlite3.Connection) -> None:
+        while True:
+            batch = [self._queue.get()]
+            while len(batch) < self.batch_max:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            rows = [b for b in batch if b is not None]
+            if rows:
+                with metrics.stage("store_commit"):
+                    self._commit(conn, rows)
+                with self._done:
+                    self._written += len(rows)
+                    self._done.notify_all()
+            if len(rows) < len(batch):
+                conn.close()
+                return
+
+    def _commit(self, conn: sqlite3.Connection, rows: List[Tuple[str, Tuple[Any, ...]]]) -> None:
+        for attempt in range(BATCH_ATTEMPTS):
+            try:
+                conn.execute("BEGIN")
+                for sql, group in itertools.groupby(rows, key=lambda r: r[0]):
+                    conn.executemany(sql, [params for _, params in group])
+                conn.execute("COMMIT")
+                return
+            except sqlite3.Error as e:
+                if conn.in_transaction:
+                    conn.execute("ROLLBACK")
+                error = e
+        print(f"Interaction store batch of {len(rows)} rows failed ({error}); writing row by row", flush=True)
+        dropped = 0
+        for sql, params in rows:
+            try:
+                conn.execute(sql, params)  # autocommit: one row per transaction
+            except sqlite3.Error as e:
+                dropped += 1
+                metrics.STORE_DROPPED.inc(1, _table(sql))
+                print(f"Interaction store dropped a {_table(sql)} row: {e}", flush=True)
+        if dropped:
+            print(f"Interaction store dropped {dropped} of {len(rows)} rows", flush=True)
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Wait until everything submitted so far is committed; False on timeout."""
+        with self._done:
+            target = self._submitted
+            return self._done.wait_for(lambda: self._written >= target, timeout)
+
+    def close(self, timeout: Optional[float] = 10.0) -> None:
+        """Commit what is queued and stop the writer."""
+        with self._submit_lock:
+            if self._closed:
+                return
+            self._closed = True
+            self._queue.put(None)
+        self._writer.join(timeout)
+
+    def record_recognition(self, sender: str, recipient: str, value: str, note: str, created: str) -> str:
+        rid = _new_id()
+        self._submit(_INSERT_RECOGNITION, (rid, created, sender, recipient, value, note))
+        return rid
+
+    def record_mentor_request(self, mentee: str, mentor: str, message: str, created: str) -> str:
+        rid = _new_id()
+        self._submit(_INSERT_MENTOR_REQUEST, (rid, created, mentee, mentor, message))
+        return rid
+
+    def record_feedback(self, email: str, focus: str, strengths: Sequence[str], created: str) -> str:
+        rid = _new_id()
+        self._submit(_INSERT_FEEDBACK, (rid, created, email, focus, json.dumps(list(strengths))))
+        return rid
+
+    # Reads (newest first; rowid order is submission order)
+
+    def _select(self, sql: str, params: Tuple[Any, ...]) -> List[Dict[str, Any]]:
+        with metrics.stage("store_read"):
+            return [dict(r) for r in self._reader().execute(sql, params)]
+
+    def recognitions_received(self, email: str, limit: int = 50) -> List[Dict[str, Any]]:
+        return self._select(
+            "SELECT id, created, sender, recipient, value, note FROM recognitions "
+            "WHERE recipient = ? ORDER BY rowid DESC LIMIT ?", (email, limit))
+
+    def recognitions_sent(self, email: str, limit: int = 50) -> List[Dict[str, Any]]:
+        return self._select(
+            "SELECT id, created, sender, recipient, value, note FROM recognitions "
+            "WHERE sender = ? ORDER BY rowid DESC LIMIT ?", (email, limit))
+
+    def pending_mentor_requests(self, mentor: str, limit: int = 50) -> List[Dict[str, Any]]:
+        return self._select(
+            "SELECT id, created, mentee, mentor, message, status FROM mentor_requests "
+            "WHERE mentor = ? AND status = 'pending' ORDER BY rowid DESC LIMIT ?", (mentor, limit))
+
+    def mentor_requests_by(self, mentee: str, limit: int = 50) -> List[Dict[str, Any]]:
+        return self._select(
+            "SELECT id, created, mentee, mentor, message, status FROM mentor_requests "
+            "WHERE mentee = ? ORDER BY rowid DESC LIMIT ?", (mentee, limit))
+
+    def feedback_for(self, email: str, limit: int = 50) -> List[Dict[str, Any]]:
+        rows = self._select(
+            "SELECT id, created, email, focus, strengths FROM feedback "
+            "WHERE email = ? ORDER BY rowid DESC LIMIT ?", (email, limit))
+        for r in rows:
+            r["strengths"] = json.loads(r["strengths"])
+        return rows
+
+
+_store: Optional[InteractionStore] = None
+_store_lock = threading.Lock()
+
+
+def get() -> Optional[InteractionStore]:
+    """The process-wide store, opened on first use; None when persistence is disabled."""
+    global _store
+    if _store is None and config.INTERACTIONS_DB_PATH:
+        with _store_lock:
+            if _store is None:
+                _store = InteractionStore(config.INTERACTIONS_DB_PATH)
+                atexit.register(_store.close)
+    return _store
+
+
+def shutdown() -> None:
+    global _store
+    with _store_lock:
+        if _store is not None:
+            _store.close()
+        _store = None
@@ -10,7 +10,16 @@ export type EmployeePlan = {
     skill: string;
     function_area: string;
     specialization: string;
+    relevance: number;
     suggested_learning: string;
+    courses: Array<{
+      title: string;
+      provider: string;
+      difficulty: string;
+      duration_hours: number | null;
+      language: string;
+      url: string | null;
+    }>;
   }>;
   mentors: Array<any>;
   recognition_nudges: string[];
@@ -0,0 +1,228 @@
+"""Scaling benchmark for the recommender services and HTTP endpoints.
+
+For each head-count it generates a synthetic dataset (``scripts/gen_data.py``,
+cached under ``--data-dir``), then runs the measurements in a fresh interpreter
+so the peak RSS reported for one size is not inflated by the previous one.
+
+    python scripts/bench.py --sizes 1000,10000,100000 --out bench-$(git rev-parse --short HEAD).json
+    python scripts/bench.py --sizes 1000,10000 --compare bench-old.json
+
+One-shot stages are reported in seconds, per-call stages as mean/p50/p95 in
+milliseconds; ``rss_mb`` is the process peak after the stage finished.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import platform
+import random
+import resource
+import statistics
+import subprocess
+import sys
+import time
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+ROOT = os.path.dirname(HERE)
+DEFAULT_SIZES = "1000,10000,50000"
+
+
+def _rss_mb() -> float:
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is KiB on Linux and bytes on macOS
+    return round(peak / (1 << 20 if sys.platform == "darwin" else 1 << 10), 1)
+
+
+class Recorder:
+    def __init__(self, calls: int, seed: int) -> None:
+        self.calls = calls
+        self.rng = random.Random(seed)
+        self.results: Dict[str, Dict[str, Any]] = {}
+
+    def once(self, name: str, fn: Callable[[], Any]) -> Any:
+        t0 = time.perf_counter()
+        out = fn()
+        self.results[name] = {"seconds": round(time.perf_counter() - t0, 4), "rss_mb": _rss_mb()}
+        print(f"  {name:<28}{self.results[name]['seconds']:>10.3f} s", file=sys.stderr, flush=True)
+        return out
+
+    def per_call(self, name: str, fn: Callable[[Any], Any], args: List[Any]) -> None:
+        lat = []
+        for _ in range(self.calls):
+            a = self.rng.choice(args)
+            t0 = time.perf_counter()
+            fn(a)
+            lat.append((time.perf_counter() - t0) * 1000)
+        lat.sort()
+        self.results[name] = {
+            "calls": len(lat),
+            "mean_ms": round(statistics.fmean(lat), 3),
+            "p50_ms": round(lat[len(lat) // 2], 3),
+            "p95_ms": round(lat[min(len(lat) - 1, int(len(lat) * 0.95))], 3),
+            "rss_mb": _rss_mb(),
+        }
+        print(f"  {name:<28}{self.results[name]['p50_ms']:>10.3f} ms p50", file=sys.stderr, flush=True)
+
+
+def _service_stages(rec: "Recorder", full: bool) -> Tuple[List[str], List[str], List[str]]:
+    """Time the service functions with preloaded data; returns sample emails, skills and query words.
+
+    Run as its own function so the preloaded data is freed before the endpoint stages.
+    """
+    from app.core import config
+    from app.services import recommender
+    from app.services.course_index import CourseIndex
+    from app.services.mentor_index import MentorIndex
+
+    emps = rec.once("load_employees", lambda: recommender.load_employees(config.EMP_PROFILES_PATH))
+    taxo = rec.once("load_taxonomy", lambda: recommender.load_taxonomy(config.FUNCTIONS_SKILLS_PATH))
+    courses = rec.once("load_courses", lambda: recommender.load_courses(config.COURSES_PATH))
+    rsi = rec.once("build_role_skill_index", lambda: recommender.build_role_skill_index(emps))
+    adj = rec.once("role_adjacency", lambda: recommender.role_adjacency(rsi, top_k=10))
+    rec.once("get_lpi", lambda: recommender.get_lpi(emps))
+    if full:
+        rec.once("recommend", lambda: recommender.recommend(emps, taxo))
+    mentors = rec.once("mentor_index_build", lambda: MentorIndex(emps, adj))
+    cindex = rec.once("course_index_build", lambda: CourseIndex(courses))
+
+    emails = [e.email for e in rec.rng.sample(emps, min(len(emps), 1000))]
+    skills = sorted(set(courses["skill_name"]))
+    words = sorted({w for t in courses["title"].head(2000) for w in t.split() if len(w) > 3})
+    rec.per_call("build_plan", lambda e: recommender.build_plan(e, taxo, rsi, adj),
+                 rec.rng.sample(emps, min(len(emps), 1000)))
+    rec.per_call("get_mentors", lambda em: recommender.get_mentors(mentors, em, limit=3), emails)
+    rec.per_call("find_courses_skill", lambda sk: recommender.find_courses(cindex, skill=sk, limit=10), skills)
+    rec.per_call("find_courses_query", lambda w: recommender.find_courses(cindex, q=w, limit=10), words)
+    return emails, skills, words
+
+
+def run_one(size: int, calls: int, full_max: int, seed: int) -> Dict[str, Any]:
+    """Measure in this process; the data paths come from the environment."""
+    sys.path.insert(0, ROOT)
+    from app.core import config
+
+    rec = Recorder(calls, seed)
+    full = size <= full_max
+    emails, skills, words = _service_stages(rec, full)
+
+    # HTTP endpoints, in-process through the ASGI app
+    from fastapi.testclient import TestClient
+    from app.main import app
+    from app.services import dataset
+
+    with TestClient(app) as client:
+        def get(path: str, **params: Any) -> None:
+            r = client.get(path, params=params)
+            r.raise_for_status()
+            r.content
+
+        rec.once("snapshot_load", dataset.current)
+        rec.per_call("GET /plans?email", lambda em: get("/plans", email=em), emails)
+        rec.per_call("GET /mentors", lambda em: get("/mentors", email=em), emails)
+        rec.per_call("GET /courses?skill", lambda sk: get("/courses", skill=sk), skills)
+        rec.per_call("GET /courses?q", lambda w: get("/courses", q=w), words)
+        rec.per_call("GET /lpi?email", lambda em: get("/lpi", email=em), emails)
+        rec.per_call("GET /leadership", lambda n: get("/leadership", limit=n), [10])
+        rec.per_call("GET /chat", lambda em: get("/chat", q="What is my career path?", email=em), emails)
+        if full:
+            rec.once("GET /plans (all)", lambda: get("/plans"))
+            rec.once("GET /mentors/all", lambda: get("/mentors/all"))
+
+    return {
+        "employees": size, "full_org_stages": full, "plan_materializer": config.PLAN_MATERIALIZER,
+        "peak_rss_mb": _rss_mb(), "stages": rec.results,
+    }
+
+
+def _git_rev() -> Optional[str]:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True, text=True, check=True).stdout.strip()
+    except Exception:
+        return None
+
+
+def _compare(report: Dict[str, Any], base_path: str) -> None:
+    with open(base_path, encoding="utf-8") as f:
+        base = json.load(f)
+    print(f"\ncompared with {base_path} ({base.get('meta', {}).get('git_rev')}); ratio < 1 is faster")
+    for size, res in report["sizes"].items():
+        old = base.get("sizes", {}).get(size)
+        if not old:
+            continue
+        print(f"-- {size} employees")
+        for name, cur in res["stages"].items():
+            prev = old["stages"].get(name)
+            if not prev:
+                continue
+            key = "seconds" if "seconds" in cur else "p50_ms"
+            if prev.get(key):
+                print(f"  {name:<28}{prev[key]:>10.3f} -> {cur[key]:>10.3f}  x{cur[key] / prev[key]:.2f}")
+        print(f"  {'peak_rss_mb':<28}{old['peak_rss_mb']:>10.1f} -> {res['peak_rss_mb']:>10.1f}")
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description="Time service functions and endpoints across dataset sizes.")
+    ap.add_argument("--sizes", default=DEFAULT_SIZES, help="comma-separated employee counts (1000 .. 500000)")
+    ap.add_argument("--calls", type=int, default=200, help="samples per per-call stage")
+    ap.add_argument("--full-max", type=int, default=100000, help="largest size for whole-org stages (recommend, /plans, /mentors/all)")
+    ap.add_argument("--data-dir", default=os.path.join(ROOT, ".bench-data"))
+    ap.add_argument("--seed", type=int, default=42)
+    ap.add_argument("--out", help="write the JSON report here")
+    ap.add_argument("--compare", help="earlier JSON report to diff against")
+    ap.add_argument("--child", type=int, help=argparse.SUPPRESS)
+    args = ap.parse_args()
+
+    if args.child is not None:
+        print(json.dumps(run_one(args.child, args.calls, args.full_max, args.seed)))
+        return
+
+    sys.path.insert(0, HERE)
+    from gen_data import EMPLOYEES_FILE, generate, paths_for
+
+    report: Dict[str, Any] = {
+        "meta": {
+            "git_rev": _git_rev(),
+            "created": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpus": os.cpu_count(),
+            "calls": args.calls,
+            "seed": args.seed,
+        },
+        "sizes": {},
+    }
+    for size in (int(s) for s in args.sizes.split(",") if s.strip()):
+        out_dir = os.path.join(args.data_dir, f"{size}-{args.seed}")
+        if os.path.exists(os.path.join(out_dir, EMPLOYEES_FILE)):
+            paths = paths_for(out_dir)
+        else:
+            print(f"generating {size} employees -> {out_dir}", file=sys.stderr, flush=True)
+            paths = generate(out_dir, size, args.seed)
+        env = dict(os.environ, **paths, DATASET_SNAPSHOT_PATH="", OPENAI_API_KEY="", DATASET_CHECK_INTERVAL="3600",
+                   PLAN_MATERIALIZER="0")  # endpoints build plans per request
+        print(f"benchmarking {size} employees", file=sys.stderr, flush=True)
+        proc = subprocess.run(
+            [sys.executable, os.path.abspath(__file__), "--child", str(size), "--calls", str(args.calls),
+             "--full-max", str(args.full_max), "--seed", str(args.seed)],
+            env=env, cwd=ROOT, stdout=subprocess.PIPE, text=True,
+        )
+        if proc.returncode != 0:
+            raise SystemExit(f"benchmark for {size} employees failed (exit {proc.returncode})")
+        report["sizes"][str(size)] = json.loads(proc.stdout.strip().splitlines()[-1])
+
+    text = json.dumps(report, indent=2)
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+    if args.compare:
+        _compare(report, args.compare)
+
+
+if __name__ == "__main__":
+    main()
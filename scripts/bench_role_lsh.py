@@ -0,0 +1,99 @@
+"""Exact vs MinHash/LSH role adjacency: time, recall@k and identical rows.
+
+Roles come either from an employee file (``--employees``, built with the
+service's own tenure weighting) or from a synthetic role-skill index of
+``--roles`` job titles: families of titles sharing a few heavy core skills,
+each with a long tail of light ones, which is the shape tenure weighting
+produces. Every ``--grid`` entry is ``bands x rows x levels``.
+
+    python scripts/bench_role_lsh.py --roles 20000
+    python scripts/bench_role_lsh.py --employees /tmp/pf-100k/Employee_Profiles.json --grid 32x2x8,64x2x8
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import random
+import sys
+import time
+from typing import Dict, List
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(HERE))
+
+from app.services import recommender, role_lsh  # noqa: E402
+
+DEFAULT_GRID = "16x2x8,32x2x8,64x2x8,32x3x8,32x2x1"
+
+
+def synthetic_index(roles: int, skills: int, seed: int) -> Dict[str, Dict[str, float]]:
+    rng = random.Random(seed)
+    pool = [f"Skill {i:05d}" for i in range(skills)]
+    families = max(1, roles // 8)
+    cores = [rng.sample(pool, 8) for _ in range(families)]
+    rsi: Dict[str, Dict[str, float]] = {}
+    for i in range(roles):
+        vec = {s: rng.uniform(1.0, 3.0) for s in rng.sample(pool, rng.randint(10, 30))}
+        for s in rng.sample(cores[rng.randrange(families)], rng.randint(4, 6)):
+            vec[s] = rng.uniform(15.0, 30.0)
+        rsi[f"Role {i:06d}"] = vec
+    return rsi
+
+
+def employee_index(path: str) -> Dict[str, Dict[str, float]]:
+    return recommender.build_role_skill_index(recommender.load_employees(path))
+
+
+def _timed(fn, *args, **kwargs):
+    t0 = time.perf_counter()
+    out = fn(*args, **kwargs)
+    return out, time.perf_counter() - t0
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description="Compare approximate (MinHash/LSH) role adjacency with the exact one.")
+    ap.add_argument("--employees", help="Employee_Profiles.json to build roles from (default: synthetic roles)")
+    ap.add_argument("--roles", type=int, default=20000, help="synthetic job titles")
+    ap.add_argument("--skills", type=int, default=5000, help="synthetic skill vocabulary")
+    ap.add_argument("--top-k", type=int, default=5)
+    ap.add_argument("--grid", default=DEFAULT_GRID, help="comma-separated BANDSxROWSxLEVELS settings")
+    ap.add_argument("--seed", type=int, default=42)
+    ap.add_argument("--out", help="write the JSON report here")
+    args = ap.parse_args()
+
+    rsi = employee_index(args.employees) if args.employees else synthetic_index(args.roles, args.skills, args.seed)
+    print(f"{len(rsi)} roles, top_k={args.top_k}", file=sys.stderr)
+    exact, exact_s = _timed(recommender.role_adjacency, rsi, top_k=args.top_k)
+    print(f"  {'exact':<14}{exact_s:>9.3f} s", file=sys.stderr)
+    results: List[Dict] = []
+    for spec in args.grid.split(","):
+        bands, rows, levels = (int(x) for x in spec.lower().split("x"))
+        approx, secs = _timed(
+            role_lsh.approx_role_adjacency, rsi, top_k=args.top_k, bands=bands, rows=rows, levels=levels,
+        )
+        # Same neighbours in the same order (scores can differ in the last bit: different summation order)
+        same = sum([r2 for r2, _ in approx[r]] == [r2 for r2, _ in row] for r, row in exact.items()) / max(1, len(exact))
+        res = {
+            "bands": bands, "rows": rows, "levels": levels, "seconds": round(secs, 4),
+            "speedup": round(exact_s / secs, 2) if secs else None,
+            "recall_at_k": round(role_lsh.recall_at_k(exact, approx), 4), "identical_rows": round(same, 4),
+        }
+        results.append(res)
+        print(
+            f"  {spec:<14}{secs:>9.3f} s  x{res['speedup']:<6} recall {res['recall_at_k']:.3f}"
+            f"  identical {res['identical_rows']:.3f}",
+            file=sys.stderr,
+        )
+    report = {"roles": len(rsi), "top_k": args.top_k, "exact_seconds": round(exact_s, 4), "lsh": results}
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+    else:
+        json.dump(report, sys.stdout, indent=2)
+        print()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,216 @@
+"""Deterministic synthetic dataset generator (same file formats as ``data/``).
+
+Writes ``Employee_Profiles.json``, ``Functions & Skills(List).csv`` and
+``Courses_Catalog.csv`` for any number of employees. Roles, skills and courses
+grow with the head-count so larger sets keep a realistic shape; the same
+``--employees``/``--seed`` always produce byte-identical files.
+
+    python scripts/gen_data.py --employees 100000 --out /tmp/pf-100k
+    EMP_PROFILES_PATH=/tmp/pf-100k/Employee_Profiles.json ... bash scripts/run_local.sh
+"""
+
+from __future__ import annotations
+
+import argparse
+import csv
+import json
+import os
+import random
+from datetime import date, timedelta
+from typing import Dict, List, Tuple
+
+EMPLOYEES_FILE = "Employee_Profiles.json"
+TAXONOMY_FILE = "Functions & Skills(List).csv"
+COURSES_FILE = "Courses_Catalog.csv"
+
+FUNCTION_AREAS = [
+    "Info Tech: Infrastructure", "Info Tech: Software Engineering", "Info Tech: Data & AI",
+    "Info Tech: Cyber Security", "Operations: Terminal", "Operations: Marine", "Engineering: Asset Management",
+    "Finance", "Human Resources", "Commercial", "Procurement", "Safety, Health & Environment",
+]
+TOPICS = [
+    "Cloud", "Network", "Data", "Machine Learning", "Security", "Crane", "Yard", "Vessel", "Berth",
+    "Automation", "Payroll", "Talent", "Contract", "Supplier", "Risk", "Budget", "Customer", "Asset",
+    "Platform", "API", "Analytics", "Quality", "Compliance", "Maintenance", "Logistics", "Procurement",
+]
+ASPECTS = [
+    "Architecture", "Operations", "Planning", "Governance", "Engineering", "Analysis", "Design",
+    "Automation", "Optimisation", "Strategy", "Management", "Reporting", "Testing", "Integration",
+]
+SENIORITY = ["Associate", "", "Senior", "Lead", "Principal", "Manager", "Senior Manager", "Head of"]
+DISCIPLINES = [
+    "Engineer", "Analyst", "Architect", "Specialist", "Planner", "Consultant", "Controller",
+    "Scientist", "Coordinator", "Officer", "Administrator", "Developer",
+]
+DEPARTMENTS = [
+    "Information Technology", "Operations", "Engineering", "Finance", "Human Resources",
+    "Commercial", "Procurement", "Safety",
+]
+LEVELS = ["Beginner", "Intermediate", "Advanced", "Expert"]
+DIFFICULTIES = ["Beginner", "Intermediate", "Advanced"]
+LANGUAGES = ["English", "English", "English", "Mandarin", "Malay", "Tamil", "Korean"]
+PROVIDERS = ["LinkedIn Learning", "Coursera", "Udemy", "PSA Academy", "edX", "Pluralsight"]
+COMPETENCIES = [
+    "Stakeholder & Partnership Management", "Change & Transformation Management",
+    "Technology Management & Innovation", "Leading People", "Strategic Planning",
+    "Customer Centricity", "Decision Making", "Communication",
+]
+FIRST = ["Alex", "Sam", "Jordan", "Taylor", "Wei", "Mei", "Arjun", "Priya", "Nur", "Hana", "Ken", "Li", "Omar", "Siti", "Chris"]
+LAST = ["Tan", "Lee", "Lim", "Ng", "Wong", "Kumar", "Rahman", "Chen", "Goh", "Teo", "Singh", "Ong", "Koh", "Yeo", "Ho"]
+BASE_DATE = date(2025, 10, 1)
+
+
+def scale(n_employees: int) -> Tuple[int, int, int]:
+    """(roles, skills, courses) for a given head-count."""
+    roles = min(20000, max(20, n_employees // 25))
+    skills = min(len(TOPICS) * len(ASPECTS) * 8, max(30, n_employees // 100))
+    courses = min(100000, max(25, n_employees // 10))
+    return roles, skills, courses
+
+
+def make_taxonomy(rng: random.Random, n_skills: int) -> List[Tuple[str, str, str]]:
+    rows, seen, variant = [], set(), 0
+    while len(rows) < n_skills:
+        for topic in TOPICS:
+            for aspect in ASPECTS:
+                name = f"{topic} {aspect}" + (f" {variant + 1}" if variant else "")
+                if name in seen:
+                    continue
+                seen.add(name)
+                area = FUNCTION_AREAS[TOPICS.index(topic) % len(FUNCTION_AREAS)]
+                rows.append((area, f"{topic}: {name}", name))
+                if len(rows) >= n_skills:
+                    break
+            if len(rows) >= n_skills:
+                break
+        variant += 1
+    rng.shuffle(rows)
+    return rows
+
+
+def make_roles(rng: random.Random, n_roles: int, skills: List[str]) -> List[Dict]:
+    roles, seen = [], set()
+    while len(roles) < n_roles:
+        title = " ".join(x for x in (rng.choice(SENIORITY), rng.choice(TOPICS), rng.choice(DISCIPLINES)) if x)
+        if title in seen:
+            title = f"{title} {len(roles)}"
+        seen.add(title)
+        dept = rng.choice(DEPARTMENTS)
+        # each role draws on a small core of skills plus a few neighbours
+        k = rng.randint(4, 10)
+        start = rng.randrange(len(skills))
+        core = [skills[(start + j * rng.randint(1, 3)) % len(skills)] for j in range(k)]
+        roles.append({"title": title, "department": dept, "unit": f"{dept} {rng.choice(ASPECTS)}", "skills": list(dict.fromkeys(core))})
+    return roles
+
+
+def make_employee(rng: random.Random, i: int, roles: List[Dict], by_name: Dict[str, Tuple[str, str, str]], skill_names: List[str]) -> Dict:
+    role = roles[min(len(roles) - 1, int(rng.paretovariate(1.2)) - 1) if rng.random() < 0.3 else rng.randrange(len(roles))]
+    first, last = rng.choice(FIRST), rng.choice(LAST)
+    since = BASE_DATE - timedelta(days=rng.randint(30, 3650))
+    own = rng.sample(role["skills"], k=max(1, len(role["skills"]) - rng.randint(0, 3)))
+    own += [rng.choice(skill_names) for _ in range(rng.randint(0, 3))]
+    history = [rng.choice(roles)["title"] for _ in range(rng.randint(0, 4))] + [role["title"]]
+    return {
+        "employee_id": f"EMP-{i:07d}",
+        "personal_info": {
+            "name": f"{first} {last}",
+            "email": f"{first.lower()}.{last.lower()}.{i}@globalpsa.com",
+            "office_location": "PSA Singapore",
+            "languages": [{"language": rng.choice(LANGUAGES), "proficiency": "Fluent"}],
+        },
+        "employment_info": {
+            "job_title": role["title"],
+            "department": role["department"],
+            "unit": role["unit"],
+            "line_manager": f"{rng.choice(FIRST)} {rng.choice(LAST)}",
+            "in_role_since": since.isoformat(),
+            "hire_date": (since - timedelta(days=rng.randint(0, 2000))).isoformat(),
+            "last_updated": BASE_DATE.isoformat(),
+        },
+        "skills": [
+            {"function_area": by_name[s][0], "specialization": by_name[s][1], "skill_name": s}
+            for s in dict.fromkeys(own)
+        ],
+        "competencies": [
+            {"name": c, "level": rng.choice(LEVELS)} for c in rng.sample(COMPETENCIES, k=rng.randint(1, 4))
+        ],
+        "positions_history": [
+            {"role_title": t, "organization": "PSA Singapore", "period": {"start": None, "end": None}} for t in history
+        ],
+        "projects": [
+            {"project_name": f"Project {rng.randrange(10000)}", "outcomes": [f"Outcome {j}" for j in range(rng.randint(0, 3))]}
+            for _ in range(rng.randint(0, 3))
+        ],
+    }
+
+
+def make_course(rng: random.Random, i: int, skill: str) -> Dict:
+    difficulty = rng.choice(DIFFICULTIES)
+    return {
+        "title": f"{skill} {rng.choice(['Foundations', 'in Practice', 'Deep Dive', 'Bootcamp', 'Essentials'])} {i}",
+        "skill_name": skill,
+        "provider": rng.choice(PROVIDERS),
+        "difficulty": difficulty,
+        "duration_hours": rng.choice([2, 4, 6, 8, 12, 16, 24, 40]),
+        "language": rng.choice(LANGUAGES),
+        "url": f"https://example.com/course-{i}",
+        "description": f"{difficulty} {skill.lower()} course covering {rng.choice(ASPECTS).lower()} and {rng.choice(TOPICS).lower()}.",
+    }
+
+
+def paths_for(out_dir: str) -> Dict[str, str]:
+    """The three file paths in ``out_dir``, keyed by the config variables that read them."""
+    return {
+        "EMP_PROFILES_PATH": os.path.join(out_dir, EMPLOYEES_FILE),
+        "FUNCTIONS_SKILLS_PATH": os.path.join(out_dir, TAXONOMY_FILE),
+        "COURSES_PATH": os.path.join(out_dir, COURSES_FILE),
+    }
+
+
+def generate(out_dir: str, n_employees: int, seed: int = 42) -> Dict[str, str]:
+    """Write the three data files into ``out_dir`` and return :func:`paths_for` it."""
+    os.makedirs(out_dir, exist_ok=True)
+    rng = random.Random(seed)
+    n_roles, n_skills, n_courses = scale(n_employees)
+    taxonomy = make_taxonomy(rng, n_skills)
+    skill_names = [s[2] for s in taxonomy]
+    by_name = {s[2]: s for s in taxonomy}
+    roles = make_roles(rng, n_roles, skill_names)
+
+    paths = paths_for(out_dir)
+    with open(paths["FUNCTIONS_SKILLS_PATH"], "w", newline="", encoding="utf-8") as f:
+        w = csv.writer(f)
+        w.writerow(["function_area", "specialization", "skill_name"])
+        w.writerows(taxonomy)
+    with open(paths["COURSES_PATH"], "w", newline="", encoding="utf-8") as f:
+        w = csv.DictWriter(f, fieldnames=["title", "skill_name", "provider", "difficulty", "duration_hours", "language", "url", "description"])
+        w.writeheader()
+        for i in range(n_courses):
+            w.writerow(make_course(rng, i, skill_names[i % len(skill_names)] if i < len(skill_names) else rng.choice(skill_names)))
+    with open(paths["EMP_PROFILES_PATH"], "w", encoding="utf-8") as f:
+        # one profile per line, so the file is written (and later parsed) without holding it all
+        f.write("[\n")
+        for i in range(n_employees):
+            if i:
+                f.write(",\n")
+            f.write(json.dumps(make_employee(rng, i, roles, by_name, skill_names), separators=(",", ":")))
+        f.write("\n]\n")
+    return paths
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description="Generate a synthetic PathFinder dataset.")
+    ap.add_argument("--employees", type=int, default=10000)
+    ap.add_argument("--seed", type=int, default=42)
+    ap.add_argument("--out", required=True, help="output directory")
+    args = ap.parse_args()
+    paths = generate(args.out, args.employees, args.seed)
+    roles, skills, courses = scale(args.employees)
+    print(f"{args.employees} employees, {roles} roles, {skills} skills, {courses} courses -> {args.out}")
+    for k, v in paths.items():
+        print(f'export {k}="{v}"')
+
+
+if __name__ == "__main__":
+    main()
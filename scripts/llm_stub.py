@@ -0,0 +1,130 @@
+"""Local OpenAI-compatible chat completions server for offline Kai testing.
+
+Serves ``POST /v1/chat/completions`` (and the Azure deployment path) with a
+configurable time-to-first-token, token rate and error rate, streaming or not.
+
+    python scripts/llm_stub.py --port 9911 --latency 0.4 --tokens-per-sec 60 --error-rate 0.02
+    export OPENAI_API_KEY=stub OPENAI_BASE_URL=http://127.0.0.1:9911/v1 AZURE_OPENAI_DEPLOYMENT=
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import random
+import time
+import uuid
+from typing import Any, AsyncIterator, Dict
+
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, StreamingResponse
+
+REPLY = (
+    "Focus on one stretch project this quarter, pair it with a short course on the "
+    "skill gap you care about most, and ask your mentor for feedback every two weeks. "
+    "Check /plans for next roles and /courses for options that fit your schedule."
+)
+
+
+class Settings:
+    latency = 0.3  # seconds before the first token
+    tokens_per_sec = 50.0  # 0 = send everything at once
+    error_rate = 0.0  # fraction of requests answered with HTTP 500
+    rate_limit_rate = 0.0  # fraction answered with HTTP 429
+    reply = REPLY
+
+
+settings = Settings()
+stats: Dict[str, int] = {"requests": 0, "errors": 0, "streams": 0}
+app = FastAPI(title="Kai LLM stub")
+
+
+def _tokens(text: str):
+    words = text.split(" ")
+    return [w if i == 0 else " " + w for i, w in enumerate(words)]
+
+
+def _chunk(cid: str, model: str, content: Any, finish: Any = None) -> str:
+    body = {
+        "id": cid, "object": "chat.completion.chunk", "created": int(time.time()), "model": model,
+        "choices": [{"index": 0, "delta": {"content": content} if content is not None else {}, "finish_reason": finish}],
+    }
+    return f"data: {json.dumps(body)}\n\n"
+
+
+async def _stream(cid: str, model: str) -> AsyncIterator[str]:
+    await asyncio.sleep(settings.latency)
+    delay = 1.0 / settings.tokens_per_sec if settings.tokens_per_sec > 0 else 0.0
+    for tok in _tokens(settings.reply):
+        yield _chunk(cid, model, tok)
+        if delay:
+            await asyncio.sleep(delay)
+    yield _chunk(cid, model, None, "stop")
+    yield "data: [DONE]\n\n"
+
+
+async def _completions(request: Request, model: str):
+    body = await request.json()
+    stats["requests"] += 1
+    roll = random.random()
+    if roll < settings.error_rate:
+        stats["errors"] += 1
+        return JSONResponse({"error": {"message": "injected failure", "type": "server_error"}}, status_code=500)
+    if roll < settings.error_rate + settings.rate_limit_rate:
+        stats["errors"] += 1
+        return JSONResponse({"error": {"message": "injected rate limit", "type": "rate_limit"}}, status_code=429)
+
+    cid = f"chatcmpl-{uuid.uuid4().hex[:12]}"
+    model = body.get("model") or model
+    if body.get("stream"):
+        stats["streams"] += 1
+        return StreamingResponse(_stream(cid, model), media_type="text/event-stream")
+
+    toks = _tokens(settings.reply)
+    await asyncio.sleep(settings.latency + (len(toks) / settings.tokens_per_sec if settings.tokens_per_sec > 0 else 0))
+    prompt_tokens = sum(len(str(m.get("content", "")).split()) for m in body.get("messages", []))
+    return {
+        "id": cid, "object": "chat.completion", "created": int(time.time()), "model": model,
+        "choices": [{"index": 0, "message": {"role": "assistant", "content": settings.reply}, "finish_reason": "stop"}],
+        "usage": {"prompt_tokens": prompt_tokens, "completion_tokens": len(toks), "total_tokens": prompt_tokens + len(toks)},
+    }
+
+
+@app.post("/v1/chat/completions")
+async def chat_completions(request: Request):
+    return await _completions(request, "stub")
+
+
+@app.post("/openai/deployments/{deployment}/chat/completions")
+async def azure_chat_completions(deployment: str, request: Request):
+    return await _completions(request, deployment)
+
+
+@app.get("/stats")
+def get_stats():
+    return stats
+
+
+def main() -> None:
+    import uvicorn
+
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--host", default="127.0.0.1")
+    ap.add_argument("--port", type=int, default=9911)
+    ap.add_argument("--latency", type=float, default=Settings.latency, help="seconds to first token")
+    ap.add_argument("--tokens-per-sec", type=float, default=Settings.tokens_per_sec)
+    ap.add_argument("--error-rate", type=float, default=Settings.error_rate, help="fraction of HTTP 500s")
+    ap.add_argument("--rate-limit-rate", type=float, default=Settings.rate_limit_rate, help="fraction of HTTP 429s")
+    ap.add_argument("--reply", default=Settings.reply)
+    args = ap.parse_args()
+    settings.latency = args.latency
+    settings.tokens_per_sec = args.tokens_per_sec
+    settings.error_rate = args.error_rate
+    settings.rate_limit_rate = args.rate_limit_rate
+    settings.reply = args.reply
+    uvicorn.run(app, host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
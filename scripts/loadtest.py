@@ -0,0 +1,183 @@
+"""Open-loop async load generator for the PathFinder API.
+
+Sends requests at a fixed target rate (independent of response times) against a
+weighted mix of /chat, /plans, /mentors and /courses, then reports throughput,
+error rate and p50/p95/p99 latency per endpoint. Latency runs from each
+request's scheduled send time, so time spent queued behind ``--concurrency``
+counts too. A /chat answered with Kai's canned fallback (the model call failed)
+counts as an error of kind ``fallback``; start the server with
+``OPENAI_MAX_RETRIES=0`` so the client's retries don't hide injected faults.
+
+    python scripts/llm_stub.py --latency 0.5 &          # optional, keeps Kai offline
+    OPENAI_MAX_RETRIES=0 bash scripts/run_local.sh &
+    python scripts/loadtest.py --base-url http://localhost:8080 --rps 50 --duration 30
+    python scripts/loadtest.py --mix chat=1 --unique-queries --json report.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import random
+import time
+from typing import Dict, List, Optional, Tuple
+
+import httpx
+
+QUESTIONS = [
+    "What should I learn next?",
+    "How do I become a data engineer?",
+    "What is my career path?",
+    "Which mentors should I talk to?",
+    "How can I improve my skills in cloud architecture?",
+    "Any tips for leading my first project?",
+]
+DEFAULT_MIX = "chat=4,plans=3,mentors=2,courses=3"
+# kai.FALLBACK_REPLY and kai.SNAG_REPLY: a 200 that means the upstream call failed
+FALLBACK_REPLIES = (
+    "I can help with roles, mentors, and courses. Try /plans or /courses.",
+    "Sorry, I hit a snag. Try asking about roles, mentors, or courses.",
+)
+
+
+def _percentile(sorted_vals: List[float], p: float) -> Optional[float]:
+    if not sorted_vals:
+        return None
+    k = min(len(sorted_vals) - 1, max(0, int(round(p / 100.0 * (len(sorted_vals) - 1)))))
+    return sorted_vals[k]
+
+
+class Workload:
+    def __init__(self, emails: List[str], skills: List[str], unique_queries: bool) -> None:
+        self.emails = emails or ["unknown@example.com"]
+        self.skills = skills or ["Cloud"]
+        self.unique_queries = unique_queries
+        self.seq = 0
+
+    def request(self, kind: str) -> Tuple[str, Dict[str, str]]:
+        email = random.choice(self.emails)
+        if kind == "chat":
+            q = random.choice(QUESTIONS)
+            if self.unique_queries:
+                self.seq += 1
+                q = f"{q} (#{self.seq})"
+            return "/chat", {"q": q, "email": email}
+        if kind == "plans":
+            return "/plans", {"email": email}
+        if kind == "mentors":
+            return "/mentors", {"email": email, "limit": "3"}
+        if kind == "courses":
+            return "/courses", {"skill": random.choice(self.skills), "limit": "5"}
+        raise ValueError(f"unknown endpoint kind: {kind}")
+
+
+async def _discover(client: httpx.AsyncClient) -> Tuple[List[str], List[str]]:
+    emails = list((await client.get("/lpi")).json().keys())
+    items = (await client.get("/courses", params={"limit": 500})).json().get("items", [])
+    skills = sorted({i.get("skill_name") for i in items if i.get("skill_name")})
+    return emails, skills
+
+
+async def run(base_url: str, rps: float, duration: float, mix: Dict[str, float], unique_queries: bool,
+              timeout: float, concurrency: int) -> Dict:
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(base_url=base_url, timeout=timeout, limits=limits) as client:
+        emails, skills = await _discover(client)
+        work = Workload(emails, skills, unique_queries)
+        kinds, weights = zip(*mix.items())
+        results: Dict[str, Dict[str, List]] = {k: {"lat": [], "errors": [], "bytes": []} for k in kinds}
+        sem = asyncio.Semaphore(concurrency)
+
+        async def one(kind: str, scheduled: float) -> None:
+            # Latency counts from the scheduled send time: waiting for a slot is part of it
+            path, params = work.request(kind)
+            async with sem:
+                try:
+                    r = await client.get(path, params=params)
+                    dt = time.perf_counter() - scheduled
+                    if r.status_code >= 400:
+                        results[kind]["errors"].append(str(r.status_code))
+                    elif kind == "chat" and r.json().get("reply") in FALLBACK_REPLIES:
+                        results[kind]["errors"].append("fallback")
+                    else:
+                        results[kind]["lat"].append(dt)
+                        results[kind]["bytes"].append(len(r.content))
+                except Exception as e:
+                    results[kind]["errors"].append(type(e).__name__)
+
+        tasks = []
+        start = time.perf_counter()
+        n = int(rps * duration)
+        for i in range(n):
+            # open loop: schedule by wall clock, not by completions
+            scheduled = start + i / rps
+            delay = scheduled - time.perf_counter()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            tasks.append(asyncio.create_task(one(random.choices(kinds, weights)[0], scheduled)))
+        await asyncio.gather(*tasks)
+        elapsed = time.perf_counter() - start
+
+    report = {"base_url": base_url, "target_rps": rps, "duration_s": round(elapsed, 3), "endpoints": {}}
+    total = errors = 0
+    for kind, r in results.items():
+        lat = sorted(r["lat"])
+        count = len(lat) + len(r["errors"])
+        total += count
+        errors += len(r["errors"])
+        report["endpoints"][kind] = {
+            "requests": count,
+            "errors": len(r["errors"]),
+            "error_rate": round(len(r["errors"]) / count, 4) if count else 0.0,
+            "error_kinds": sorted(set(r["errors"])),
+            "p50_ms": _ms(_percentile(lat, 50)),
+            "p95_ms": _ms(_percentile(lat, 95)),
+            "p99_ms": _ms(_percentile(lat, 99)),
+            "max_ms": _ms(lat[-1] if lat else None),
+            "mean_bytes": int(sum(r["bytes"]) / len(r["bytes"])) if r["bytes"] else 0,
+        }
+    report["achieved_rps"] = round(total / elapsed, 2) if elapsed else 0.0
+    report["error_rate"] = round(errors / total, 4) if total else 0.0
+    return report
+
+
+def _ms(v: Optional[float]) -> Optional[float]:
+    return round(v * 1000, 2) if v is not None else None
+
+
+def _parse_mix(spec: str) -> Dict[str, float]:
+    out = {}
+    for part in spec.split(","):
+        k, _, w = part.partition("=")
+        out[k.strip()] = float(w or 1)
+    return out
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description="Drive the API at a target RPS and report latency percentiles.")
+    ap.add_argument("--base-url", default="http://localhost:8080")
+    ap.add_argument("--rps", type=float, default=20.0)
+    ap.add_argument("--duration", type=float, default=20.0, help="seconds")
+    ap.add_argument("--mix", default=DEFAULT_MIX, help=f"endpoint weights, default {DEFAULT_MIX}")
+    ap.add_argument("--unique-queries", action="store_true", help="make every /chat query distinct (defeats Kai's cache)")
+    ap.add_argument("--timeout", type=float, default=30.0)
+    ap.add_argument("--concurrency", type=int, default=256, help="max in-flight requests")
+    ap.add_argument("--seed", type=int, default=0)
+    ap.add_argument("--json", help="also write the report to this file")
+    args = ap.parse_args()
+    random.seed(args.seed)
+    report = asyncio.run(run(args.base_url, args.rps, args.duration, _parse_mix(args.mix),
+                             args.unique_queries, args.timeout, args.concurrency))
+    print(f"{'endpoint':<10}{'reqs':>7}{'err%':>7}{'p50':>9}{'p95':>9}{'p99':>9}  (ms)")
+    for kind, r in report["endpoints"].items():
+        print(f"{kind:<10}{r['requests']:>7}{r['error_rate'] * 100:>6.1f}%"
+              f"{r['p50_ms'] or 0:>9.1f}{r['p95_ms'] or 0:>9.1f}{r['p99_ms'] or 0:>9.1f}")
+    print(f"achieved {report['achieved_rps']} rps over {report['duration_s']}s, error rate {report['error_rate'] * 100:.2f}%")
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()